@@ -27,7 +27,8 @@ class ScanType(CanvasPage, SettingsPage):
 
     This uses the arbitrary pattern generation of the QD scan engine.
 
-    Note that while this *page* is fully implemented, it does not yet export the pattern.
+    The selected pattern is compiled by `generate_pattern`, which the grid search uses to scan only the part of each
+    square the pattern visits.
 
     Attributes
     ----------
@@ -233,18 +234,19 @@ class ScanType(CanvasPage, SettingsPage):
         self._sq_size = new
         self._update()
 
-    def generate_pattern(self) -> np.ndarray:
+    def generate_pattern(self) -> _None[np.ndarray]:
         """
         Turns the scan pattern into a proper set of co-ordinates.
 
-        Note that this function does not *yet* present the co-ordinates in a QD-friendly manner.
-
         Returns
         -------
-        ndarray[int_, (n, 2)]
-            An array of co-ordinates. Each co-ordinate is in the form (x, y).
+        ndarray[int32, (n, 2)] | None
+            A contiguous array of co-ordinates, ready for `Scanner.set_pattern` once offset into the full scan. Each
+            co-ordinate is in the form (x, y), relative to the square. None if no pattern is selected.
         """
-        return np.vstack([p.decode() for p in self._pattern.encode()])  # change to the encoded version
+        if self._pattern is None:
+            return None
+        return self._pattern.compile()
 
     def raster(self, argc: vals.Number, argv: _list[vals.Value]) -> objs.NativeClass:
         """
@@ -4,7 +4,6 @@ from typing import Optional as _None, Tuple as _tuple
 
 import numpy as np
 import scipy.ndimage as imgs
-from skimage.registration import phase_cross_correlation as convolve
 
 from ... import utils
 from ..._base import core, microscope, ShortCorrectionPage, widgets
@@ -16,6 +15,10 @@ default_settings = load_settings("assets/config.json",
                                  windowing=validation.examples.flag_3,
                                  window_order=validation.examples.window_order,
                                  drift_resolution=validation.examples.resolution,
+                                 drift_memory=validation.examples.coverage,
+                                 drift_tolerance=validation.examples.positive_float,
+                                 drift_confidence=validation.examples.natural_float,
+                                 drift_skip=validation.examples.natural_int,
                                  )
  
 
@@ -25,6 +28,13 @@ class TranslateRegion(ShortCorrectionPage):
 
     Note that the external counter for this correction is the number of high-resolution scans performed.
 
+    The reference spectrum is only computed when a reference is set (or the windowing changes). Afterwards, each new scan
+    is blended into the reference with the `drift_memory` weight. When the correlation is confident and the drift is
+    within `drift_tolerance` survey pixels, the drift is considered settled and the survey image is not rescanned.
+
+    Every measured step of drift feeds a predictor, which offsets scans between measurements. While its predictions stay
+    within `drift_tolerance`, only every `drift_skip`th scan counts towards the next correction.
+
     Signals
     -------
     drift: int, int
@@ -58,11 +68,21 @@ class TranslateRegion(ShortCorrectionPage):
         Alias for `_order` to maintain a clean global namespace for the DSL.
     _drift_scans: Spinbox
         Alias for `_limit` to maintain a clean global namespace for the DSL.
+    _correlator: PhaseCorrelator
+        The engine finding the drift, which caches its buffers and the reference spectrum between runs.
+    _correlated: tuple[GreyImage, tuple] | None
+        The reference image (and the windowing settings applied to it) that the correlator currently holds.
+    _predictor: DriftPredictor
+        The model of the drift (in survey pixels) over time.
+    _skipped: int
+        The number of scans not counted since the last counted scan.
     """
     drift = core.pyqtSignal(int, int)
     # A new Qt signal defined to capture the updated Survey image
     updatedSurveyImage = core.pyqtSignal(images.RGBImage)
     SIZES = (256, 512, 1024, 2048, 4096, 8192, 16384)
+    PAD = 256
+    UPSAMPLE = 10
 
     def __init__(self, failure_action: typing.Callable[[Exception], None], mic: microscope.Microscope,
                  scanner: microscope.Scanner, scan_func: typing.Callable[[microscope.ScanType, bool], images.GreyImage],
@@ -78,6 +98,10 @@ class TranslateRegion(ShortCorrectionPage):
 
         self._ref: _None[images.GreyImage] = None
         self._region: _None[utils.ScanRegion] = None
+        self._correlator = utils.PhaseCorrelator(TranslateRegion.PAD, TranslateRegion.UPSAMPLE)
+        self._correlated: _None[_tuple[images.GreyImage, tuple]] = None
+        self._predictor = utils.DriftPredictor()
+        self._skipped = 0
 
         self._limit = utils.Spinbox(default_settings["drift_scans"], 1, validation.examples.drift)
         self._amount = utils.Counter(self._limit, "Number of scans since last routine", start=0)
@@ -136,9 +160,30 @@ class TranslateRegion(ShortCorrectionPage):
     def scans_increased(self):
         """
         Method to increase the number of scans performed by 1.
+
+        While the drift predictor is reliable, only every `drift_skip`th scan is counted.
         """
+        if self._predictor.reliable(default_settings["drift_tolerance"]):
+            self._skipped += 1
+            if self._skipped < default_settings["drift_skip"]:
+                return
+        self._skipped = 0
         self._amount.increase()
 
+    def predicted_offset(self) -> _tuple[float, float]:
+        """
+        Method to predict the drift that has not been corrected yet.
+
+        This is the fractional remainder of the last correction, plus the drift predicted since the last measurement.
+
+        Returns
+        -------
+        tuple[float, float]
+            The horizontal and vertical drift in survey pixels.
+        """
+        dy, dx = self._drift_accumulator + self._predictor.offset(time.monotonic())
+        return float(dx), float(dy)
+
     def set_ref(self, tl: _tuple[int, int], br: _tuple[int, int]):
         """
         Method to set a reference image.
@@ -156,6 +201,10 @@ class TranslateRegion(ShortCorrectionPage):
         self._ref = self._do_scan(0, 0)
         print(f"*****Size of the drift corr area: {self._ref.size}*****")
         self._amount.set_current(0)
+        self._skipped = 0
+        self._drift_accumulator[:] = 0
+        self._predictor.reset()
+        self._predictor.update(np.zeros(2), time.monotonic())
         self._outputs[0, 0].draw(self._ref, resize=True)
         self._display_popup(self._outputs)
         return self._ref
@@ -203,77 +252,32 @@ class TranslateRegion(ShortCorrectionPage):
             print("££££$$$$~~~~ sleeping 2 s waiting for ADF detector")
             time.sleep(2.5)        
             new = self._do_scan(x_shift, y_shift) # take new drift image: x_shift, y_shift are previous itteration measurements
+            scanned_at = time.monotonic()
             print('scan complete1')
         
         
         # new = self._do_scan(x_shift, y_shift)
         # print('scan complete2')
 
-        ref_mask = self._window(self._ref.convert(np.float64))
+        windowing = (self._windowing.focus.get_data(), tuple(lab.text() for lab in self._order.focus.get_members()))
+        if self._correlated is None or self._correlated[0] is not self._ref or self._correlated[1] != windowing:
+            ref_mask = self._window(self._ref.convert(np.float64))
+            self._correlator.reference(ref_mask - np.amin(ref_mask))
+            self._correlated = (self._ref, windowing)
         new_mask = self._window(new.convert(np.float64))
-        
-        print(f"from _drift line 195, new image size is: {new.convert(np.float64).shape}")
-
-        
         print('window update')
 
-        '''make the data from the ADF detector postive'''
-        ref_mask2 = ref_mask - np.amin(ref_mask)
-        new_mask2 = new_mask - np.amin(new_mask)
-        
-        ref_mean = np.mean(ref_mask2)
-        new_mean = np.mean(new_mask2)
-        
-        '''correct the scan artifact at the start of the scan as this prevents the correct cross correlation
-        of the two images'''
-        # ref_mask2[:, :2] = ref_median 
-        # new_mask2[:, :2] = new_median
-        
-        pad = 256
-        ref_pad = np.pad(ref_mask2,pad,constant_values=ref_mean,mode='constant')
-        new_pad = np.pad(new_mask2,pad,constant_values=new_mean,mode='constant')
-        #ref_pad = np.zeros((ref_mask.shape[0]+pad*2, ref_mask.shape[1]+pad*2))
-        #new_pad = np.zeros((new_mask.shape[0]+pad*2, new_mask.shape[1]+pad*2))
-        # ref_pad[pad:-pad, pad:-pad] = ref_mask
-        # new_pad[pad:-pad, pad:-pad] = new_mask
-        print(f"******ref and new images padded: {ref_pad.shape, new_pad.shape}")
-        
-        # corr, error, _ = convolve(ref_pad, new_pad) #convolve(ref_mask, new_mask)
-        
-
-        # shift = -corr
-        # print(f"SHIFT MEASURED: {shift} - error:  {error} - phasediff: {_}")
-        
-        # # Added 04/Sept:
-        # # shift_norm = shift / resolution # 4096
-        # # shift_applied = shift_norm * survey_size[0] # 512
-        # print(f"##### shift factor: {self.corr_scaling_factor} ######")
-        # shift_applied = shift * self.corr_scaling_factor
-
-        # ####
-        # self._calculated_shift = tuple(shift_applied)
-        # print(f"##### updated shift: {self._calculated_shift} ######")
-
-        # # pre-initialised _calculated_shift in _init
-        # # self._shift.change_data(shift)
-        # self._outputs[0, 1].draw(new, resize=True)
-        # print(type(self._outputs[0, 1]))
-        # shifted_ref = np.real(np.fft.ifft2(imgs.fourier_shift(np.fft.fft2(ref_mask), shift))).astype(np.int_) # modified by JR (10.04.2025)
-
-
-        # correction = shift.astype(np.int_)
-        # Debugging 04/Sept: applying normalisation and sampling factor correction to shift
-        # correction_app = shift_applied.astype(np.int_) # commented out 13:13 30-01-26
-        
-        corr, error, _ = convolve(ref_pad, new_pad) 
+        corr, error = self._correlator.register(new_mask - np.amin(new_mask))
+        confidence = self._correlator.confidence
 
         shift = -corr
-        print(f"SHIFT MEASURED: {shift} - error:  {error} - phasediff: {_}")
+        print(f"SHIFT MEASURED: {shift} - error:  {error} - confidence: {confidence}")
 
         # --- START ACCUMULATOR LOGIC ---
 
         # 1. Calculate precise drift for THIS scan (Float) [dy, dx]
         step_drift = shift * self.corr_scaling_factor
+        self._predictor.update(step_drift, scanned_at)
 
         # 2. Add to accumulator (The "Bucket")
         # This adds y to y, and x to x automatically
@@ -287,6 +291,9 @@ class TranslateRegion(ShortCorrectionPage):
 
         # --- END ACCUMULATOR LOGIC ---
 
+        settled = (confidence >= default_settings["drift_confidence"] and
+                   np.all(np.abs(step_drift) < default_settings["drift_tolerance"]))
+
         print(f"##### shift factor: {self.corr_scaling_factor} ######")
         print(f"##### updated shift (applied): {correction_app} | remainder: {self._drift_accumulator} ######")
 
@@ -295,19 +302,19 @@ class TranslateRegion(ShortCorrectionPage):
         self._outputs[0, 1].draw(new, resize=True)
 
         # Reference shift for display (keeps high-res shift)
-        shifted_ref = np.real(np.fft.ifft2(imgs.fourier_shift(np.fft.fft2(ref_mask), shift))).astype(np.int_) 
+        shifted_ref = self._correlator.shifted_reference(shift).astype(np.int_)
 
         #making a image to dispaly the overlap between the two images
+        new_pad, ref_pad = self._correlator.padded_moving, self._correlator.padded_reference
         shifted_mask = np.where(new_pad>0,255,0)
         unshifted_mask = np.where(ref_pad>0,255,0)
         overlap_mask = shifted_mask + unshifted_mask
         overlap = (new_pad + unshifted_mask)/(overlap_mask+0.001)
         overlap = 255*overlap/np.amax(overlap)
-        overlap = np.sum(np.reshape(overlap,(int(overlap.shape[0]/2),2,int(overlap.shape[0]/2),2)),axis=(1,3))
+        rows, cols = overlap.shape[0] // 2, overlap.shape[1] // 2
+        overlap = np.sum(np.reshape(overlap[:2 * rows, :2 * cols],(rows,2,cols,2)),axis=(1,3))
         overlap = overlap.astype(np.int_)
         
-        mask = shifted_ref - new_mask
-        mask = images.RGBImage(mask.astype(np.int_))#images.RGBImage(np.where(shifted_ref == new_mask, 255, 0))
         self._outputs[1, 0].draw(images.RGBImage(shifted_ref).norm(), resize=True)
         self._outputs[1, 1].draw(images.RGBImage(overlap).norm(), resize=True)
         #self._outputs[1, 1].draw(images.GreyImage.blank(overlap).norm(), resize=True)
@@ -315,7 +322,8 @@ class TranslateRegion(ShortCorrectionPage):
         # self._outputs[1, 1].draw( ,resize=True)  
         self._shift.change_data(self._calculated_shift) # Added by YX 23May2025
         
-        self.drift.emit(correction_app[1], correction_app[0]) # YX 04Sept
+        if np.any(correction_app):
+            self.drift.emit(correction_app[1], correction_app[0]) # YX 04Sept
 
         # NEW: Update the Drift Scan Region to "chase" the drifting feature
         # ---------------------------------------------------------------------
@@ -327,10 +335,15 @@ class TranslateRegion(ShortCorrectionPage):
         
         if microscope.ONLINE:
             self._ref = new # update _ref image with new drift image
+            self._correlator.adopt(default_settings["drift_memory"])
+            self._correlated = (self._ref, windowing)
             # updatedSurveyImage = self._scan(
             #     microscope.AreaScan(self._o_size, self._o_size), True #,(0,0)
             #     ).norm().dynamic().promote()
             # print("Scanning for the second time!!")
+        if microscope.ONLINE and settled:
+            print(f"Drift settled (confidence {confidence:.2f}), skipping survey rescan")
+        elif microscope.ONLINE:
             with self._link.subsystems["Detectors"].switch_inserted(True):
                 print("££££$$$$~~~~ sleeping 2 s waiting for ADF detector")
                 time.sleep(2.5)
@@ -349,7 +362,7 @@ class TranslateRegion(ShortCorrectionPage):
     def _window(self, image: np.ndarray) -> np.ndarray:
         def _hanning(img: np.ndarray) -> np.ndarray:
             m, n = img.shape
-            return img * np.outer(np.hanning(m), np.hanning(n))
+            return img * utils.hanning((m, n))
 
         def _sobel(img: np.ndarray) -> np.ndarray:
             sx = imgs.sobel(img, axis=0, mode="constant")
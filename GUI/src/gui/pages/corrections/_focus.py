@@ -1,3 +1,4 @@
+import json
 import typing
 from typing import Tuple as _tuple
 
@@ -23,6 +24,9 @@ default_settings = load_settings("assets/config.json",
                                  focus_limit=validation.examples.focus_limit_hex,
                                  focus_ROI=validation.examples.any_str,
                                  drift_resolution=validation.examples.resolution,
+                                 focus_metric=validation.examples.focus_metric,
+                                 focus_roi_size=validation.examples.natural_int,
+                                 focus_redraw=validation.examples.natural_int,
                                  )
 
 
@@ -32,6 +36,11 @@ class AutoFocus(ShortCorrectionPage):
 
     Attributes
     ----------
+    SEARCH: Type[FocusSearch]
+        The search used to find the best OLF value.
+    STATE: str
+        The file that the best OLF value is kept in between sessions. Like the settings, it is relative to the working
+        directory.
     _scanner: Scanner
         The scanner to perform a scan.
     _scan: Callable[[ScanType, bool], GreyImage]
@@ -52,7 +61,12 @@ class AutoFocus(ShortCorrectionPage):
         The maximum number defocus to check for. This is the absolute defocus measured in nm.
     _plot: Canvas
         The current image being scanned.
+    _best_focus: int | None
+        The best OLF value found by the last run (in this session or a previous one), used to warm-start the next
+        search.
     """
+    SEARCH: typing.Type[utils.FocusSearch] = utils.BrentSearch
+    STATE = "assets/focus_state.json"
 
     def __init__(self, failure_action: typing.Callable[[Exception], None], mic: microscope.Microscope,
                  scanner: microscope.Scanner, survey_size: _tuple[int, int],
@@ -63,6 +77,7 @@ class AutoFocus(ShortCorrectionPage):
         self._survey_size = survey_size # YX added
         self._region = microscope.FullScan(survey_size)
         self._drift_region = None
+        self._best_focus: typing.Optional[int] = self._load_best_focus()
 
         self._focus_scans = utils.Spinbox(default_settings["focus_scans"], 1, validation.examples.focus)
         self._scans = utils.Counter(self._focus_scans, "Number of scans since last routine", start=0)
@@ -146,8 +161,8 @@ class AutoFocus(ShortCorrectionPage):
 
     def run(self):
         """
-        Performs the autofocus routine using a Robust Multiresolution optimization.
-        Includes Parabolic Fitting and Safety Rollback.
+        Performs the autofocus routine using a bracketing search narrowed by `SEARCH`.
+        Includes a memoised score per lens value, a warm start, and Safety Rollback.
         """
         if not self.isEnabled():
             return
@@ -177,14 +192,14 @@ class AutoFocus(ShortCorrectionPage):
             link = self._link.subsystems["Lenses"]
 
             # --- Helper Functions ---
-            def _norm_var(img_data: np.ndarray) -> float:
-                """Calculates normalized variance: (std / mean)^2."""
-                mean = np.mean(img_data)
-                std = np.std(img_data)
-                return (std ** 2) / (mean ** 2) if mean != 0 else 0
+            metric = utils.FocusMetric[default_settings["focus_metric"]]
+            roi_size = default_settings["focus_roi_size"]
+            redraw = default_settings["focus_redraw"]
+            probes = 0
 
             def _scan_and_measure(val: int) -> typing.Tuple[float, np.ndarray]:
-                """Sets lens, scans, updates GUI canvas, returns (variance, image_data)."""
+                """Sets lens, scans, scores the raw frame, updates GUI canvas every `redraw` probes, returns (score, frame)."""
+                nonlocal probes
                 link.value = int(val)
                 scan_area = self._region
                 
@@ -209,33 +224,15 @@ class AutoFocus(ShortCorrectionPage):
                 
                 # grey_img = self._scan(scan_area, True)
 
-                grey_img = self._scan(scan_area, True).norm().dynamic().promote()
-                self._plot.draw(grey_img)
-                data = grey_img.data().astype(np.float64)
-                return _norm_var(data), data
-
-            def _parabolic_fit(x_points, y_points):
-                """Fits a parabola to 3 points and returns the vertex (x_max, y_max)."""
-                if len(x_points) < 3:
-                    return x_points[np.argmax(y_points)], np.max(y_points)
-                
-                # Fit y = ax^2 + bx + c
-                coeffs = np.polyfit(x_points, y_points, 2)
-                a, b, c = coeffs
-                
-                # Check if it's a peak (a < 0) or valley (a > 0)
-                if a >= 0: 
-                    # If it convex (valley) or flat, return max data point
-                    idx = np.argmax(y_points)
-                    return x_points[idx], y_points[idx]
-                
-                # Vertex x = -b / 2a
-                vertex_x = -b / (2 * a)
-                vertex_y = a * vertex_x**2 + b * vertex_x + c
-                return vertex_x, vertex_y
+                grey_img = self._scan(scan_area, True)
+                frame = grey_img.data()
+                if probes % redraw == 0:
+                    self._plot.draw(grey_img.norm().dynamic().promote())
+                probes += 1
+                return utils.sharpness(frame, metric, roi_size), utils.subsample(frame, roi_size)
 
             # --- Optimization Logic ---
-            def optimize_robust(coarse_range, fine_step, fine_window):
+            def optimize_robust(start_step, limit_val, fine_step):
                 base_OLf = link.value
                 
                 # Setup Plot
@@ -244,7 +241,7 @@ class AutoFocus(ShortCorrectionPage):
                 
                 ax_plot.set_title("Autofocus Metric")
                 ax_plot.set_xlabel("Defocus (OLf)")
-                ax_plot.set_ylabel("Normalized Variance")
+                ax_plot.set_ylabel(f"Sharpness ({metric.name})")
                 line, = ax_plot.plot([], [], 'b-o', label='Scan Data', alpha=0.6)
                 
                 ax_img.set_title("Live Scan")
@@ -254,9 +251,11 @@ class AutoFocus(ShortCorrectionPage):
                 all_ds = []
                 all_vs = []
                 
-                def update_visuals(val, score, img_data):
+                def update_visuals(val, score, img_data, force=False):
                     all_ds.append(val)
                     all_vs.append(score)
+                    if not force and len(all_ds) % redraw:
+                        return
                     
                     line.set_data(all_ds, all_vs)
                     ax_plot.relim()
@@ -276,99 +275,39 @@ class AutoFocus(ShortCorrectionPage):
                         fig.canvas.flush_events()
                         plt.pause(0.01)
 
+                def _probe(val: int) -> float:
+                    norm_var, img_data = _scan_and_measure(val)
+                    update_visuals(val, norm_var, img_data)
+                    print(f"OLf: {val:04X}, Var: {norm_var:.5f}")
+                    return norm_var
+
                 # --- 0. Baseline Measurement ---
                 print("Measuring baseline...")
                 #scan twice for first measurement for some reason!!
                 start_var, start_img = _scan_and_measure(base_OLf)
                 #time.sleep(0.5)
                 start_var, start_img = _scan_and_measure(base_OLf)
-                update_visuals(base_OLf, start_var, start_img)
+                update_visuals(base_OLf, start_var, start_img, force=True)
                 ax_plot.axhline(y=start_var, color='k', linestyle='--', label='Start Baseline')
                 ax_plot.legend()
 
-                # --- 1. Coarse Scan ---
-                print("Starting coarse scan...")
-                coarse_vs = []
-                coarse_ds = []
-                
-                for offset in coarse_range:
-                    current_val = int(base_OLf + offset)
-                    # Skip if we just measured it (0 offset)
-                    if current_val == base_OLf:
-                        norm_var = start_var
-                        img_data = start_img
-                    else:
-                        norm_var, img_data = _scan_and_measure(current_val)
-                        update_visuals(current_val, norm_var, img_data)
-                    
-                    coarse_ds.append(current_val)
-                    coarse_vs.append(norm_var)
-                    print(f"Coarse OLf: {current_val:04X}, Var: {norm_var:.5f}")
-
-                # Find Best Coarse Region
-                best_coarse_idx = np.argmax(coarse_vs)
-                best_coarse_OLf = coarse_ds[best_coarse_idx]
-                ax_plot.plot(best_coarse_OLf, coarse_vs[best_coarse_idx], 'rx', markersize=10, label='Best Coarse')
-                ax_plot.legend()
-                
-                print(f"Best coarse OLf: {best_coarse_OLf:04X}")
-
-                # --- 2. Fine Scan ---
-                print("Starting fine scan...")
-                start_fine = -fine_window // 2
-                stop_fine = fine_window // 2 + 1
-                fine_range = range(start_fine, stop_fine, fine_step)
-                
-                fine_vs = []
-                fine_ds = []
-                
-                for offset in fine_range:
-                    current_val = int(best_coarse_OLf + offset)
-                    # Optimization: skip if already measured in coarse scan
-                    if current_val in all_ds:
-                        # Find previous value
-                        idx = all_ds.index(current_val)
-                        norm_var = all_vs[idx]
-                        # Don't scan, just add to fine lists
-                    else:
-                        norm_var, img_data = _scan_and_measure(current_val)
-                        update_visuals(current_val, norm_var, img_data)
-                    
-                    fine_ds.append(current_val)
-                    fine_vs.append(norm_var)
-                    print(f"Fine OLf: {current_val:04X}, Var: {norm_var:.5f}")
-
-                if not fine_vs:
-                    print("Fine scan failed.")
-                    link.value = base_OLf
-                    return
-
-                # --- 3. Parabolic Refinement ---
-                # Get indices of top 3 points
-                sorted_indices = np.argsort(fine_vs)[-3:]
-                top_x = np.array(fine_ds)[sorted_indices]
-                top_y = np.array(fine_vs)[sorted_indices]
-                
-                ideal_OLf_float, ideal_var = _parabolic_fit(top_x, top_y)
-                ideal_OLf = int(ideal_OLf_float)
-                
-                print(f"Calculated Vertex: {ideal_OLf:04X} (Float: {ideal_OLf_float:.2f})")
-                
-                # --- 4. Validation & Rollback ---
-                # Compare max found variance vs baseline
-                # We require the new peak to be at least as good as start.
-                
-                # If fitting went wild (out of scan range), clamp it to discrete max
-                best_discrete_idx = np.argmax(fine_vs)
-                discrete_best_OLf = fine_ds[best_discrete_idx]
-                discrete_best_var = fine_vs[best_discrete_idx]
-                
-                # Sanity check: if parabola vertex is way outside our scan range, trust discrete max
-                if abs(ideal_OLf - discrete_best_OLf) > fine_window:
-                    print("Parabolic fit unstable, using discrete maximum.")
-                    ideal_OLf = discrete_best_OLf
-                    ideal_var = discrete_best_var
-
+                # --- 1. Warm start ---
+                scores = utils.ScoreCache(_probe)
+                scores.seed(base_OLf, start_var)
+                lower, upper = base_OLf - limit_val, base_OLf + limit_val
+                start = base_OLf
+                if self._best_focus is not None and lower <= self._best_focus <= upper:
+                    if scores(self._best_focus) > start_var:
+                        start = self._best_focus
+
+                # --- 2. Bracket and narrow ---
+                print(f"Searching from {start:04X}...")
+                ideal_OLf, ideal_var = self.SEARCH(fine_step).search(scores, start, start_step, lower, upper)
+                print(f"Best OLf: {ideal_OLf:04X} after {len(scores)} probes")
+
+                line.set_data(all_ds, all_vs)
+                ax_plot.relim()
+                ax_plot.autoscale_view()
                 ax_plot.plot(ideal_OLf, ideal_var, 'g*', markersize=15, label='Calculated Peak')
                 
                 # ROLLBACK CHECK
@@ -389,6 +328,8 @@ class AutoFocus(ShortCorrectionPage):
                 
                 # Final move
                 link.value = ideal_OLf
+                self._best_focus = ideal_OLf
+                self._save_best_focus()
 
             # --- Execution ---
             with link.switch_lens(microscope.Lens.OL_FINE):
@@ -400,17 +341,43 @@ class AutoFocus(ShortCorrectionPage):
                     limit_val = int(self._limit.focus.get_data())
                     fine_step = int(self._df.focus.get_data())
                     
-                    # Dynamic coarse step: ensure we get ~8-10 points across the range
-                    coarse_step = max(fine_step * 2, int(limit_val / 4))
-                    
-                    coarse_range = range(-limit_val, limit_val + 1, coarse_step)
-                    # Fine window is the size of 2 coarse steps to ensure overlap
-                    fine_window = coarse_step * 2
+                    # A warm start only needs a narrow bracket (it widens if focus has moved further); a cold start
+                    # brackets a quarter of the range
+                    if self._best_focus is None:
+                        start_step = max(fine_step * 2, int(limit_val / 4))
+                    else:
+                        start_step = fine_step
     
-                    optimize_robust(coarse_range, fine_step, fine_window)
+                    optimize_robust(start_step, limit_val, fine_step)
 
         self.runEnd.emit()
 
+    @classmethod
+    def _load_best_focus(cls) -> typing.Optional[int]:
+        """
+        Load the best OLF value of the last session.
+
+        Returns
+        -------
+        int | None
+            The best OLF value, or None if no run has been saved (or the file is unreadable).
+        """
+        try:
+            with open(cls.STATE) as state:
+                return int(json.load(state)["best_focus"], 16)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_best_focus(self):
+        """
+        Save the best OLF value, so that the next session can warm-start from it.
+        """
+        try:
+            with open(self.STATE, "w") as state:
+                json.dump({"best_focus": f"{self._best_focus:04X}"}, state)
+        except OSError as err:
+            print(f' - WARNING : Could not save the best focus to {self.STATE} ...', err)
+
     @staticmethod
     def _get_variance(image: images.GreyImage) -> float:
         array = image.convert(np.float64)
@@ -422,12 +389,15 @@ class AutoFocus(ShortCorrectionPage):
     def help(self) -> str:
         s = f"""This correction is meant to combat the OLf value of the microscope no longer being optimal.
         
-        The routine performs a Robust Multiresolution Scan:
-        1. Measures current focus score (Variance).
-        2. Coarse Scan: Scans range +/- Defocus Limit.
-        3. Fine Scan: Scans closely around the best coarse point.
-        4. Parabolic Fit: Calculates sub-step peak.
-        5. Safety Check: If new focus is not better than start, it reverts changes.
+        The routine performs a Bracketing Search:
+        1. Measures current focus score, and the score of the last best focus (if any, including from the last session).
+           The score is the sharpness of the raw frame, subsampled to at most {default_settings['focus_roi_size']} pixels a side,
+           using the {default_settings['focus_metric']} metric. The display updates every {default_settings['focus_redraw']} scans.
+        2. Bracket: Steps outwards from the better of the two until the score falls on both sides.
+           The first step is a quarter of the Coarse Range, or one Fine Step after a previous run.
+        3. Narrow: Uses Brent's method (parabolic fits with golden-section fallback) until the bracket is within a Fine Step.
+           No OLf value is scanned twice.
+        4. Safety Check: If new focus is not better than start, it reverts changes.
         
         Settings
         --------
@@ -438,10 +408,10 @@ class AutoFocus(ShortCorrectionPage):
         Fine Step:
             {validation.examples.focus_bits}
             
-            The step size for the 'Fine' scan phase.
+            The bracket width at which the search stops.
         Coarse Range (+/-):
             {validation.examples.focus_limit}
             
-            The +/- range (in nm) to perform the 'Coarse' scan over.
+            The +/- range (in nm) that the search is confined to.
         """
         return s
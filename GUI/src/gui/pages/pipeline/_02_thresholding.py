@@ -237,6 +237,15 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
         The widget deciding whether the resulting binary image should be inverted.
     _threshold_inversion: LabelledWidget[Checkbox]
         An alias for _invert, used to make the attached DSL's variable names clearer.
+    _cache: dict[tuple, RGBImage]
+        The output of each processing step, keyed by the step's node. A node is the previous step's node, the step name,
+        and the parameters of the step, so a node identifies the entire chain of operations that produced the image.
+    _source: RGBImage | None
+        The survey image the cache was built from. The cache is emptied whenever the survey image changes.
+    _node: tuple
+        The node of the current working image.
+    _draw_steps: bool
+        Whether each step draws its output. This is off during a full run, where only the final output is drawn.
     """
     settingChanged = SettingsPage.settingChanged
 
@@ -286,6 +295,11 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
 
         self._threshold_inversion = self._invert  # alias for get_control
 
+        self._cache: _dict[tuple, images.RGBImage] = {}
+        self._source: typing.Optional[images.RGBImage] = None
+        self._node: tuple = ()
+        self._draw_steps = True
+
         self.setLayout(self._layout)
 
         self.settingChanged.connect(lambda _, __: self.run() if self._prev.modified is not None else None)
@@ -307,10 +321,17 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
         self.runStart.emit()
         self._modified_image = None
         order = self._popup.widgets()["order"]
-        for fn in order.get_members():
-            if not fn.get_enabled():
-                continue
-            getattr(self, f"_{fn.name()}")()
+        self._draw_steps = False
+        try:
+            for fn in order.get_members():
+                if not fn.get_enabled():
+                    continue
+                getattr(self, f"_{fn.name()}")()
+        finally:
+            self._draw_steps = True
+        self._prune()
+        if self._modified_image is not None:
+            self._canvas.draw(self._modified_image)
         self.runEnd.emit()
 
     def start(self):
@@ -351,9 +372,22 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
             raise StagingError("any preprocessing", "scanning survey image")
         if self._modified_image is not None:
             return
+        if self._prev.original is not self._source:
+            self._cache.clear()
+            self._source = self._prev.original
+        self._node = ()
         self._modified_image = self._prev.original.copy()
         self._original_image = self._modified_image.copy()
-        self._canvas.draw(self._modified_image)
+        if self._draw_steps:
+            self._canvas.draw(self._modified_image)
+
+    def _prune(self):
+        keep = set()
+        node = self._node
+        while node:
+            keep.add(node)
+            node = node[0]
+        self._cache = {k: v for k, v in self._cache.items() if k in keep}
 
     def _blur(self, use_params=False, width: int = None, height: int = None):
         self._transform(lambda img, *args: img.transform.blur.basic.reference(*args),
@@ -385,7 +419,7 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
 
         self._transform(_edge,
                         lambda kwargs: (kwargs["size"],),
-                        "edge", use_params, size=size)
+                        "edge", use_params, self._threshold_state(), size=size)
 
     def _threshold(self, use_params=False):
         def _threshold(img: images.GreyImage):
@@ -399,7 +433,7 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
 
         self._transform(_threshold,
                         lambda kwargs: (),
-                        "threshold", use_params)
+                        "threshold", use_params, self._threshold_state())
 
     def _open(self, use_params=False, height: int = None, width: int = None, shape: int = None, multiplier: int = None,
               repeats: int = None):
@@ -446,9 +480,13 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
             "e_gradient", use_params, height=height, width=width, shape=shape, multiplier=multiplier, repeats=repeats
         )
 
+    def _threshold_state(self) -> typing.Tuple[int, int, bool]:
+        return (int(self._minima.focus.get_data()), int(self._maxima.focus.get_data()),
+                bool(self._invert.focus.get_data()))
+
     def _transform(self, fn: typing.Callable[..., None],
                    kwarg_arg_map: typing.Callable[[_dict[str, object]], typing.Iterable[object]], name: str,
-                   use_params=False, **kwargs):
+                   use_params=False, state: tuple = (), **kwargs):
         if use_params:
             if any(v is None for v in kwargs.values()):
                 raise ValueError(f"Expected {name} to have {', '.join(kwargs)}")
@@ -464,13 +502,20 @@ class ProcessingPipeline(CanvasPage, SettingsPage[Order]):
             def _post():
                 pass
         self._make_modified()
-        img = self._modified_image.demote().norm().dynamic()
         try:
-            fn(img, *kwarg_arg_map({k: self.get_setting(f"{name}_{k.title()}") for k in kwargs}))
+            args = tuple(kwarg_arg_map({k: self.get_setting(f"{name}_{k.title()}") for k in kwargs}))
+            node = (self._node, name, args, state)
+            cached = self._cache.get(node)
+            if cached is None:
+                img = self._modified_image.demote().norm().dynamic()
+                fn(img, *args)
+                cached = self._cache[node] = img.promote()
         finally:
             _post()
-        self._modified_image = img.promote()
-        self._canvas.draw(self._modified_image)
+        self._node = node
+        self._modified_image = cached
+        if self._draw_steps:
+            self._canvas.draw(self._modified_image)
 
     def all_settings(self) -> typing.Iterator[str]:
         yield from ("minima", "maxima", "threshold_inversion")
@@ -2,7 +2,7 @@ import functools
 import typing
 
 import numpy as np
-from sklearn.cluster import DBSCAN
+from scipy import ndimage
 
 from ._02_thresholding import ProcessingPipeline
 from ... import utils
@@ -231,18 +231,15 @@ class Clusters(ClusterPage, SettingsPage[Algorithm], ProcessPage):
         data = img.norm().data()
 
         indices = np.nonzero(data == 255)
-        white_mask = np.asarray(indices).T
-        regions = np.zeros_like(data)
         metric_params = {}
         metric = self.get_setting("algorithm").lower()
         if metric == "minkowski":
             metric_params["p"] = self.get_setting("power")
         elif metric == "euclidean" and self.get_setting("square"):
             metric = "sqeuclidean"
-        scan = DBSCAN(self._epsilon.focus.get_data(), min_samples=self._samples.focus.get_data(), metric=metric,
-                      metric_params=metric_params)
-        clusters = scan.fit_predict(white_mask) + 1
-        regions[indices] = clusters
+        regions = utils.density_labels(data == 255, self._epsilon.focus.get_data(), self._samples.focus.get_data(),
+                                       metric, metric_params, parallel=not self._automate)
+        clusters = regions[indices]
 
         if (largest := np.max(clusters)) == 0:
             self._newMax.emit(1)
@@ -269,8 +266,10 @@ class Clusters(ClusterPage, SettingsPage[Algorithm], ProcessPage):
                 return x_size == size[0] and y_size == size[1]
             return x_size <= size[0] and y_size <= size[1]
 
-        all_clusters = images.RGBImage(self._DBSCAN_regions)
-        self._cluster_image = all_clusters.copy()
+        regions = self._DBSCAN_regions
+        self._cluster_image = images.RGBImage(regions.copy())
+        im_size = (regions.shape[1], regions.shape[0])
+        boxes = ndimage.find_objects(regions)
 
         i = 0
         if progress is None:
@@ -286,9 +285,11 @@ class Clusters(ClusterPage, SettingsPage[Algorithm], ProcessPage):
                 continue
             if blue == 0:
                 continue
-            if not _size(cluster := utils.Cluster(all_clusters.downchannel(0, blue, invalid=images.ColourConvert.TO_BG),
-                                                  blue)):
-                self._cluster_image.replace(blue, 0)
+            rows, cols = boxes[blue - 1]
+            mask = regions[rows, cols] == blue
+            if not _size(cluster := utils.Cluster.from_mask(mask, (cols.start, rows.start), blue, im_size)):
+                ys, xs = np.nonzero(mask)
+                self._cluster_image.replace_by((ys + rows.start, xs + cols.start), 0)
                 self._progress.setMaximum(self._progress.maximum() - 1)
                 continue
             i += 1
@@ -4,7 +4,6 @@ import typing
 from datetime import datetime
 from typing import Tuple as _tuple, Optional as _None
 
-import h5py
 import numpy as np
 import time
 
@@ -57,7 +56,8 @@ default_settings = load_settings("assets/config.json",
                                  scan_mode=validation.examples.any_bool,
                                  session=validation.examples.save_path,
                                  sample=validation.examples.save_path,
-                                 scan_resolution=validation.examples.resolution
+                                 scan_resolution=validation.examples.resolution,
+                                 merlin_timeout=validation.examples.natural_float
                                  )
 
 
@@ -253,16 +253,25 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
         The current high-resolution being used.
     _i: int
         The index of the next square to scan.
+    _store: SessionStore | None
+        The session file of the current run. Each run (but not each resume) starts a new session file.
+    _writer: SessionWriter | None
+        The I/O thread that writes to the session file while the scan loop is running. It is drained and closed
+        whenever the loop exits, including on pause and stop.
+    _pattern: Callable[[], ndarray[int32, (n, 2)] | None] | None
+        The function that compiles the selected scan pattern of each square (in square co-ordinates), if there is one.
     """
     settingChanged = SettingsPage.settingChanged
     scanPerformed = core.pyqtSignal()
     _clusterScanned = core.pyqtSignal(int)
     _newVal = core.pyqtSignal(int)
+    _writeFailed = core.pyqtSignal(Exception)
     SIZES = (64, 128, 256, 512)
 
     def __init__(self, size: int, grids: Management, image: SurveyImage, marker: np.int_, done: np.int_,
                  failure_action: typing.Callable[[Exception], None], mic: microscope.Microscope,
-                 scanner: microscope.Scanner, clusters: Clusters, pipeline: ProcessingPipeline,drift_correction, focus_correction):
+                 scanner: microscope.Scanner, clusters: Clusters, pipeline: ProcessingPipeline,drift_correction, focus_correction,
+                 pattern: typing.Callable[[], _None[np.ndarray]] = None):
                 # Change made by YX 20260128 - running focus corr before first scan         
                 # scanner: microscope.Scanner, clusters: Clusters, pipeline: ProcessingPipeline,drift_correction):
                     
@@ -300,6 +309,9 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
         self._automate = False
         self._i = 0
         self._logger: _None[logging.Logger] = None
+        self._store: _None[utils.SessionStore] = None
+        self._writer: _None[utils.SessionWriter] = None
+        self._writeFailed.connect(failure_action)
 
         self._scan_mode = utils.LabelledWidget("Merlin Scan Mode", utils.CheckBox("&M", default_settings["scan_mode"]),
                                                utils.LabelOrder.SUFFIX)
@@ -331,6 +343,7 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
         self.setLayout(self._layout)
         self._mic = mic
         self._scanner = scanner
+        self._pattern = pattern
 
         self._resolution = default_settings["scan_resolution"]
         #save_path = X:\data\2025\cm40603-3\Merlin\test_1645
@@ -425,6 +438,31 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
         self._image.run()
         self._draw_images()
 
+    def _pre_offset(self, top_left: typing.Tuple[int, int], size: int) -> typing.Tuple[int, int]:
+        """
+        Offset the top-left corner of a high-resolution scan by the drift predicted since the last correction.
+
+        Parameters
+        ----------
+        top_left: tuple[int, int]
+            The top-left corner of the scan, in the high resolution.
+        size: int
+            The side length of the scan, used to keep the scan within the field of view.
+
+        Returns
+        -------
+        tuple[int, int]
+            The offset corner. An offset that would leave the field of view is not applied.
+        """
+        scale = self._resolution / self._canvas.image_size[0]
+        dx, dy = self.drift_correction.predicted_offset()
+        limit = self._resolution - size - 1
+        x, y = top_left[0] + round(dx * scale), top_left[1] + round(dy * scale)
+        x, y = (x if 0 <= x <= limit else top_left[0]), (y if 0 <= y <= limit else top_left[1])
+        if (x, y) != tuple(top_left):
+            print(f"Pre-offsetting scan by {x - top_left[0], y - top_left[1]}")
+        return x, y
+
     def _draw_images(self):
         self._modified_image = self._image.original.copy()
         for grid in self._regions[:self._i]:
@@ -483,47 +521,53 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
                 with self._mic.subsystems["Detectors"].switch_inserted(True):
                     img = self._scanner.scan()
                     print(i)  # testing for making sure nonlocal variable is read properly
-                    region_4k.save(f"{save_path}\\image_{i}.hdf5", img)
-
-        def _file_write():
-            with h5py.File(params, "w") as clear:
-                clear.clear()
-            with h5py.File(params, "a") as f:
-                if images_saved & utils.Stages.MARKER:
-                    f.create_dataset("Grid Marker", data=self._img(self._modified_image))
-                if images_saved & utils.Stages.CLUSTERS:
-                    f.create_dataset("Clusters Found", data=self._clusters())
-                if images_saved & utils.Stages.PROCESSED:
-                    f.create_dataset("Thresholded Image", data=self._pipeline())
-                if images_saved & utils.Stages.SURVEY:
-                    f.create_dataset("Survey Scan", data=self._survey())
+                    self._writer.submit(self._store.append, i, top_left, bottom_right, top_left_4k, img.data())
+
+        def _checkpoints():
+            if images_saved & utils.Stages.MARKER:
+                self._writer.submit(self._store.checkpoint, "Grid Marker", self._img(self._modified_image))
+            if images_saved & utils.Stages.CLUSTERS:
+                self._writer.submit(self._store.checkpoint, "Clusters Found", self._clusters())
+            if images_saved & utils.Stages.PROCESSED:
+                self._writer.submit(self._store.checkpoint, "Thresholded Image", self._pipeline())
+            if images_saved & utils.Stages.SURVEY:
+                self._writer.submit(self._store.checkpoint, "Survey Scan", self._survey())
 
         def _merlin_scan():
-            # time.sleep(1) # YX commenting this out
+            idle = microscope.Merlin.STATUS_IDLE
+            timings = {}
+            phase = time.perf_counter()
             try:
                 print("******First Try******")
-                # merlin_cmd.getVariable('DETECTORSTATUS', PRINT='ON')
                 merlin_cmd.setValue('FILENAME', f"{stamp}_data")
             except IndexError:
                 print("*****TRY AGAIN!**")
                 merlin_cmd.setValue('FILENAME', f"{stamp}_data")
-            merlin_cmd.setValue('TRIGGERSTART', 1) # YX removing time.sleep(1) in between
-            merlin_cmd.setValue('TRIGGERSTOP', 1)
-            time.sleep(1)
+            merlin_cmd.set_many({'TRIGGERSTART': 1, 'TRIGGERSTOP': 1})
+            timings["configure"] = time.perf_counter() - phase
             with self._mic.subsystems["Deflectors"].switch_blanked(False):
-                merlin_cmd.MPX_CMD(type_cmd='CMD', cmd='SCANSTARTRECORD')
-                time.sleep(1)
-                print('6')
+                phase = time.perf_counter()
+                merlin_cmd.command('SCANSTARTRECORD')
+                merlin_cmd.waitForStatus(lambda status: status != idle, timeout=merlin_timeout)
+                timings["arm"] = time.perf_counter() - phase
 
+                phase = time.perf_counter()
                 _ = self._scanner.scan(return_=False)
-                time.sleep(1) # YX changed from 1 to 0.001
-                merlin_cmd.setValue('TRIGGERSTART', 0)
-                merlin_cmd.setValue('TRIGGERSTOP', 0)
-                time.sleep(1)
+                timings["scan"] = time.perf_counter() - phase
+
+                phase = time.perf_counter()
+                merlin_cmd.waitForStatus(lambda status: status == idle, timeout=merlin_timeout)
+                merlin_cmd.set_many({'TRIGGERSTART': 0, 'TRIGGERSTOP': 0})
+                timings["finish"] = time.perf_counter() - phase
+            msg = "Merlin phases (s): " + ", ".join(f"{k}={v:.3f}" for k, v in timings.items())
+            print(msg)
+            if self._logger:
+                self._logger.debug(msg)
 
         if current is None:
             current = -1
             self._newVal.emit(0)
+        merlin_cmd = None
         if microscope.ONLINE:
             self._mic.subsystems["Deflectors"].blanked = True
         px_val = self.get_setting("scan_size")
@@ -532,122 +576,148 @@ class DeepSearch(CanvasPage, SettingsPage[GridSettings], ProcessPage):
         bit_depth = self.get_setting("bit_depth")
         images_saved = self.get_setting("checkpoints")
         do_merlin = self._scan_mode.focus.isChecked()
+        pattern = None if self._pattern is None or do_merlin else self._pattern()
+        if pattern is not None and len(np.unique(pattern, axis=0)) >= pixels:
+            pattern = None  # the pattern visits every pixel, so the square is scanned as before
+        merlin_timeout = default_settings["merlin_timeout"]
         save_path = self.get_setting("save_path").format(session=self._session.focus.text()[1:-1],
                                                          sample=self._sample.focus.text()[1:-1]).replace("/", "\\")
         try:
             validation.examples.save_path.validate(f"\'{save_path}\'")
         except validation.ValidationError as err:
             raise GUIError(utils.ErrorSeverity.ERROR, "Cannot validate save path", str(err))
+        if current == -1 or self._store is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._store = utils.SessionStore(f"{save_path}\\{stamp}_session.hdf")
         if microscope.ONLINE:
             self._scanner.scan_area = microscope.FullScan((self._resolution, self._resolution))
             self._scanner.dwell_time = exposure  # add pattern
             hostname = "10.182.0.5"
-            merlin_cmd = microscope.merlin_connection.MERLIN_connection(hostname)
-            print('Setup')
-            # <editor-fold desc="Merlin config">
-            print("******Detector STATUS******")
-            merlin_cmd.getVariable('DETECTORSTATUS', PRINT='ON')
+            merlin_cmd = microscope.MerlinPool.get(hostname).acquire("cmd")
+            try:
+                print('Setup')
+                # <editor-fold desc="Merlin config">
+                print("******Detector STATUS******")
+                merlin_cmd.getVariable('DETECTORSTATUS', PRINT='ON')
             
-            merlin_cmd.setValue('NUMFRAMESTOACQUIRE', pixels)
-            merlin_cmd.setValue('COUNTERDEPTH', bit_depth)
-            merlin_cmd.setValue('CONTINUOUSRW', 1)
-            merlin_cmd.setValue('ACQUISITIONTIME', (exposure / 2e3))
-            merlin_cmd.setValue('FILEDIRECTORY', save_path)
-            merlin_cmd.setValue('FILEENABLE', 1)
-            # trigger set up and filesaving
-            merlin_cmd.setValue('SAVEALLTOFILE', 1)
-            merlin_cmd.setValue('USETIMESTAMPING', 1)
-            # setting up VDF with STEM mode
-            merlin_cmd.setValue('SCANX', px_val)
-            merlin_cmd.setValue('SCANY', px_val)
-            #        # set to pixel trigger
-            merlin_cmd.setValue('SCANTRIGGERMODE', 0)
-            merlin_cmd.setValue('SCANDETECTOR1ENABLE', 1)
-            # Standard ADF det
-            merlin_cmd.setValue('SCANDETECTOR1TYPE', 0)
-            merlin_cmd.setValue('SCANDETECTOR1CENTREX', 256)
-            merlin_cmd.setValue('SCANDETECTOR1CENTREY', 256)
-            merlin_cmd.setValue('SCANDETECTOR1INNERRADIUS', 80)
-            merlin_cmd.setValue('SCANDETECTOR1OUTERRADIUS', 250)
-            # </editor-fold>
-
-        original = self._original_image.data()
-        for i, region in enumerate(self._regions):
-            print(f"*********region {i+1}************")
+                merlin_cmd.set_many({
+                    'NUMFRAMESTOACQUIRE': pixels,
+                    'COUNTERDEPTH': bit_depth,
+                    'CONTINUOUSRW': 1,
+                    'ACQUISITIONTIME': (exposure / 2e3),
+                    'FILEDIRECTORY': save_path,
+                    'FILEENABLE': 1,
+                    # trigger set up and filesaving
+                    'SAVEALLTOFILE': 1,
+                    'USETIMESTAMPING': 1,
+                    # setting up VDF with STEM mode
+                    'SCANX': px_val,
+                    'SCANY': px_val,
+                    # set to pixel trigger
+                    'SCANTRIGGERMODE': 0,
+                    'SCANDETECTOR1ENABLE': 1,
+                    # Standard ADF det
+                    'SCANDETECTOR1TYPE': 0,
+                    'SCANDETECTOR1CENTREX': 256,
+                    'SCANDETECTOR1CENTREY': 256,
+                    'SCANDETECTOR1INNERRADIUS': 80,
+                    'SCANDETECTOR1OUTERRADIUS': 250,
+                })
+                # </editor-fold>
+            except BaseException:
+                microscope.MerlinPool.get(hostname).release(merlin_cmd, broken=True)
+                raise
+
+        try:
+            if microscope.ONLINE:
+                self._writer = utils.SessionWriter(self._store, self._writeFailed.emit)
+                _checkpoints()
             original = self._original_image.data()
-            self._i = i + 1
-            if i < current:
-                continue
-            elif self._state == utils.StoppableStatus.PAUSED:
-                self._run.pause.emit(i)
-                return
-            elif self._state == utils.StoppableStatus.DEAD:
+            for i, region in enumerate(self._regions):
+                print(f"*********region {i+1}************")
+                original = self._original_image.data()
+                self._i = i + 1
+                if i < current:
+                    continue
+                elif self._state == utils.StoppableStatus.PAUSED:
+                    self._run.pause.emit(i)
+                    return
+                elif self._state == utils.StoppableStatus.DEAD:
+                    with self._canvas as draw:
+                        draw.data.reference()[:, :] = original.copy()
+                    return
+                elif region.disabled:
+                    continue
+
                 with self._canvas as draw:
                     draw.data.reference()[:, :] = original.copy()
-                return
-            elif region.disabled:
-                continue
-
-            with self._canvas as draw:
-                draw.data.reference()[:, :] = original.copy()
-                region.draw(draw, self._marker)
-                region.draw(self._original_image, self._done)
-                if not microscope.ONLINE:
-                    time.sleep(1)
-
-            if microscope.ONLINE:
-                with self._mic.subsystems["Detectors"].switch_inserted(False):
-                    region_4k = region @ self._resolution
-                    top_left, top_left_4k = region[Corners.TOP_LEFT], region_4k[Corners.TOP_LEFT]
-                    bottom_right = region[Corners.BOTTOM_RIGHT]
-                    scan_area = microscope.AreaScan((self._resolution, self._resolution),
-                                                    (px_val, px_val+1), top_left_4k) # Adding 1 extra lines 
+                    region.draw(draw, self._marker)
+                    region.draw(self._original_image, self._done)
+                    if not microscope.ONLINE:
+                        time.sleep(1)
+
+                if microscope.ONLINE:
+                    with self._mic.subsystems["Detectors"].switch_inserted(False):
+                        region_4k = region @ self._resolution
+                        top_left, top_left_4k = region[Corners.TOP_LEFT], region_4k[Corners.TOP_LEFT]
+                        top_left_4k = self._pre_offset(top_left_4k, px_val)
+                        bottom_right = region[Corners.BOTTOM_RIGHT]
+                        scan_area = microscope.AreaScan((self._resolution, self._resolution),
+                                                        (px_val, px_val+1), top_left_4k) # Adding 1 extra lines 
                     
-                    print(f"from _05_search Line 597, scan_area: {scan_area._w, scan_area._h}")
-                    with self._scanner.switch_scan_area(scan_area):
-                        # print(f"******scan area: {scan_area.rect}******")
-                        if not os.path.exists(save_path):
-                            os.makedirs(save_path)
-                            print(f"Made dir: {save_path}")
-                        # self._logger = .Logger("drift", level=logging.DEBUG)
-                        # logging.basicConfig(level=logging.DEBUG,
-                        #                     filename=f"{save_path}\\drift.log", filemode="a", force=True)
-                        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        params = f"{save_path}\\{stamp}.hdf"
-                        if not do_merlin:
-                            print("************4********")
-                            _reg_scan()
-                        else:
-                            print(params)
-                            print("************3********")
-                        _file_write()
+                        print(f"from _05_search Line 597, scan_area: {scan_area._w, scan_area._h}")
+                        with self._scanner.switch_scan_area(scan_area):
+                            # print(f"******scan area: {scan_area.rect}******")
+                            if not os.path.exists(save_path):
+                                os.makedirs(save_path)
+                                print(f"Made dir: {save_path}")
+                            # self._logger = .Logger("drift", level=logging.DEBUG)
+                            # logging.basicConfig(level=logging.DEBUG,
+                            #                     filename=f"{save_path}\\drift.log", filemode="a", force=True)
+                            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                            if not do_merlin:
+                                print("************4********")
+                                if pattern is not None:
+                                    # only scan the part of the square the pattern visits
+                                    self._scanner.set_pattern(pattern + top_left_4k)
+                                    sx, _, sy, _ = self._scanner.scan_area.rect()
+                                    top_left_4k = sx, sy
+                                _reg_scan()
+                            else:
+                                print(self._store.path)
+                                print("************3********")
                         
-                        if do_merlin:
-                            with h5py.File(params, "a") as co_ords:
-                                dset = co_ords.create_group("Co-ordinates (cartesian, non-scaled)")
-                                dset.attrs["top left"] = top_left
-                                dset.attrs["bottom right"] = bottom_right
-                            merlin_params = {'set_dwell_time(usec)': exposure, 'set_scan_px': px_val,
-                                              'set_bit_depth': bit_depth}
-                            self._mic.export(params, px_val, **merlin_params)
-                            with self._scanner.using_connection(6, microscope.TTLMode.SOURCE_TIMED,
-                                                                microscope.PixelClock(microscope.EdgeType.RISING),
-                                                                active=1e-5):
-                                print("************2********")
-                                _merlin_scan()
+                            if do_merlin:
+                                merlin_params = {'set_dwell_time(usec)': exposure, 'set_scan_px': px_val,
+                                                  'set_bit_depth': bit_depth}
+                                metadata = self._store.scratch()
+                                self._mic.export(metadata, px_val, **merlin_params)
+                                self._writer.submit(self._store.append, i, top_left, bottom_right, top_left_4k,
+                                                    name=f"{stamp}_data", metadata=metadata)
+                                with self._scanner.using_connection(6, microscope.TTLMode.SOURCE_TIMED,
+                                                                    microscope.PixelClock(microscope.EdgeType.RISING),
+                                                                    active=1e-5):
+                                    print("************2********")
+                                    _merlin_scan()
 
                             
                             
-            if self._progress.isEnabled():
-                print("************1********")
-                self.scanPerformed.emit()
-                self._clusterScanned.emit(i + 1)
-                # Would these then trigger _drift.run?
-
-        with self._canvas as draw:
-            draw.data.reference()[:, :] = original.copy()
-        self.runEnd.emit()
-        self.clear()
+                if self._progress.isEnabled():
+                    print("************1********")
+                    self.scanPerformed.emit()
+                    self._clusterScanned.emit(i + 1)
+                    # Would these then trigger _drift.run?
+
+            with self._canvas as draw:
+                draw.data.reference()[:, :] = original.copy()
+            self.runEnd.emit()
+            self.clear()
+        finally:
+            if merlin_cmd is not None:
+                microscope.MerlinPool.get(hostname).release(merlin_cmd)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
 
     def automate(self):
         """
@@ -1,6 +1,12 @@
 from ._decorators import *
 from ._widgets import *
 from ._clustering import *
+from ._density import *
+from ._correlate import *
+from ._predict import *
+from ._focus_search import *
+from ._sharpness import *
+from ._session import *
 from ._patterns import *
 
 from ._enums import *
@@ -142,9 +142,7 @@ class ScanRegion:
         """
         if not isinstance(other, Cluster):
             return NotImplemented
-        area = other.cluster.region(self[images.AABBCorner.TOP_LEFT], self[images.AABBCorner.BOTTOM_RIGHT]).data()
-        count = np.count_nonzero(area)
-        return count
+        return other.count(self[images.AABBCorner.TOP_LEFT], self[images.AABBCorner.BOTTOM_RIGHT])
 
     __rand__ = __and__
 
@@ -275,7 +273,7 @@ class Grid:
         self._pitch_size = sq_size
         self._start = offset
         self._resolution = resolution
-        self._all = list(self._regions())
+        self._all = [ScanRegion((int(x), int(y)), sq_size, resolution) for x, y in self._regions()]
 
     def __iter__(self) -> typing.Iterator[ScanRegion]:
         """
@@ -327,18 +325,18 @@ class Grid:
             raise TypeError(f"Expected a percentage, got {min_rel}")
 
         min_abs = int(min_rel * self._pitch_size ** 2)
-
-        def _valid(region: ScanRegion) -> bool:
-            try:
-                count = (region & self._owner)
-                return count >= min_abs
-            except ValueError:
-                return False
-
-        self._tight = list(filter(_valid, self._all))
+        if not self._all:
+            self._tight = []
+            self._is_tight = True
+            return
+        starts = np.array([region[images.AABBCorner.TOP_LEFT] for region in self._all])
+        ends = np.array([region[images.AABBCorner.BOTTOM_RIGHT] for region in self._all])
+        w, h = self._owner.image_size
+        valid = (self._owner.count_many(starts, ends) >= min_abs) & (starts[:, 0] < w) & (starts[:, 1] < h)
+        self._tight = [region for region, keep in zip(self._all, valid) if keep]
         self._is_tight = True
 
-    def _regions(self) -> typing.Iterator[ScanRegion]:
+    def _regions(self) -> np.ndarray:
         def _pad(minima: int, maxima: int) -> _tuple[int, int]:
             do_min = do_max = True
             while (maxima - minima) % self._pitch_size:
@@ -362,13 +360,10 @@ class Grid:
         top, bottom = self._owner.extreme(Axis.Y, Extreme.MINIMA), self._owner.extreme(Axis.Y, Extreme.MAXIMA)
         self._left, self._right = _pad(left, right)
         self._top, self._bottom = _pad(top, bottom)
-        curr_y = self._top + self._start[1]
-        while curr_y + self._pitch_size <= self._bottom:
-            curr_x = self._left + self._start[0]
-            while curr_x + self._pitch_size <= self._right:
-                yield ScanRegion((curr_x, curr_y), self._pitch_size, self._resolution)
-                curr_x += self._pitch_size
-            curr_y += self._pitch_size
+        xs = np.arange(self._left + self._start[0], self._right - self._pitch_size + 1, self._pitch_size)
+        ys = np.arange(self._top + self._start[1], self._bottom - self._pitch_size + 1, self._pitch_size)
+        grid_y, grid_x = np.meshgrid(ys, xs, indexing="ij")
+        return np.stack((grid_x.ravel(), grid_y.ravel()), axis=1)
 
 
 class Cluster:
@@ -379,9 +374,12 @@ class Cluster:
     ----------
     _label: int_
         The colour label of the cluster.
-    _binary: GreyBiModal
-        The binary image of the cluster. Note that this will be an image of the same size as the GUI's survey image,
-        with only the cluster itself being white (255).
+    _mask: ndarray[bool, [r, c]]
+        The binary mask of the cluster, cropped to its AABB (so the top-left of the mask is `_min`).
+    _im_size: tuple[int, int]
+        The width and height of the image the cluster was found in (the GUI's survey image).
+    _sat: ndarray[int_, [r, c]] | None
+        The summed-area table of the mask (with a leading row and column of zeros), built on first use.
     _min: tuple[int, int]
         The top-left corner of the cluster's AABB.
     _max: tuple[int, int]
@@ -416,12 +414,43 @@ class Cluster:
         """
         Public access to the underlying image.
 
+        This is built on demand (at the size of the original image) from the cropped mask, so should be avoided in
+        loops.
+
         Returns
         -------
         GreyBimodal
             The binary image representing the polygon.
         """
-        return self._binary
+        w, h = self._im_size
+        data = np.zeros((h, w), dtype=np.int_)
+        (left, top), (right, bottom) = self._min, self._max
+        data[top:bottom + 1, left:right + 1][self._mask] = 255
+        return images.GreyBiModal(data, np.int_(0), np.int_(255))
+
+    @property
+    def image_size(self) -> _tuple[int, int]:
+        """
+        Public access to the size of the image the cluster was found in.
+
+        Returns
+        -------
+        tuple[int, int]
+            The width and height of the image.
+        """
+        return self._im_size
+
+    @property
+    def mask(self) -> np.ndarray:
+        """
+        Public access to the cropped mask.
+
+        Returns
+        -------
+        ndarray[bool, [r, c]]
+            The binary mask of the cluster, cropped to its bounding box (whose top-left corner is `position()`).
+        """
+        return self._mask
 
     @property
     def id(self) -> np.int_:
@@ -439,14 +468,14 @@ class Cluster:
         self._label = np.int_(label)
         if image.get_colours() != {np.int_(0), self._label}:
             raise TypeError(f"Expected image colours to be 0 and {label}, got {image.get_colours()}")
-        promoted_image = image.upchannel().find_replace(self._label, 255)
-        demoted_image = promoted_image.demote()
-        self._binary = demoted_image.downchannel(0, 255)
-        img = self._binary.data()
-        rows_f, = np.nonzero(np.sum(img, axis=0))
-        cols_f, = np.nonzero(np.sum(img, axis=1))
+        img = image.data() == self._label
+        rows_f, = np.nonzero(np.any(img, axis=0))
+        cols_f, = np.nonzero(np.any(img, axis=1))
         self._min = (rows_f[0], cols_f[0])
         self._max = (rows_f[-1], cols_f[-1])
+        self._mask = img[cols_f[0]:cols_f[-1] + 1, rows_f[0]:rows_f[-1] + 1].copy()
+        self._im_size = (img.shape[1], img.shape[0])
+        self._sat: typing.Optional[np.ndarray] = None
         self._marked = False
 
     def __contains__(self, point: _tuple[int, int]) -> bool:
@@ -463,7 +492,13 @@ class Cluster:
         bool
             Whether the specified co-ordinate is in the cluster.
         """
-        return bool(self._binary[point])
+        x, y = point
+        if x < 0 or y < 0 or x >= self._im_size[0] or y >= self._im_size[1]:
+            raise IndexError(f"Position {point} out of range")
+        (left, top), (right, bottom) = self._min, self._max
+        if x < left or x > right or y < top or y > bottom:
+            return False
+        return bool(self._mask[y - top, x - left])
 
     def __str__(self) -> str:
         return f"Cluster {self.id}"
@@ -549,6 +584,51 @@ class Cluster:
         """
         return self.extreme(axis, Extreme.MAXIMA) - self.extreme(axis, Extreme.MINIMA)
 
+    def count(self, start: _tuple[int, int], end: _tuple[int, int]) -> int:
+        """
+        Count the number of cluster pixels inside a rectangle.
+
+        Parameters
+        ----------
+        start: tuple[int, int]
+            The top left corner of the rectangle.
+        end: tuple[int, int]
+            The bottom right corner of the rectangle (inclusive).
+
+        Returns
+        -------
+        int
+            The number of pixels of the cluster inside the rectangle.
+        """
+        return int(self.count_many(np.array([start]), np.array([end]))[0])
+
+    def count_many(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Count the number of cluster pixels inside many rectangles at once, using the summed-area table of the mask.
+
+        Parameters
+        ----------
+        starts: ndarray[int_, [n, 2]]
+            The top left corner of each rectangle.
+        ends: ndarray[int_, [n, 2]]
+            The bottom right corner of each rectangle (inclusive).
+
+        Returns
+        -------
+        ndarray[int_, [n]]
+            The number of pixels of the cluster inside each rectangle.
+        """
+        if self._sat is None:
+            self._sat = np.zeros((self._mask.shape[0] + 1, self._mask.shape[1] + 1), dtype=np.int_)
+            self._sat[1:, 1:] = self._mask.cumsum(axis=0, dtype=np.int_).cumsum(axis=1)
+        (left, top), (right, bottom) = self._min, self._max
+        sx = np.clip(starts[:, 0], left, right + 1) - left
+        sy = np.clip(starts[:, 1], top, bottom + 1) - top
+        ex = np.clip(ends[:, 0] + 1, left, right + 1) - left
+        ey = np.clip(ends[:, 1] + 1, top, bottom + 1) - top
+        sat = self._sat
+        return np.where((ex > sx) & (ey > sy), sat[ey, ex] - sat[sy, ex] - sat[ey, sx] + sat[sy, sx], 0)
+
     def divide(self, square: int, off_val: int, off_dir: Overlap, resolution: int) -> Grid:
         """
         Divide the bounding box into a singular grid.
@@ -572,6 +652,37 @@ class Cluster:
         return Grid(square, (off_val if Overlap.X & off_dir else 0, off_val if Overlap.Y & off_dir else 0), resolution,
                     self)
 
+    @classmethod
+    def from_mask(cls, mask: np.ndarray, offset: _tuple[int, int], label: int, im_size: _tuple[int, int]) -> "Cluster":
+        """
+        Alternate constructor to construct a cluster from an already cropped mask, rather than a full image.
+
+        Parameters
+        ----------
+        mask: ndarray[bool, [r, c]]
+            The binary mask of the cluster, cropped tightly to its bounding box.
+        offset: tuple[int, int]
+            The cartesian co-ordinates of the top-left corner of the mask.
+        label: int
+            The label of the cluster. This will determine the colour.
+        im_size: tuple[int, int]
+            The size of the image the cluster is in.
+
+        Returns
+        -------
+        Cluster
+            The cluster represented by the mask.
+        """
+        cluster = cls.__new__(cls)
+        cluster._label = np.int_(label)
+        cluster._mask = mask
+        cluster._im_size = im_size
+        cluster._min = offset
+        cluster._max = (offset[0] + mask.shape[1] - 1, offset[1] + mask.shape[0] - 1)
+        cluster._sat = None
+        cluster._marked = False
+        return cluster
+
     @classmethod
     def from_vertices(cls, v1: _tuple[int, int], v2: _tuple[int, int], v3: _tuple[int, int], *v_e: _tuple[int, int],
                       label: int, im_size: _tuple[int, int]) -> "Cluster":
@@ -0,0 +1,283 @@
+import functools
+from typing import Optional as _None, Tuple as _tuple
+
+import numpy as np
+from scipy.fft import next_fast_len
+
+try:
+    import pyfftw
+    from pyfftw.interfaces import scipy_fft as _fft
+
+    pyfftw.interfaces.cache.enable()
+except ImportError:
+    from scipy import fft as _fft
+
+__all__ = ["hanning", "PhaseCorrelator"]
+
+
+@functools.lru_cache(maxsize=8)
+def hanning(shape: _tuple[int, int]) -> np.ndarray:
+    """
+    Create (and cache) a 2D Hanning window.
+
+    Parameters
+    ----------
+    shape: tuple[int, int]
+        The shape of the window.
+
+    Returns
+    -------
+    ndarray
+        The read-only outer product of the Hanning window along each axis.
+    """
+    window = np.outer(np.hanning(shape[0]), np.hanning(shape[1]))
+    window.flags.writeable = False
+    return window
+
+
+class PhaseCorrelator:
+    """
+    Reusable phase correlation engine, used to find the translation between a reference image and a moving image.
+
+    Each image is padded with its mean into a buffer of a fast transform length, and only the real-to-complex half of
+    its spectrum is ever computed. The buffers and the reference spectrum persist between calls, so registering a new
+    image costs one forward and one inverse real transform. The transforms use pyFFTW (with its plan cache) when it is
+    installed, and multithreaded `scipy.fft` otherwise.
+
+    Sub-pixel refinement evaluates the inverse transform of the cross-power spectrum only on a fine grid around the
+    integer peak, by a matrix-multiply DFT, rather than upsampling the entire correlation.
+
+    Each registration also measures its confidence, as the ratio of the correlation peak to the highest secondary peak.
+    A registered image can then replace the reference, or be blended into it as an exponential moving average (once the
+    old reference is aligned to it), which both reuse the spectrum of the registered image.
+
+    Attributes
+    ----------
+    _pad: int
+        The minimum padding around each image.
+    _upsample: int
+        The upsampling factor for sub-pixel refinement. A factor of 1 only finds integer shifts.
+    _workers: int
+        The number of threads used by each transform.
+    _shape: tuple[int, int] | None
+        The shape of the images currently being correlated.
+    _ref: ndarray | None
+        The padded reference buffer.
+    _mov: ndarray | None
+        The padded moving buffer.
+    _ref_freq: ndarray | None
+        The half spectrum of the padded reference.
+    _mov_freq: ndarray | None
+        The half spectrum of the most recently registered moving image.
+    _ref_amp: float
+        The energy of the padded reference.
+    _mov_amp: float
+        The energy of the padded moving image.
+    _shift: ndarray | None
+        The shift found by the most recent registration.
+    _confidence: float
+        The peak ratio of the most recent registration.
+
+    Parameters
+    ----------
+    pad: int
+        The minimum padding around each image.
+    upsample: int
+        The upsampling factor for sub-pixel refinement.
+    workers: int
+        The number of threads used by each transform. Negative values wrap around the number of CPUs.
+    """
+
+    @property
+    def padded_reference(self) -> _None[np.ndarray]:
+        """
+        Public access to the padded reference buffer.
+
+        Returns
+        -------
+        ndarray | None
+            The padded reference. Note this is not a copy, and is overwritten when the reference changes.
+        """
+        return self._ref
+
+    @property
+    def padded_moving(self) -> _None[np.ndarray]:
+        """
+        Public access to the padded moving buffer.
+
+        Returns
+        -------
+        ndarray | None
+            The padded moving image. Note this is not a copy, and is overwritten on each registration.
+        """
+        return self._mov
+
+    @property
+    def confidence(self) -> float:
+        """
+        Public access to the confidence of the most recent registration.
+
+        Returns
+        -------
+        float
+            The ratio of the correlation peak to the highest peak outside its neighbourhood. This is 0 before any
+            registration, and larger values imply a more reliable shift.
+        """
+        return self._confidence
+
+    def __init__(self, pad: int = 256, upsample: int = 1, workers: int = -1):
+        self._pad = pad
+        self._upsample = max(int(upsample), 1)
+        self._workers = workers
+        self._shape: _None[_tuple[int, int]] = None
+        self._ref: _None[np.ndarray] = None
+        self._mov: _None[np.ndarray] = None
+        self._ref_freq: _None[np.ndarray] = None
+        self._mov_freq: _None[np.ndarray] = None
+        self._ref_amp = self._mov_amp = 0.0
+        self._shift: _None[np.ndarray] = None
+        self._confidence = 0.0
+
+    def reference(self, image: np.ndarray):
+        """
+        Set the reference image, computing and caching its spectrum.
+
+        Parameters
+        ----------
+        image: ndarray
+            The 2D reference image.
+        """
+        self._resize(image.shape)
+        self._ref_freq, self._ref_amp = self._load(self._ref, image)
+
+    def register(self, image: np.ndarray) -> _tuple[np.ndarray, float]:
+        """
+        Find the translation of the reference relative to a moving image.
+
+        This matches the convention of `skimage.registration.phase_cross_correlation(reference, image)`.
+
+        Parameters
+        ----------
+        image: ndarray
+            The 2D moving image. It must have the same shape as the reference.
+
+        Returns
+        -------
+        tuple[ndarray, float]
+            The (y, x) shift, and the translation invariant normalised RMS error between the images.
+
+        Raises
+        ------
+        ValueError
+            If there is no reference, or the moving image has a different shape.
+        """
+        if self._ref_freq is None:
+            raise ValueError("No reference image to register against")
+        if image.shape != self._shape:
+            raise ValueError(f"Expected a {self._shape} image, got {image.shape}")
+        self._mov_freq, self._mov_amp = self._load(self._mov, image)
+        product = self._ref_freq * self._mov_freq.conj()
+        product /= np.maximum(np.abs(product), 100 * np.finfo(np.float64).eps)
+        correlation = _fft.irfft2(product, s=self._ref.shape, workers=self._workers)
+        peak = np.array(np.unravel_index(np.argmax(correlation), correlation.shape), dtype=np.float64)
+        peak_value = correlation[tuple(peak.astype(np.int_))]
+        self._confidence = self._peak_ratio(correlation, tuple(peak.astype(np.int_)))
+        if self._upsample > 1:
+            peak, peak_value = self._refine(product, peak)
+        dims = np.array(correlation.shape)
+        peak[peak > dims // 2] -= dims[peak > dims // 2]
+        error = 1.0 - peak_value ** 2 / max(self._ref_amp * self._mov_amp, np.finfo(np.float64).eps)
+        self._shift = peak.copy()
+        return peak, float(np.sqrt(abs(error)))
+
+    def adopt(self, weight: float = 1.0):
+        """
+        Make the most recently registered image the new reference, reusing its spectrum.
+
+        With a weight below 1, the old reference is shifted onto the registered image and blended with it, giving an
+        exponential moving average of the aligned frames in the co-ordinates of the latest frame.
+
+        Parameters
+        ----------
+        weight: float
+            The weight of the registered image in the new reference. A weight of 1 replaces the reference.
+
+        Raises
+        ------
+        ValueError
+            If no image has been registered since the last reference change.
+        """
+        if self._mov_freq is None:
+            raise ValueError("No registered image to adopt")
+        if weight >= 1:
+            self._ref, self._mov = self._mov, self._ref
+            self._ref_freq, self._ref_amp = self._mov_freq, self._mov_amp
+        else:
+            self._ref_freq = (1 - weight) * self._ref_freq * self._ramp(-self._shift) + weight * self._mov_freq
+            self._ref[:] = _fft.irfft2(self._ref_freq, s=self._ref.shape, workers=self._workers)
+            self._ref_amp = float(np.sum(self._ref ** 2))
+        self._mov_freq = None
+
+    def shifted_reference(self, shift: np.ndarray) -> np.ndarray:
+        """
+        Translate the reference by a (sub-pixel) shift, using its cached spectrum.
+
+        Parameters
+        ----------
+        shift: ndarray
+            The (y, x) shift to apply.
+
+        Returns
+        -------
+        ndarray
+            The shifted reference, cropped to the original image shape.
+        """
+        shifted = _fft.irfft2(self._ref_freq * self._ramp(shift), s=self._ref.shape, workers=self._workers)
+        return shifted[self._pad:self._pad + self._shape[0], self._pad:self._pad + self._shape[1]]
+
+    def _ramp(self, shift: np.ndarray) -> np.ndarray:
+        rows, cols = self._ref.shape
+        ky = np.fft.fftfreq(rows)[:, None]
+        kx = np.fft.rfftfreq(cols)[None, :]
+        return np.exp(-2j * np.pi * (ky * shift[0] + kx * shift[1]))
+
+    @staticmethod
+    def _peak_ratio(correlation: np.ndarray, peak: _tuple[int, int], radius: int = 2) -> float:
+        rows = np.arange(peak[0] - radius, peak[0] + radius + 1) % correlation.shape[0]
+        cols = np.arange(peak[1] - radius, peak[1] + radius + 1) % correlation.shape[1]
+        window = np.ix_(rows, cols)
+        saved = correlation[window].copy()
+        correlation[window] = -np.inf
+        secondary = float(np.max(correlation))
+        correlation[window] = saved
+        return float(saved[radius, radius]) / max(secondary, np.finfo(np.float64).eps)
+
+    def _resize(self, shape: _tuple[int, int]):
+        if shape == self._shape:
+            return
+        self._shape = shape
+        padded = tuple(next_fast_len(s + 2 * self._pad, real=True) for s in shape)
+        self._ref = np.empty(padded, dtype=np.float64)
+        self._mov = np.empty(padded, dtype=np.float64)
+        self._ref_freq = self._mov_freq = None
+
+    def _load(self, buffer: np.ndarray, image: np.ndarray) -> _tuple[np.ndarray, float]:
+        buffer.fill(np.mean(image))
+        buffer[self._pad:self._pad + self._shape[0], self._pad:self._pad + self._shape[1]] = image
+        return _fft.rfft2(buffer, workers=self._workers), float(np.sum(buffer ** 2))
+
+    def _refine(self, product: np.ndarray, peak: np.ndarray) -> _tuple[np.ndarray, float]:
+        rows, cols = self._ref.shape
+        size = int(np.ceil(1.5 * self._upsample))
+        offsets = (np.arange(size) - size // 2) / self._upsample
+        ky = np.fft.fftfreq(rows) * rows
+        kx = np.arange(product.shape[1])
+        weights = np.full(product.shape[1], 2.0)
+        weights[0] = 1.0
+        if cols % 2 == 0:
+            weights[-1] = 1.0
+        row_kernel = np.exp(2j * np.pi * np.outer(peak[0] + offsets, ky) / rows)
+        col_kernel = np.exp(2j * np.pi * np.outer(kx, peak[1] + offsets) / cols)
+        local = np.real(row_kernel @ (product * weights) @ col_kernel)
+        best = np.unravel_index(np.argmax(local), local.shape)
+        return peak + offsets[list(best)], float(local[best]) / (rows * cols)
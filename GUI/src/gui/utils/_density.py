@@ -0,0 +1,241 @@
+import os
+from concurrent import futures
+from typing import Dict as _dict, Optional as _None
+
+import cv2
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import DBSCAN
+
+__all__ = ["density_labels"]
+
+_POOL: _None[futures.ThreadPoolExecutor] = None
+
+
+def _pool() -> futures.ThreadPoolExecutor:
+    """
+    Lazily create the thread pool shared by every clustering run.
+
+    Threads are used rather than processes, as the neighbour queries in DBSCAN release the GIL, and a spawned process
+    would have to import the whole GUI package just to cluster one tile.
+
+    Returns
+    -------
+    ThreadPoolExecutor
+        The shared thread pool.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = futures.ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="density")
+    return _POOL
+
+
+def _distance(dy: np.ndarray, dx: np.ndarray, metric: str, metric_params: _dict[str, float]) -> np.ndarray:
+    """
+    Evaluate a DBSCAN distance metric on integer pixel offsets.
+
+    Parameters
+    ----------
+    dy: ndarray
+        The vertical offsets.
+    dx: ndarray
+        The horizontal offsets.
+    metric: str
+        The name of the metric (as understood by DBSCAN).
+    metric_params: dict[str, float]
+        Additional parameters of the metric (the p-factor for Minkowski distance).
+
+    Returns
+    -------
+    ndarray
+        The distance of each offset from the origin.
+
+    Raises
+    ------
+    ValueError
+        If the metric is unknown.
+    """
+    dy, dx = np.abs(dy).astype(np.float64), np.abs(dx).astype(np.float64)
+    if metric in ("manhattan", "cityblock", "l1"):
+        return dy + dx
+    elif metric in ("euclidean", "l2"):
+        return np.sqrt(dy ** 2 + dx ** 2)
+    elif metric == "sqeuclidean":
+        return dy ** 2 + dx ** 2
+    elif metric == "chebyshev":
+        return np.maximum(dy, dx)
+    elif metric == "minkowski":
+        p = metric_params.get("p", 2)
+        return (dy ** p + dx ** p) ** (1 / p)
+    raise ValueError(f"Unknown metric {metric!r}")
+
+
+def _stencil(eps: float, metric: str, metric_params: _dict[str, float]) -> np.ndarray:
+    """
+    Find the neighbourhood of a pixel under the metric, as a boolean footprint centred on the pixel.
+
+    Parameters
+    ----------
+    eps: float
+        The maximum distance between neighbours.
+    metric: str
+        The name of the metric (as understood by DBSCAN).
+    metric_params: dict[str, float]
+        Additional parameters of the metric.
+
+    Returns
+    -------
+    ndarray
+        A square boolean array of odd side length, where true marks a neighbour (including the centre).
+    """
+    radius = 0
+    while _distance(np.array(radius + 1), np.array(0), metric, metric_params) <= eps:
+        radius += 1
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    return _distance(dy, dx, metric, metric_params) <= eps
+
+
+def _tile_components(points: np.ndarray, eps: float, metric: str, metric_params: _dict[str, float]) -> np.ndarray:
+    """
+    Connect the core points of a single tile.
+
+    Parameters
+    ----------
+    points: ndarray
+        The (y, x) co-ordinates of the core points in the tile (including its halo).
+    eps: float
+        The maximum distance between neighbours.
+    metric: str
+        The name of the metric.
+    metric_params: dict[str, float]
+        Additional parameters of the metric.
+
+    Returns
+    -------
+    ndarray
+        A local component label for every point.
+    """
+    return DBSCAN(eps, min_samples=1, metric=metric, metric_params=metric_params or None).fit_predict(points)
+
+
+def _first_order(labels: np.ndarray) -> np.ndarray:
+    """
+    Renumber labels (listed in row-major pixel order) by the order in which each label first appears.
+
+    This is the order DBSCAN creates clusters in when fed the points from `np.nonzero`.
+
+    Parameters
+    ----------
+    labels: ndarray
+        The labels of each point, in row-major order.
+
+    Returns
+    -------
+    ndarray
+        The renumbered labels, starting from 1.
+    """
+    uniques, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(uniques), dtype=np.int_)
+    rank[np.argsort(first)] = np.arange(1, len(uniques) + 1)
+    return rank[inverse]
+
+
+def density_labels(mask: np.ndarray, eps: float, min_samples: int, metric: str,
+                   metric_params: _dict[str, float] = None, *, tile: int = 512, parallel=True) -> np.ndarray:
+    """
+    Perform DBSCAN over the foreground pixels of a binary mask.
+
+    The result is identical to running `DBSCAN(eps, min_samples=min_samples, metric=metric)` over the co-ordinates
+    given by `np.nonzero(mask)` (labels offset by one, so that 0 is noise or background), but does not build a
+    neighbour graph of the whole image:
+
+    * Core pixels are found by counting neighbours with a convolution by the metric's neighbourhood.
+    * When the neighbourhood fits in a 3x3 window and every pixel is a core pixel (min_samples=1), clusters are exactly
+      the 4- or 8-connected components of the mask.
+    * Otherwise, the mask is split into tiles (each with a halo of one neighbourhood radius). Core pixels in each tile
+      are connected by DBSCAN on a thread pool, and clusters sharing a pixel across a tile border are merged.
+    * Border pixels take the smallest label of the core pixels in their neighbourhood, which is the cluster DBSCAN
+      reaches them from first.
+
+    Parameters
+    ----------
+    mask: ndarray
+        The 2D binary mask, where non-zero pixels are the points to cluster.
+    eps: float
+        The maximum distance between neighbours.
+    min_samples: int
+        The number of neighbours (including itself) a pixel needs to be a core pixel.
+    metric: str
+        The name of the metric (as understood by DBSCAN).
+    metric_params: dict[str, float]
+        Additional parameters of the metric.
+    tile: int
+        The side length of each tile.
+    parallel: bool
+        Whether to spread the tiles over the shared thread pool, rather than processing them on the calling thread.
+
+    Returns
+    -------
+    ndarray
+        An image of the same shape as the mask, with the cluster label of each pixel.
+    """
+    metric_params = metric_params or {}
+    mask = mask != 0
+    labels = np.zeros(mask.shape, dtype=np.int_)
+    if not np.any(mask):
+        return labels
+    stencil = _stencil(eps, metric, metric_params)
+    radius = stencil.shape[0] // 2
+
+    if min_samples <= 1 and radius <= 1:
+        if radius == 0:
+            labels[mask] = np.arange(1, np.count_nonzero(mask) + 1)
+            return labels
+        _, components, _, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8 if stencil[0, 0]
+                                                               else 4, ltype=cv2.CV_32S)
+        labels[mask] = _first_order(components[mask])
+        return labels
+
+    counts = cv2.filter2D(mask.astype(np.float32), -1, stencil.astype(np.float32), borderType=cv2.BORDER_CONSTANT)
+    core = mask & (np.rint(counts) >= min_samples)
+    if not np.any(core):
+        return labels
+
+    height, width = mask.shape
+    tiles = []
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            t, l = max(top - radius, 0), max(left - radius, 0)
+            b, r = min(top + tile + radius, height), min(left + tile + radius, width)
+            ys, xs = np.nonzero(core[t:b, l:r])
+            if len(ys):
+                tiles.append(np.stack((ys + t, xs + l), axis=1))
+    if not parallel or len(tiles) == 1:
+        local = [_tile_components(points, eps, metric, metric_params) for points in tiles]
+    else:
+        n = len(tiles)
+        local = list(_pool().map(_tile_components, tiles, [eps] * n, [metric] * n, [metric_params] * n))
+
+    flat, glabel, offset = [], [], 0
+    for points, found in zip(tiles, local):
+        flat.append(np.ravel_multi_index((points[:, 0], points[:, 1]), mask.shape))
+        glabel.append(found + offset)
+        offset += int(found.max()) + 1
+    flat, glabel = np.concatenate(flat), np.concatenate(glabel)
+    order = np.argsort(flat, kind="stable")
+    flat, glabel = flat[order], glabel[order]
+    shared = flat[1:] == flat[:-1]
+    graph = coo_matrix((np.ones(np.count_nonzero(shared)), (glabel[:-1][shared], glabel[1:][shared])),
+                       shape=(offset, offset))
+    _, merged = connected_components(graph, directed=False)
+    first = np.concatenate(([True], ~shared))
+    flat, clusters = flat[first], merged[glabel[first]]
+    labels.flat[flat] = _first_order(clusters)
+
+    big = np.float32(2 ** 24)
+    reach = np.where(core, labels, big).astype(np.float32)
+    reach = cv2.erode(reach, stencil.astype(np.uint8), borderType=cv2.BORDER_CONSTANT, borderValue=float(big))
+    border = mask & ~core & (reach < big)
+    labels[border] = reach[border].astype(np.int_)
+    return labels
@@ -271,3 +271,24 @@ class Corrections(_Bitwise):
     FOCUS = _member()
     EMISSION = _member()
     DRIFT = _member()
+
+
+class FocusMetric(_Base):
+    """
+    Enumeration to represent the different sharpness metrics used to score focus.
+
+    Members
+    -------
+    NORM_VAR
+        The variance of the intensity, normalised by the square of its mean.
+    BRENNER
+        The mean squared difference between pixels two columns apart.
+    TENENGRAD
+        The mean squared magnitude of the Sobel gradient.
+    FFT
+        The fraction of the spectral energy in the upper half of the spatial frequencies.
+    """
+    NORM_VAR = _member()
+    BRENNER = _member()
+    TENENGRAD = _member()
+    FFT = _member()
@@ -0,0 +1,264 @@
+import abc
+import math
+from typing import Callable as _callable, Dict as _dict, Tuple as _tuple
+
+__all__ = ["ScoreCache", "FocusSearch", "GoldenSearch", "BrentSearch"]
+
+_GOLDEN = (1 + math.sqrt(5)) / 2
+_CGOLD = 2 - _GOLDEN
+
+
+class ScoreCache:
+    """
+    Memoised focus score, keyed by the (integer) lens value.
+
+    Every probe of the focus curve costs a scan, so each lens value is only ever measured once.
+
+    Attributes
+    ----------
+    _measure: Callable[[int], float]
+        The function that sets the lens value, scans, and scores the image.
+    _scores: dict[int, float]
+        The score of each measured lens value.
+
+    Parameters
+    ----------
+    measure: Callable[[int], float]
+        The function that sets the lens value, scans, and scores the image.
+    """
+
+    @property
+    def scores(self) -> _dict[int, float]:
+        """
+        Public access to the measured scores.
+
+        Returns
+        -------
+        dict[int, float]
+            A copy of the score of each measured lens value, in measurement order.
+        """
+        return self._scores.copy()
+
+    def __init__(self, measure: _callable[[int], float]):
+        self._measure = measure
+        self._scores: _dict[int, float] = {}
+
+    def __call__(self, value: float) -> float:
+        value = int(round(value))
+        if value not in self._scores:
+            self._scores[value] = self._measure(value)
+        return self._scores[value]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, value: int) -> bool:
+        return value in self._scores
+
+    def seed(self, value: int, score: float):
+        """
+        Record a score that was measured outside the cache.
+
+        Parameters
+        ----------
+        value: int
+            The lens value.
+        score: float
+            The measured score.
+        """
+        self._scores[int(value)] = score
+
+    def best(self, lower: float = -math.inf, upper: float = math.inf) -> _tuple[int, float]:
+        """
+        Find the best measured lens value.
+
+        Parameters
+        ----------
+        lower: float
+            The lowest lens value to consider.
+        upper: float
+            The highest lens value to consider.
+
+        Returns
+        -------
+        tuple[int, float]
+            The lens value with the highest score, and its score.
+
+        Raises
+        ------
+        ValueError
+            If no lens value in the range has been measured.
+        """
+        return max(((v, s) for v, s in self._scores.items() if lower <= v <= upper), key=lambda p: p[1])
+
+
+class FocusSearch(abc.ABC):
+    """
+    Abstract search for the lens value that maximises a unimodal focus score.
+
+    The search first brackets the maximum by stepping outwards from a starting point (so a warm start near focus only
+    costs a few probes), then narrows the bracket until it is no wider than the tolerance.
+
+    Abstract Methods
+    ----------------
+    _narrow
+
+    Attributes
+    ----------
+    _tolerance: int
+        The bracket width at which the search stops.
+    _max_probes: int
+        The maximum number of lens values to measure.
+
+    Parameters
+    ----------
+    tolerance: int
+        The bracket width at which the search stops. This should be the fine step of the lens.
+    max_probes: int
+        The maximum number of lens values to measure.
+    """
+
+    def __init__(self, tolerance: int, max_probes: int = 30):
+        self._tolerance = max(int(tolerance), 1)
+        self._max_probes = max_probes
+
+    def search(self, score: ScoreCache, start: int, step: int, lower: int, upper: int) -> _tuple[int, float]:
+        """
+        Search for the best lens value.
+
+        Parameters
+        ----------
+        score: ScoreCache
+            The memoised focus score.
+        start: int
+            The lens value to start from.
+        step: int
+            The initial distance of the bracketing probes from the start.
+        lower: int
+            The lowest allowed lens value.
+        upper: int
+            The highest allowed lens value.
+
+        Returns
+        -------
+        tuple[int, float]
+            The best measured lens value, and its score.
+        """
+        a, b = self._bracket(score, min(max(start, lower), upper), max(step, self._tolerance), lower, upper)
+        if b - a > self._tolerance:
+            self._narrow(score, a, b)
+        return score.best()
+
+    def _bracket(self, score: ScoreCache, start: int, step: int, lower: int, upper: int) -> _tuple[int, int]:
+        left, right = max(start - step, lower), min(start + step, upper)
+        f_start, f_left, f_right = score(start), score(left), score(right)
+        if f_start >= f_left and f_start >= f_right:
+            return left, right
+        direction, previous, current = (1, start, right) if f_right > f_left else (-1, start, left)
+        while len(score) < self._max_probes:
+            step = int(round(step * _GOLDEN))
+            following = min(max(current + direction * step, lower), upper)
+            if following == current:
+                break
+            if score(following) <= score(current):
+                return min(previous, following), max(previous, following)
+            previous, current = current, following
+        return min(previous, current), max(previous, current)
+
+    @abc.abstractmethod
+    def _narrow(self, score: ScoreCache, a: float, b: float):
+        """
+        Narrow a bracket around the maximum until it is no wider than the tolerance.
+
+        Parameters
+        ----------
+        score: ScoreCache
+            The memoised focus score.
+        a: float
+            The lower edge of the bracket.
+        b: float
+            The upper edge of the bracket.
+        """
+        pass
+
+
+class GoldenSearch(FocusSearch):
+    """
+    Concrete focus search that narrows the bracket by golden-section search.
+    """
+
+    def _narrow(self, score: ScoreCache, a: float, b: float):
+        while b - a > self._tolerance and len(score) < self._max_probes:
+            c, d = b - (b - a) / _GOLDEN, a + (b - a) / _GOLDEN
+            if round(c) == round(d):
+                break
+            if score(c) >= score(d):
+                b = d
+            else:
+                a = c
+
+
+class BrentSearch(FocusSearch):
+    """
+    Concrete focus search that narrows the bracket by Brent's method.
+
+    This uses parabolic interpolation through the three best points when it is well-behaved, and falls back to a golden
+    section step otherwise. It starts from the best point already measured in the bracket.
+    """
+
+    def _narrow(self, score: ScoreCache, a: float, b: float):
+        def _cost(value: float) -> float:
+            return -score(value)
+
+        tol1 = max(self._tolerance / 4, 1.0)
+        tol2 = 2 * tol1
+        try:
+            x, fx = score.best(a, b)
+            fx = -fx
+        except ValueError:
+            x = a + _CGOLD * (b - a)
+            fx = _cost(x)
+        w = v = x
+        fw = fv = fx
+        d = e = 0.0
+        while len(score) < self._max_probes:
+            m = (a + b) / 2
+            if abs(x - m) <= tol2 - (b - a) / 2:
+                break
+            parabolic = False
+            if abs(e) > tol1:
+                r = (x - w) * (fx - fv)
+                q = (x - v) * (fx - fw)
+                p = (x - v) * q - (x - w) * r
+                q = 2 * (q - r)
+                if q > 0:
+                    p = -p
+                q = abs(q)
+                e_prev, e = e, d
+                if abs(p) < abs(q * e_prev / 2) and q * (a - x) < p < q * (b - x):
+                    d = p / q
+                    if (x + d) - a < tol2 or b - (x + d) < tol2:
+                        d = math.copysign(tol1, m - x)
+                    parabolic = True
+            if not parabolic:
+                e = (a - x) if x >= m else (b - x)
+                d = _CGOLD * e
+            u = x + (d if abs(d) >= tol1 else math.copysign(tol1, d))
+            fu = _cost(u)
+            if fu <= fx:
+                if u >= x:
+                    a = x
+                else:
+                    b = x
+                v, w, x = w, x, u
+                fv, fw, fx = fw, fx, fu
+            else:
+                if u < x:
+                    a = u
+                else:
+                    b = u
+                if fu <= fw or w == x:
+                    v, w = w, u
+                    fv, fw = fw, fu
+                elif fu <= fv or v == x or v == w:
+                    v, fv = u, fu
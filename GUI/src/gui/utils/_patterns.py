@@ -34,6 +34,32 @@ def _line(xy1: _tuple[int, int], xy2: _tuple[int, int], endpoint=False) -> _tupl
     return second, first
 
 
+def _expand(starts: np.ndarray, ends: np.ndarray, inclusive: np.ndarray) -> npt.NDArray[np.int32]:
+    starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+    diff = np.asarray(ends, dtype=np.int64).reshape(-1, 2) - starts
+    major = np.abs(diff).max(axis=1)
+    lengths = major + np.asarray(inclusive, dtype=np.int64)
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    t = np.arange(owner.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    scale = np.maximum(major, 1)[owner, None]
+    co_ords = (starts[owner] * scale + scale // 2 + t[:, None] * diff[owner]) // scale
+    return np.ascontiguousarray(co_ords, dtype=np.int32)
+
+
+def _runs(co_ords: np.ndarray) -> npt.NDArray[np.int32]:
+    if not len(co_ords):
+        return np.empty((0, 4), dtype=np.int32)
+    steps = np.diff(co_ords, axis=0)
+    unit = np.abs(steps).max(axis=1) == 1
+    same = np.ones(len(steps), dtype=np.bool_)
+    same[1:] = np.all(steps[1:] == steps[:-1], axis=1) | ~unit[:-1]
+    breaks = np.ones(len(co_ords), dtype=np.bool_)
+    breaks[1:] = ~unit | ~same
+    firsts = np.flatnonzero(breaks)
+    lasts = np.r_[firsts[1:] - 1, len(co_ords) - 1]
+    return np.ascontiguousarray(np.c_[co_ords[firsts], co_ords[lasts]], dtype=np.int32)
+
+
 class Pattern(abc.ABC):
     """
     Abstract base class for a lazy object representing a certain drawn pattern.
@@ -185,6 +211,7 @@ class Design(abc.ABC, typing.Generic[P]):
     ----------------
     draw
     encode
+    compile
 
     Generics
     --------
@@ -247,6 +274,36 @@ class Design(abc.ABC, typing.Generic[P]):
         """
         pass
 
+    @abc.abstractmethod
+    def compile(self) -> npt.NDArray[np.int32]:
+        """
+        Convert the pattern to the full array of co-ordinates, in scan order.
+
+        This is equivalent to decoding every encoded pattern and stacking the results, but is done in one vectorised
+        pass.
+
+        Returns
+        -------
+        ndarray[int32, (n, 2)]
+            The contiguous co-ordinate array. Each co-ordinate is in the form (x, y).
+        """
+        pass
+
+    def runs(self) -> npt.NDArray[np.int32]:
+        """
+        Convert the pattern to a run-length list of lines, in scan order.
+
+        Consecutive co-ordinates that move by the same single-pixel step are merged into one line. Every pixel of a
+        line is scanned, so the lines can be streamed to a scan engine in place of the full co-ordinate array.
+
+        Returns
+        -------
+        ndarray[int32, (m, 4)]
+            The contiguous line array. Each line is in the form (start x, start y, end x, end y), with both ends
+            included.
+        """
+        return _runs(self.compile())
+
 
 class Continuous(Design[Stroke], abc.ABC):
     """
@@ -286,6 +343,12 @@ class Continuous(Design[Stroke], abc.ABC):
             return self._start
         return super().__getitem__(item)
 
+    def compile(self) -> npt.NDArray[np.int32]:
+        strokes = self.encode()
+        starts = np.array([stroke._start for stroke in strokes], dtype=np.int64)
+        ends = np.array([stroke._end for stroke in strokes], dtype=np.int64)
+        return _expand(starts, ends, np.array([stroke._inclusive for stroke in strokes], dtype=np.bool_))
+
     def _setup(self) -> _tuple[_tuple[int, int, int], _tuple[int, int, int]]:
         if self._start.x() == XAxis.LEFT:
             x_info = 0, int(self._cov[0] * self._size[0]) - 1, 1
@@ -302,11 +365,32 @@ class Discrete(Design[Point], abc.ABC):
     """
     Abstract base class to represent static-based designs.
 
+    Abstract Methods
+    ----------------
+    _co_ords
+
     Bound Generics
     --------------
     P: Point
     """
-    pass
+
+    def encode(self) -> _list[Point]:
+        return list(map(Point, self._co_ords().tolist()))
+
+    def compile(self) -> npt.NDArray[np.int32]:
+        return np.ascontiguousarray(self._co_ords(), dtype=np.int32)
+
+    @abc.abstractmethod
+    def _co_ords(self) -> npt.NDArray[np.int_]:
+        """
+        Generate the co-ordinates of every point in the design, in scan order.
+
+        Returns
+        -------
+        ndarray[int, (n, 2)]
+            The co-ordinate array. Each co-ordinate is in the form (x, y).
+        """
+        pass
 
 
 class Raster(Continuous):
@@ -624,8 +708,7 @@ class Grid(Discrete):
         binary[ys, xs] = 255
         return binary
 
-    def encode(self) -> _list[Point]:
-        pattern = []
+    def _co_ords(self) -> npt.NDArray[np.int_]:
         size = rows, cols = tuple(map(int, map(operator.mul, self._size, self._cov)))
         ys, xs = np.meshgrid(np.arange(self._shift[1], min(size[1] + self._shift[1], self._size[1]), self._gap[1]),
                              np.arange(self._shift[0], min(size[0] + self._shift[0], self._size[0]), self._gap[0]))
@@ -644,9 +727,8 @@ class Grid(Discrete):
         else:
             invert_y = invert_x = True
         y_indices, x_indices = np.unravel_index(np.argsort(co_ords, axis=None), co_ords.shape)
-        pattern.extend(map(Point, zip(xs[y_indices[::(-1 if invert_y else 1)], x_indices[::(-1 if invert_x else 1)]],
-                                      ys[y_indices[::(-1 if invert_y else 1)], x_indices[::(-1 if invert_x else 1)]])))
-        return pattern
+        y_indices, x_indices = y_indices[::(-1 if invert_y else 1)], x_indices[::(-1 if invert_x else 1)]
+        return np.c_[xs[y_indices, x_indices], ys[y_indices, x_indices]]
 
 
 class Random(Discrete):
@@ -709,16 +791,13 @@ class Random(Discrete):
         binary[ys, xs] = 255
         return binary
 
-    def encode(self) -> _list[Point]:
-        pattern = []
-        seen = set()
+    def _co_ords(self) -> npt.NDArray[np.int_]:
         if not self._points:
             self._gen_points()
-        for y, x in zip(*self._points):
-            if (x, y) not in seen:
-                seen.add((x, y))
-                pattern.append(Point((x, y)))
-        return pattern
+        ys, xs = self._points
+        co_ords = np.c_[xs, ys]
+        _, first = np.unique(co_ords, axis=0, return_index=True)
+        return co_ords[np.sort(first)]
 
     def _gen_points(self):
         size = tuple(map(int, map(operator.mul, self._size, self._cov)))
@@ -0,0 +1,141 @@
+from typing import Optional as _None, Tuple as _tuple
+
+import numpy as np
+
+__all__ = ["DriftPredictor"]
+
+
+class DriftPredictor:
+    """
+    Constant-velocity Kalman filter over the accumulated drift, used to predict the drift between measurements.
+
+    Both axes share the same motion model and noise, so they share a covariance matrix. Positions are the sum of each
+    measured step of drift, and velocities are in pixels per second.
+
+    Attributes
+    ----------
+    _q: float
+        The process noise (the variance of the unmodelled acceleration, in square pixels per second cubed).
+    _r: float
+        The measurement noise (in square pixels).
+    _state: ndarray
+        The (y, x) position and velocity, as a 2x2 array of axis by (position, velocity).
+    _cov: ndarray
+        The shared 2x2 covariance of the position and velocity.
+    _time: float | None
+        The time of the last measurement.
+    _error: float
+        The distance between the last measurement and its prediction.
+    _count: int
+        The number of measurements.
+
+    Parameters
+    ----------
+    process_noise: float
+        The variance of the unmodelled acceleration.
+    measurement_noise: float
+        The variance of each measurement.
+    """
+
+    @property
+    def error(self) -> float:
+        """
+        Public access to the prediction error.
+
+        Returns
+        -------
+        float
+            The distance (in pixels) between the last measurement and the prediction made for it.
+        """
+        return self._error
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """
+        Public access to the estimated velocity.
+
+        Returns
+        -------
+        ndarray
+            The (y, x) drift velocity in pixels per second.
+        """
+        return self._state[:, 1].copy()
+
+    def __init__(self, process_noise: float = 1e-4, measurement_noise: float = 0.25):
+        self._q = process_noise
+        self._r = measurement_noise
+        self._state = np.zeros((2, 2), dtype=np.float64)
+        self._cov = np.eye(2) * 1e3
+        self._time: _None[float] = None
+        self._error = np.inf
+        self._count = 0
+
+    def reset(self):
+        """
+        Forget all measurements.
+        """
+        self.__init__(self._q, self._r)
+
+    def update(self, step: np.ndarray, at: float):
+        """
+        Add a measured step of drift.
+
+        Parameters
+        ----------
+        step: ndarray
+            The (y, x) drift measured since the previous measurement.
+        at: float
+            The (monotonic) time of the measurement, in seconds.
+        """
+        if self._time is None:
+            self._state[:, 0] = step
+            self._cov = np.diag([self._r, 1e3])
+            self._time, self._count = at, 1
+            return
+        measured = self._state[:, 0] + step
+        state, cov = self._advance(at - self._time)
+        self._error = float(np.hypot(*(measured - state[:, 0])))
+        gain = cov[:, 0] / (cov[0, 0] + self._r)
+        self._state = state + np.outer(measured - state[:, 0], gain)
+        self._cov = cov - np.outer(gain, cov[0, :])
+        self._time = at
+        self._count += 1
+
+    def offset(self, at: float) -> np.ndarray:
+        """
+        Predict the drift accumulated since the last measurement.
+
+        Parameters
+        ----------
+        at: float
+            The (monotonic) time to predict for, in seconds.
+
+        Returns
+        -------
+        ndarray
+            The (y, x) drift expected since the last measurement. This is zero until there are two measurements.
+        """
+        if self._count < 2:
+            return np.zeros(2)
+        return self._state[:, 1] * (at - self._time)
+
+    def reliable(self, tolerance: float) -> bool:
+        """
+        Decide whether predictions can stand in for measurements.
+
+        Parameters
+        ----------
+        tolerance: float
+            The largest acceptable prediction error, in pixels.
+
+        Returns
+        -------
+        bool
+            Whether there have been enough measurements, and the last one was within tolerance of its prediction.
+        """
+        return self._count >= 3 and self._error <= tolerance
+
+    def _advance(self, dt: float) -> _tuple[np.ndarray, np.ndarray]:
+        transition = np.array([[1.0, dt], [0.0, 1.0]])
+        noise = self._q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        return self._state @ transition.T, transition @ self._cov @ transition.T + noise
@@ -0,0 +1,330 @@
+import itertools
+import queue
+import threading
+import time
+import typing
+from typing import Any as _any, Callable as _callable, Dict as _dict, Optional as _None, Tuple as _tuple
+
+import h5py
+import numpy as np
+
+__all__ = ["SessionStore", "SessionWriter"]
+
+_SCRATCH = itertools.count()
+
+
+class SessionStore:
+    """
+    Single-file HDF5 store for a grid search session.
+
+    The file is kept open while the session runs. Checkpoint images are written once, each captured square is appended
+    to one chunked and compressed dataset that grows along its first axis, and the co-ordinates of every region are
+    appended to a structured table. Regions that record their own data (such as merlin scans) only add a table row.
+
+    A store is not thread-safe, so once a `SessionWriter` owns it, it should only be used through the writer.
+
+    File Layout
+    -----------
+    Checkpoints/<name>: the checkpoint images (such as the survey scan).
+    Captured Squares: ndarray[(n, h, w)], every captured square in scan order.
+    Regions: the structured table of regions, with one row per region.
+    Metadata/<index>: the microscope parameters exported for each region.
+
+    Attributes
+    ----------
+    CHUNK_ROWS: int
+        The maximum number of table rows per chunk.
+    ROW: dtype
+        The structured type of each row in the region table. The time is the UNIX timestamp at which the region was
+        recorded, and the frame is the index into the captured squares (-1 if the region has no captured square).
+    _path: str
+        The filepath of the session file.
+    _compression: str
+        The compression filter used for every dataset.
+    _level: int
+        The compression level.
+    _file: File | None
+        The open session file.
+
+    Parameters
+    ----------
+    path: str
+        The filepath of the session file. An existing file is appended to.
+    compression: str
+        The compression filter used for every dataset.
+    level: int
+        The compression level.
+    """
+    CHUNK_ROWS = 256
+    ROW = np.dtype([("index", np.int32), ("frame", np.int32), ("top left", np.int32, (2,)),
+                    ("bottom right", np.int32, (2,)), ("scan top left", np.int32, (2,)), ("time", np.float64),
+                    ("name", h5py.string_dtype(length=64))])
+
+    @property
+    def path(self) -> str:
+        """
+        Public access to the filepath of the session file.
+
+        Returns
+        -------
+        str
+            The filepath.
+        """
+        return self._path
+
+    def __init__(self, path: str, compression="gzip", level=4):
+        self._path = path
+        self._compression = compression
+        self._level = level
+        self._file: _None[h5py.File] = None
+
+    def __enter__(self) -> "SessionStore":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: typing.Type[Exception], exc_val: Exception, exc_tb):
+        self.close()
+
+    def open(self):
+        """
+        Open the session file, if it is not already open.
+        """
+        if self._file is None:
+            self._file = h5py.File(self._path, "a")
+
+    def flush(self):
+        """
+        Flush all pending writes to disk.
+        """
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """
+        Flush and close the session file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def scratch() -> h5py.File:
+        """
+        Create an in-memory hdf5 file, used to gather metadata without touching the disk.
+
+        Returns
+        -------
+        File
+            The in-memory file. It is never written to disk, and is closed once it is passed to `append`.
+        """
+        return h5py.File(f"scratch-{next(_SCRATCH)}.hdf", "w", driver="core", backing_store=False)
+
+    def write(self, name: str, data: np.ndarray, attrs: _dict[str, _any] = None):
+        """
+        Write a compressed dataset, replacing any existing dataset with the same name.
+
+        Parameters
+        ----------
+        name: str
+            The full path of the dataset.
+        data: ndarray
+            The data to write.
+        attrs: dict[str, Any] | None
+            The attributes of the dataset.
+        """
+        if name in self._file:
+            del self._file[name]
+        dataset = self._file.create_dataset(name, data=data, chunks=True, shuffle=True, compression=self._compression,
+                                            compression_opts=self._level)
+        dataset.attrs.update(attrs or {})
+
+    def checkpoint(self, name: str, data: np.ndarray):
+        """
+        Store a checkpoint image, if it has not already been stored.
+
+        Parameters
+        ----------
+        name: str
+            The name of the checkpoint.
+        data: ndarray
+            The image data.
+        """
+        if f"Checkpoints/{name}" not in self._file:
+            self.write(f"Checkpoints/{name}", data)
+
+    def append(self, index: int, top_left: _tuple[int, int], bottom_right: _tuple[int, int],
+               scan_top_left: _tuple[int, int], image: np.ndarray = None, name="", metadata: h5py.File = None):
+        """
+        Record a scanned region.
+
+        Parameters
+        ----------
+        index: int
+            The index of the region in the session.
+        top_left: tuple[int, int]
+            The top-left corner of the region, in survey co-ordinates.
+        bottom_right: tuple[int, int]
+            The bottom-right corner of the region, in survey co-ordinates.
+        scan_top_left: tuple[int, int]
+            The top-left corner of the scan area, in scan co-ordinates.
+        image: ndarray | None
+            The captured square. If None, only the co-ordinates are recorded.
+        name: str
+            An identifier of externally recorded data (such as the merlin filename).
+        metadata: File | None
+            A scratch file of metadata for the region, which is copied into the store and closed.
+
+        Raises
+        ------
+        ValueError
+            If the image has a different shape or type to the previously captured squares.
+        """
+        frame = -1 if image is None else self._add_frame(image)
+        table = self._table()
+        row = np.array([(index, frame, top_left, bottom_right, scan_top_left, time.time(), name)], dtype=self.ROW)
+        table.resize(table.shape[0] + 1, axis=0)
+        table[-1:] = row
+        if metadata is not None:
+            try:
+                group = self._file.require_group("Metadata").require_group(str(index))
+                for key in metadata:
+                    metadata.copy(metadata[key], group)
+            finally:
+                metadata.close()
+
+    def _add_frame(self, image: np.ndarray) -> int:
+        if "Captured Squares" not in self._file:
+            self._file.create_dataset("Captured Squares", shape=(0, *image.shape), dtype=image.dtype,
+                                      maxshape=(None, *image.shape), chunks=(1, *image.shape), shuffle=True,
+                                      compression=self._compression, compression_opts=self._level)
+        squares = self._file["Captured Squares"]
+        if squares.shape[1:] != image.shape or squares.dtype != image.dtype:
+            raise ValueError(f"Expected a {squares.shape[1:]} {squares.dtype} square, got {image.shape} {image.dtype}")
+        frame = squares.shape[0]
+        squares.resize(frame + 1, axis=0)
+        squares[frame] = image
+        return frame
+
+    def _table(self) -> h5py.Dataset:
+        if "Regions" not in self._file:
+            self._file.create_dataset("Regions", shape=(0,), dtype=self.ROW, maxshape=(None,),
+                                      chunks=(self.CHUNK_ROWS,), compression=self._compression,
+                                      compression_opts=self._level)
+        return self._file["Regions"]
+
+
+class SessionWriter:
+    """
+    Dedicated I/O thread that performs the writes to a session store, so that the scan loop never waits on the disk.
+
+    Jobs are queued in order on a bounded queue. When the queue is full, submitting blocks until the thread catches up,
+    which bounds the memory held by pending images. A failed job does not stop the writer; the error is passed to the
+    error handler (from the writer thread) and the remaining jobs still run.
+
+    Attributes
+    ----------
+    _store: SessionStore
+        The store to write to. This is only accessed from the writer thread.
+    _on_error: Callable[[Exception], None]
+        The error handler.
+    _queue: Queue
+        The bounded queue of pending jobs. A None job stops the thread.
+    _thread: Thread
+        The writer thread.
+
+    Parameters
+    ----------
+    store: SessionStore
+        The store to write to. It is opened on the writer thread.
+    on_error: Callable[[Exception], None]
+        The error handler. This is called from the writer thread, so it should be thread-safe (such as a signal emit).
+    capacity: int
+        The maximum number of pending jobs.
+    """
+
+    @property
+    def store(self) -> SessionStore:
+        """
+        Public access to the store being written to.
+
+        Returns
+        -------
+        SessionStore
+            The store. Note it should not be used directly while the writer is running.
+        """
+        return self._store
+
+    def __init__(self, store: SessionStore, on_error: _callable[[Exception], None], capacity=8):
+        self._store = store
+        self._on_error = on_error
+        self._queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self._thread = threading.Thread(target=self._work, name="session-writer", daemon=True)
+        self._thread.start()
+        self.submit(store.open)
+
+    def submit(self, job: _callable[..., None], *args, **kwargs):
+        """
+        Queue a job, blocking while the queue is full.
+
+        Parameters
+        ----------
+        job: Callable[..., None]
+            The job to run on the writer thread.
+        *args: Any
+            The positional arguments of the job.
+        **kwargs: Any
+            The keyword arguments of the job.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer has been closed.
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("Cannot submit to a closed session writer")
+        self._queue.put((job, args, kwargs))
+
+    def write(self, name: str, data: np.ndarray, attrs: _dict[str, _any] = None):
+        """
+        Queue a dataset write.
+
+        Parameters
+        ----------
+        name: str
+            The full path of the dataset.
+        data: ndarray
+            The data to write. This must not be modified after it is queued.
+        attrs: dict[str, Any] | None
+            The attributes of the dataset.
+        """
+        self.submit(self._store.write, name, data, attrs)
+
+    def flush(self):
+        """
+        Block until every queued job has run, then flush the store to disk.
+        """
+        self.submit(self._store.flush)
+        self._queue.join()
+
+    def close(self):
+        """
+        Run every queued job, close the store, and stop the writer thread.
+        """
+        if self._thread.is_alive():
+            self.submit(self._store.close)
+            self._queue.put(None)
+            self._thread.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                job, args, kwargs = item
+                try:
+                    job(*args, **kwargs)
+                except Exception as err:
+                    self._on_error(err)
+            finally:
+                self._queue.task_done()
@@ -1,4 +1,5 @@
 import abc
+import sys
 from typing import Tuple as _tuple, Set as _set
 
 import cv2
@@ -9,13 +10,51 @@ from ._utils import OnImg
 from ._enums import *
 
 
+def _references(data: np.ndarray) -> _tuple[int, int]:
+    """
+    Count the references to an array, and to the array that owns its memory.
+
+    Parameters
+    ----------
+    data: ndarray
+        The array.
+
+    Returns
+    -------
+    tuple[int, int]
+        The reference counts of the array and of its owner (which are the same array if it owns its memory).
+    """
+    owner = data.base if isinstance(data.base, np.ndarray) else data
+    return sys.getrefcount(data), sys.getrefcount(owner)
+
+
+class _Probe:
+    def __init__(self, data: np.ndarray):
+        self._data = data
+
+    def references(self) -> _tuple[int, int]:
+        return _references(self._data)
+
+
+# the reference counts of an array that only an image holds, for arrays that own their memory and for views
+_UNSHARED = {False: _Probe(np.empty(1)).references(), True: _Probe(np.empty(2)[1:]).references()}
+
+
 class Image(abc.ABC):
     """
     Abstract base class for all image classes. Defines an image as a 2D array of unconstrained values.
 
+    The array can have any integer type. Images with a static range are created with the narrowest unsigned type that
+    holds their range (see `_storage`), while images without one use `int_` so that edits cannot overflow.
+
     When plotting, the array can be normalised to a particular range.
-    As the array may have certain conditions (bimodality, a specific range), every attribute lookup will check the array
-    to ensure these properties have not been violated.
+    As the array may have certain conditions (bimodality, a specific range), the array is checked to ensure these
+    properties have not been violated. Writes through the public API are already verified, so the only way to violate
+    them is through another reference to the array's memory: the array handed to the constructor, the array returned by
+    `data`, the array of a `region`, or any view of these. Hence every public lookup checks the array while such a
+    reference exists (found from the reference counts of the array and its owner), and the first lookup after the last
+    one is dropped checks it once more. An array that only the image holds is not checked again. In debug mode, every
+    public attribute lookup checks the array.
 
     Abstract Methods
     ----------------
@@ -29,20 +68,26 @@ class Image(abc.ABC):
 
     Attributes
     ----------
-    _data: array[int, [r, c]]
+    debug: bool
+        Whether to check the array on every public attribute lookup (class-wide).
+    _data: array[integer, [r, c]]
         The image data.
     _min: int_ | None
         The minimum allowed value in the image.
     _max: int_ | None
         The maximum allowed value in the image.
+    _dirty: bool
+        Whether the array may have been edited externally since it was last checked. This stays set while the array's
+        memory is shared.
 
     Raises
     ------
     ValueError
         If the provided array is not 2D.
     TypeError
-        If the array has an incorrect dtype.
+        If the array is not an integer array.
     """
+    debug = False
 
     @property
     def size(self) -> _tuple[int, int]:
@@ -88,9 +133,10 @@ class Image(abc.ABC):
     def __init__(self, data: npt.NDArray[np.int_], *, static_range: _tuple[np.int_, np.int_] = None):
         if len(data.shape) != 2:
             raise ValueError("Only 2D images are supported")
-        elif data.dtype != np.int_:
-            raise TypeError(f"Expected an integer array ({np.int_}), but got {data.dtype}")
+        elif not np.issubdtype(data.dtype, np.integer):
+            raise TypeError(f"Expected an integer array, but got {data.dtype}")
         self._data = data
+        self._dirty = True
         if static_range is None:
             self._min = self._max = static_range
         else:
@@ -99,12 +145,48 @@ class Image(abc.ABC):
 
     def __getattribute__(self, item: str):
         if item == "_cheap" or not item.startswith("_"):
-            if (self._min is not None and self._max is not None) and np.any(
-                    (self._data < self._min) | (self._data > self._max)
-            ):
-                raise TypeError("Array has been edited externally! Elements are out of static bounds")
+            shared = self._shared()
+            if self._dirty or shared or Image.debug:
+                self._validate()
+                self._dirty = shared
+            if item in ("data", "region"):
+                self._dirty = True
         return super().__getattribute__(item)
 
+    def _shared(self) -> bool:
+        """
+        Check whether the array's memory may be referenced outside the image.
+
+        Returns
+        -------
+        bool
+            Whether anything other than the image references the array or its owner. Arrays whose memory is owned by
+            something other than an array (such as a buffer) are always considered shared.
+        """
+        base = self._data.base
+        if base is not None and (not isinstance(base, np.ndarray) or base.base is not None):
+            return True
+        refs, owner_refs = self._references()
+        unshared, unshared_owner = _UNSHARED[base is not None]
+        return refs > unshared or owner_refs > unshared_owner
+
+    def _references(self) -> _tuple[int, int]:
+        return _references(self._data)
+
+    def _validate(self):
+        """
+        Check the array against the conditions of the image.
+
+        Raises
+        ------
+        TypeError
+            If the array has been edited such that the conditions are violated.
+        """
+        if (self._min is not None and self._max is not None) and np.any(
+                (self._data < self._min) | (self._data > self._max)
+        ):
+            raise TypeError("Array has been edited externally! Elements are out of static bounds")
+
     def __bool__(self) -> bool:
         self._cheap()
         return bool(np.any(self._data != self.black))
@@ -405,6 +487,28 @@ class Image(abc.ABC):
         """
         pass
 
+    @staticmethod
+    def _storage(static_range: _tuple[int, int] = None) -> np.dtype:
+        """
+        Find the narrowest array type for an image.
+
+        Parameters
+        ----------
+        static_range: tuple[int, int] | None
+            The static range of the image.
+
+        Returns
+        -------
+        dtype
+            The narrowest unsigned type holding the static range, or `int_` if there is no (non-negative) range.
+        """
+        if static_range is None or static_range[0] is None or min(static_range) < 0:
+            return np.dtype(np.int_)
+        for dtype in (np.uint8, np.uint16, np.uint32):
+            if max(static_range) <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.dtype(np.int_)
+
     @staticmethod
     def _range(i: npt.ArrayLike, o_min: int, o_max: int, n_min: int, n_max: int) -> npt.ArrayLike:
         i = np.float_(i)
@@ -579,11 +683,10 @@ class BiModal(Image, abc.ABC):
                 raise ValueError(f"Static range should be the minima and maxima in bimodal images "
                                  f"(got {self._fg = }, {self._bg = }, {self._min = }, {self._max = })")
 
-    def __getattribute__(self, item: str):
-        if item == "_cheap" or not item.startswith("_"):
-            if np.any((self._data != self._fg) & (self._data != self._bg)):
-                raise TypeError(f"Array has been edited externally! Invalid colours appear")
-        return super().__getattribute__(item)
+    def _validate(self):
+        super()._validate()
+        if np.any((self._data != self._fg) & (self._data != self._bg)):
+            raise TypeError(f"Array has been edited externally! Invalid colours appear")
 
     def __or__(self, other: "BiModal") -> typing_extensions.Self:
         """
@@ -43,13 +43,13 @@ class RGBImage(RGB, MultiModal):
 
     def norm(self) -> typing_extensions.Self:
         norm = self._range(self._data, int(self.black), int(self.white), 0, 2 ** 24 - 1)
-        return RGBImage(norm, static_range=(0, 2 ** 24 - 1))
+        return RGBImage(norm.astype(np.uint32), static_range=(0, 2 ** 24 - 1))
 
     def static(self, minima: np.int_, maxima: np.int_) -> typing_extensions.Self:
-        return RGBImage(self._data.copy(), static_range=(minima, maxima))
+        return RGBImage(self._data.astype(self._storage((minima, maxima))), static_range=(minima, maxima))
 
     def dynamic(self) -> typing_extensions.Self:
-        return RGBImage(self._data.copy())
+        return RGBImage(self._data.astype(np.int_))
 
     @classmethod
     def from_file(cls, path: str, *, do_static=False) -> "RGBImage":
@@ -80,7 +80,8 @@ class RGBImage(RGB, MultiModal):
         r = arr[:, :, 2] << 16
         g = arr[:, :, 1] << 8
         b = arr[:, :, 0]
-        return cls((r | g | b).astype(np.int_), static_range=(0, 2 ** 24 - 1) if do_static else None)
+        return cls(r | g | b if do_static else (r | g | b).astype(np.int_),
+                   static_range=(0, 2 ** 24 - 1) if do_static else None)
 
     @classmethod
     def blank(cls, size: _tuple[int, int], black: np.int_ = 0, *, static_range: _tuple[int, int] = None) -> "RGBImage":
@@ -101,7 +102,7 @@ class RGBImage(RGB, MultiModal):
         RGBImage
             The blank image.
         """
-        return cls(np.ones((size[1], size[0]), dtype=np.int_) * black, static_range=static_range)
+        return cls(np.full((size[1], size[0]), black, dtype=cls._storage(static_range)), static_range=static_range)
 
 
 class GreyImage(Grey, MultiModal):
@@ -126,7 +127,8 @@ class GreyImage(Grey, MultiModal):
         Grey.__init__(self, data, static_range=static_range)
 
     def promote(self) -> RGBImage:
-        return RGBImage((self._data << 16) | (self._data << 8) | self._data,
+        data = self._data.astype(np.uint32 if self._data.dtype.kind == "u" else np.int_)
+        return RGBImage((data << 16) | (data << 8) | data,
                         static_range=self._min if self._min is None else (self._min, self._max))
 
     def downchannel(self, bg: np.int_, fg: np.int_, *, invalid: ColourConvert = None) -> "GreyBiModal":
@@ -139,14 +141,14 @@ class GreyImage(Grey, MultiModal):
         return GreyBiModal(new, bg, fg, static_range=self._min if self._min is None else (self._min, self._max))
 
     def norm(self) -> typing_extensions.Self:
-        return GreyImage(self._range(self._data, int(self.black), int(self.white), 0, 255),
+        return GreyImage(self._range(self._data, int(self.black), int(self.white), 0, 255).astype(np.uint8),
                          static_range=(0, 255))
 
     def static(self, minima: np.int_, maxima: np.int_) -> typing_extensions.Self:
-        return GreyImage(self._data.copy(), static_range=(minima, maxima))
+        return GreyImage(self._data.astype(self._storage((minima, maxima))), static_range=(minima, maxima))
 
     def dynamic(self) -> typing_extensions.Self:
-        return GreyImage(self._data.copy())
+        return GreyImage(self._data.astype(np.int_))
 
     @classmethod
     def from_file(cls, path: str, *, do_static=False) -> "GreyImage":
@@ -173,7 +175,7 @@ class GreyImage(Grey, MultiModal):
         arr = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
         if arr is None:
             raise FileNotFoundError(f"File {path!r} not found")
-        return cls(np.int_(arr), static_range=(0, 255) if do_static else None)
+        return cls(arr if do_static else np.int_(arr), static_range=(0, 255) if do_static else None)
 
     @classmethod
     def blank(cls, size: _tuple[int, int], black: np.int_ = 0, *, static_range: _tuple[int, int] = None) -> "GreyImage":
@@ -194,7 +196,7 @@ class GreyImage(Grey, MultiModal):
         GreyImage
             The blank image.
         """
-        return cls(np.ones((size[1], size[0]), dtype=np.int_) * black, static_range=static_range)
+        return cls(np.full((size[1], size[0]), black, dtype=cls._storage(static_range)), static_range=static_range)
 
 
 class RGBBiModal(RGB, BiModal):
@@ -227,13 +229,14 @@ class RGBBiModal(RGB, BiModal):
     def norm(self) -> typing_extensions.Self:
         normalised = RGBImage(self._range(self._data, int(self.black), int(self.white), 0, 2 ** 24 - 1))
         c1, c2 = normalised.get_colours()
-        return RGBBiModal(normalised.data(), c1, c2, static_range=(c1, c2))
+        return RGBBiModal(normalised.data().astype(self._storage((c1, c2))), c1, c2, static_range=(c1, c2))
 
     def static(self, minima: np.int_, maxima: np.int_) -> typing_extensions.Self:
-        return RGBBiModal(self._data.copy(), self._bg, self._fg, static_range=(minima, maxima))
+        return RGBBiModal(self._data.astype(self._storage((minima, maxima))), self._bg, self._fg,
+                          static_range=(minima, maxima))
 
     def dynamic(self) -> typing_extensions.Self:
-        return RGBBiModal(self._data.copy(), self._bg, self._fg)
+        return RGBBiModal(self._data.astype(np.int_), self._bg, self._fg)
 
     @classmethod
     def blank(cls, size: _tuple[int, int], exp_fg: np.int_, black: np.int_ = 0, *,
@@ -257,7 +260,8 @@ class RGBBiModal(RGB, BiModal):
         RGBBiModal
             The blank image.
         """
-        return cls(np.ones((size[1], size[0]), dtype=np.int_) * black, black, exp_fg, static_range=static_range)
+        return cls(np.full((size[1], size[0]), black, dtype=cls._storage(static_range)), black, exp_fg,
+                   static_range=static_range)
 
 
 class GreyBiModal(Grey, BiModal):
@@ -283,7 +287,8 @@ class GreyBiModal(Grey, BiModal):
         Grey.__init__(self, data, static_range=static_range)
 
     def promote(self) -> RGBBiModal:
-        return RGBBiModal((self._data << 16) | (self._data << 8) | self._data, self._bg, self._fg,
+        data = self._data.astype(np.uint32 if self._data.dtype.kind == "u" else np.int_)
+        return RGBBiModal((data << 16) | (data << 8) | data, self._bg, self._fg,
                           static_range=self._min if self._min is None else (self._bg, self._fg))
 
     def upchannel(self) -> GreyImage:
@@ -292,13 +297,14 @@ class GreyBiModal(Grey, BiModal):
     def norm(self) -> typing_extensions.Self:
         normalised = GreyImage(self._range(self._data, int(self.black), int(self.white), 0, 255))
         c1, c2 = normalised.get_colours()
-        return GreyBiModal(normalised.data(), c1, c2, static_range=(c1, c2))
+        return GreyBiModal(normalised.data().astype(self._storage((c1, c2))), c1, c2, static_range=(c1, c2))
 
     def static(self, minima: np.int_, maxima: np.int_) -> typing_extensions.Self:
-        return GreyBiModal(self._data.copy(), self._bg, self._fg, static_range=(minima, maxima))
+        return GreyBiModal(self._data.astype(self._storage((minima, maxima))), self._bg, self._fg,
+                           static_range=(minima, maxima))
 
     def dynamic(self) -> typing_extensions.Self:
-        return GreyBiModal(self._data.copy(), self._bg, self._fg)
+        return GreyBiModal(self._data.astype(np.int_), self._bg, self._fg)
 
     @classmethod
     def blank(cls, size: _tuple[int, int], exp_fg: np.int_, black: np.int_ = 0, *,
@@ -322,4 +328,5 @@ class GreyBiModal(Grey, BiModal):
         GreyImage
             The blank image.
         """
-        return cls(np.ones((size[1], size[0]), dtype=np.int_) * black, black, exp_fg, static_range=static_range)
+        return cls(np.full((size[1], size[0]), black, dtype=cls._storage(static_range)), black, exp_fg,
+                   static_range=static_range)
@@ -6,6 +6,9 @@ Created on Tue Oct 26 13:42:38 2021
 """
 import os
 import json
+import queue
+import threading
+import time
 import httplib2
 from functools import wraps
 
@@ -22,6 +25,7 @@ class Connect(fs.JsonFileIO):
         if not self.is_exists:
             self.write(list())
         self._config = self.read()
+        self._urls = {}
         
     def __new__(cls):
         return super().__new__(cls, PYJEM_URI_FILE)
@@ -44,12 +48,17 @@ class Connect(fs.JsonFileIO):
         return httplib2.urllib.parse.quote(url, safe=":/")
     
     def get_url(self, name):
+        # サービス名ごとにURLを解決済みで保持する (設定の変更時に破棄)
+        url = self._urls.get(name)
+        if url is not None:
+            return url
         match = [c for c in self.config if c.get("name") == name]
         if not match:
             return # config無し
         match = match[0]
         url = "http://{}:{}/{}".format(match["ip"], match["port"], match["uri"])
-        return self.parse(url)
+        url = self._urls[name] = self.parse(url)
+        return url
 
     
     def exist(self,name):
@@ -79,6 +88,7 @@ class Connect(fs.JsonFileIO):
     def update(self, name, data):
         conf = self.getter(name)
         self.config[self.config.index(conf)] = data
+        self._urls.pop(name, None)
         self.upload()
 
     def add(self, data):
@@ -93,6 +103,7 @@ class Connect(fs.JsonFileIO):
     @config.setter
     def config(self, data):
         self._config = data
+        self._urls = {}
         # configが更新されたら、ファイルも更新
         self.upload()
 
@@ -119,8 +130,157 @@ def get_config(name):
     return con.getter(name)
 
 
-client = httplib2.Http(os.path.dirname(__file__) + "/.cache")
-header = {'connection':'close'}
+class _LockedCache:
+    """
+    Thread-safe wrapper of the on-disk HTTP cache, shared by every pooled client.
+    """
+    def __init__(self, path):
+        self._cache = httplib2.FileCache(path)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._cache.set(key, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._cache.delete(key)
+
+
+class Transport:
+    """
+    Pooled keep-alive HTTP transport, safe to share between threads.
+
+    Each thread borrows its own client from a pool for the duration of a request, and each client keeps its
+    connections open between requests. Only idempotent (GET/HEAD) requests use the on-disk HTTP cache.
+    The latency of every endpoint (service name and uri) is recorded.
+    """
+    IDEMPOTENT = ("GET", "HEAD")
+
+    def __init__(self, cache=None, timeout=None):
+        self._cache = None if cache is None else _LockedCache(cache)
+        self._timeout = timeout
+        self._pools = {True: queue.LifoQueue(), False: queue.LifoQueue()}
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def request(self, endpoint, url, method, body=None, headers=None):
+        """
+        Send a request on a pooled client.
+
+        Args:
+            endpoint: str
+                The key to record the latency against.
+            url: str
+                The full url.
+            method: str
+                The HTTP method.
+            body: str
+                The request body.
+            headers: dict
+                The request headers.
+
+        Return: tuple
+            The response and content, as returned by httplib2.
+        """
+        cached = method.upper() in self.IDEMPOTENT
+        client = self._borrow(cached)
+        start = time.perf_counter()
+        try:
+            return client.request(url, method, body=body, headers=headers)
+        finally:
+            self._record(endpoint, time.perf_counter() - start)
+            self._pools[cached].put(client)
+
+    def latency(self):
+        """
+        Summary:
+            Per-endpoint latency counters.
+
+        Return: dict
+            For each endpoint, a dict of the number of calls, and the total, mean and maximum latency (in seconds).
+        """
+        with self._lock:
+            return {k: {"count": n, "total": t, "mean": t / n, "max": m} for k, (n, t, m) in self._latency.items()}
+
+    def reset_latency(self):
+        with self._lock:
+            self._latency.clear()
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        for pool in self._pools.values():
+            while True:
+                try:
+                    client = pool.get_nowait()
+                except queue.Empty:
+                    break
+                client.close()
+
+    def _borrow(self, cached):
+        try:
+            return self._pools[cached].get_nowait()
+        except queue.Empty:
+            return httplib2.Http(self._cache if cached else None, timeout=self._timeout)
+
+    def _record(self, endpoint, elapsed):
+        with self._lock:
+            n, t, m = self._latency.get(endpoint, (0, 0.0, 0.0))
+            self._latency[endpoint] = (n + 1, t + elapsed, max(m, elapsed))
+
+
+client = Transport(os.path.dirname(__file__) + "/.cache")
+header = {}
+routed = False
+
+
+class HttpAdapter:
+    """
+    httplib2.Http-compatible front of a Transport, for code that sends its requests through `client.request`.
+    """
+    def __init__(self, transport):
+        self._transport = transport
+
+    def request(self, uri, method="GET", body=None, headers=None, **kw):
+        endpoint = httplib2.urllib.parse.urlsplit(uri).path
+        return self._transport.request(endpoint, uri, method, body=body, headers=headers)
+
+
+def install(module):
+    """
+    Summary:
+        Route another PyJEM base module (such as the installed PyJEM.base, used by the online TEM3 controllers)
+        through the shared transport, by replacing its module-level httplib2 client.
+
+    Args:
+        module: module
+            The base module to patch.
+
+    Return: bool
+        Whether the module could be patched. A module without a module-level httplib2 client is left untouched,
+        and its requests are not thread-safe.
+    """
+    global routed
+    if isinstance(getattr(module, "client", None), HttpAdapter):
+        return True
+    if not isinstance(getattr(module, "client", None), httplib2.Http):
+        return False
+    module.client = HttpAdapter(client)
+    routed = True
+    return True
+
+
+def latency():
+    return client.latency()
+
+def reset_latency():
+    client.reset_latency()
 
 def request(*d_args):
     """
@@ -146,18 +306,18 @@ def request(*d_args):
             message = make_list(name, func.__name__, method, url)
             try:
                 if not kw and not f_args:
-                    res, cont = client.request(url, method, headers=header)                                  
+                    res, cont = client.request(name + uri, url, method, headers=header)
                 elif not kw:
                     body = func(*f_args)
                     body = _filter(body)
                     body = json.dumps(body)
-                    res, cont = client.request(url, method,body=body, headers=header)
+                    res, cont = client.request(name + uri, url, method, body=body, headers=header)
                     message.append(body)
                 else:
                     body = func(kw)
                     body = _filter(body)
                     body = json.dumps(body)
-                    res, cont = client.request(url, method,body=body, headers=header)
+                    res, cont = client.request(name + uri, url, method, body=body, headers=header)
                     message.append(body)
                 if setting.get_config("log"):
                     log.info(message)
@@ -2,4 +2,4 @@ from . import controllers
 from ._engine import Scanner
 from ._main import Controller as Microscope
 from ._utils import *
-from .merlin_connection import MERLIN_connection as Merlin
+from .merlin_connection import MERLIN_connection as Merlin, MerlinPool
@@ -0,0 +1,305 @@
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import typing
+from typing import Any as _any, Callable as _callable, Dict as _dict, Hashable as _hashable, Optional as _None
+
+from ._utils import ONLINE
+from .. import load_settings, validation
+
+if ONLINE:
+    from .PyJEM import base as _transport
+
+__all__ = ["AsyncClient", "Coalesced", "client"]
+
+settings = load_settings("assets/config.json", async_workers=validation.examples.natural_int)
+
+T = typing.TypeVar("T")
+
+
+class AsyncClient:
+    """
+    Asyncio layer over the blocking PyJEM calls.
+
+    The client runs its own event loop on a daemon thread, and every call is run on the loop's executor, so independent
+    reads are in flight at the same time. Identical reads (the same function with the same arguments) that are
+    requested while one is already in flight share its result rather than sending another request.
+
+    Calls made from inside a read (such as a reading that is built from several getters) run directly on the calling
+    thread, so that a read never waits on the executor it is running on.
+
+    Online, calls only run concurrently if the installed PyJEM was routed through the pooled transport (see
+    `PyJEM.base.install`), as its own shared HTTP client is not thread-safe. Otherwise, calls run one at a time, but
+    identical reads are still merged, and every other call (such as a setter) must be made through `run` so that it is
+    queued on the same thread.
+
+    Attributes
+    ----------
+    _workers: int | None
+        The maximum number of concurrent calls, or None to use the configured number.
+    _loop: AbstractEventLoop | None
+        The event loop, created on the first call.
+    _thread: Thread | None
+        The thread running the event loop.
+    _lock: Lock
+        The lock guarding the creation of the event loop.
+    _local: local
+        Thread-local flag of whether the current thread is running a call.
+    _in_flight: dict[Hashable, Future]
+        The pending result of each read in flight. This is only accessed from the event loop.
+    _merged: int
+        The number of reads that shared the result of a read already in flight.
+
+    Parameters
+    ----------
+    workers: int | None
+        The maximum number of concurrent calls. If None, uses the configured number if the online transport is
+        thread-safe, and 1 otherwise.
+    """
+
+    @property
+    def workers(self) -> int:
+        """
+        Public access to the maximum number of concurrent calls.
+
+        Returns
+        -------
+        int
+            The number of calls that can be in flight at once.
+        """
+        if self._workers is not None:
+            return self._workers
+        elif ONLINE and not _transport.routed:
+            return 1
+        return settings["async_workers"]
+
+    @property
+    def serial(self) -> bool:
+        """
+        Public access to whether calls run one at a time.
+
+        Returns
+        -------
+        bool
+            Whether every call to the hardware must go through this client, as the transport is not thread-safe.
+        """
+        return self.workers == 1
+
+    @property
+    def merged(self) -> int:
+        """
+        Public access to the number of merged reads.
+
+        Returns
+        -------
+        int
+            The number of reads that did not send their own request.
+        """
+        return self._merged
+
+    def __init__(self, workers: int = None):
+        self._workers = workers
+        self._loop: _None[asyncio.AbstractEventLoop] = None
+        self._thread: _None[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._in_flight: _dict[_hashable, asyncio.Future] = {}
+        self._merged = 0
+
+    async def call(self, fn: _callable[..., T], *args) -> T:
+        """
+        Run a blocking read on the executor, sharing the result of an identical read already in flight.
+
+        Parameters
+        ----------
+        fn: Callable[..., T]
+            The blocking read.
+        *args: Any
+            The positional arguments of the read.
+
+        Returns
+        -------
+        T
+            The result of the read.
+        """
+        key = (fn, args)
+        try:
+            future = self._in_flight.get(key)
+        except TypeError:
+            return await asyncio.get_running_loop().run_in_executor(None, self._run, fn, args)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, self._run, fn, args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._merged += 1
+        return await asyncio.shield(future)
+
+    async def gather(self, readers: _dict[str, _callable[[], _any]]) -> _dict[str, _any]:
+        """
+        Run a set of independent reads concurrently.
+
+        Parameters
+        ----------
+        readers: dict[str, Callable[[], Any]]
+            The function to take each reading.
+
+        Returns
+        -------
+        dict[str, Any]
+            The value of each reading.
+        """
+        values = await asyncio.gather(*(self.call(reader) for reader in readers.values()))
+        return dict(zip(readers, values))
+
+    def read(self, fn: _callable[..., T], *args) -> T:
+        """
+        Synchronous wrapper of `call`.
+
+        Parameters
+        ----------
+        fn: Callable[..., T]
+            The blocking read.
+        *args: Any
+            The positional arguments of the read.
+
+        Returns
+        -------
+        T
+            The result of the read.
+        """
+        if getattr(self._local, "inside", False):
+            return fn(*args)
+        return self._submit(self.call(fn, *args)).result()
+
+    def run(self, fn: _callable[..., T], *args) -> T:
+        """
+        Run a blocking call on the executor, without sharing the result of any other call.
+
+        Parameters
+        ----------
+        fn: Callable[..., T]
+            The blocking call (such as a setter).
+        *args: Any
+            The positional arguments of the call.
+
+        Returns
+        -------
+        T
+            The result of the call.
+        """
+        if getattr(self._local, "inside", False):
+            return fn(*args)
+        return self._submit(self._call(fn, args)).result()
+
+    def read_all(self, readers: _dict[str, _callable[[], _any]]) -> _dict[str, _any]:
+        """
+        Synchronous wrapper of `gather`.
+
+        Parameters
+        ----------
+        readers: dict[str, Callable[[], Any]]
+            The function to take each reading.
+
+        Returns
+        -------
+        dict[str, Any]
+            The value of each reading.
+        """
+        if getattr(self._local, "inside", False):
+            return {name: reader() for name, reader in readers.items()}
+        return self._submit(self.gather(readers)).result()
+
+    def wrap(self, controller: object) -> "Coalesced":
+        """
+        Wrap a PyJEM controller, so that its getters are read through this client.
+
+        Parameters
+        ----------
+        controller: object
+            The raw PyJEM controller.
+
+        Returns
+        -------
+        Coalesced
+            The wrapped controller.
+        """
+        return Coalesced(controller, self)
+
+    def close(self):
+        """
+        Stop the event loop and its executor. The client restarts them if it is used again.
+        """
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def _submit(self, coroutine: typing.Coroutine[_any, _any, T]) -> concurrent.futures.Future:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(
+                    concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pyjem")
+                )
+                self._thread = threading.Thread(target=self._loop.run_forever, name="pyjem-loop", daemon=True)
+                self._thread.start()
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def _call(self, fn: _callable[..., T], args: tuple) -> T:
+        return await asyncio.get_running_loop().run_in_executor(None, self._run, fn, args)
+
+    def _run(self, fn: _callable[..., T], args: tuple) -> T:
+        self._local.inside = True
+        try:
+            return fn(*args)
+        finally:
+            self._local.inside = False
+
+
+class Coalesced:
+    """
+    Synchronous proxy of a PyJEM controller, which reads its getters through an asynchronous client.
+
+    Every attribute is forwarded to the controller, but the methods starting with `Get` block on the client instead of
+    calling the controller directly. Other methods (such as setters) are never merged, and are called directly unless
+    the client is serial, in which case they are run on the client so that the transport is only used by one thread.
+
+    Attributes
+    ----------
+    _controller: object
+        The raw PyJEM controller.
+    _client: AsyncClient
+        The client to read through.
+
+    Parameters
+    ----------
+    controller: object
+        The raw PyJEM controller.
+    client: AsyncClient
+        The client to read through.
+    """
+
+    def __init__(self, controller: object, client: AsyncClient):
+        self._controller = controller
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._controller, name)
+        if name.startswith("Get") and callable(attr):
+            def _read(*args):
+                return self._client.read(attr, *args)
+
+            return _read
+        elif callable(attr) and self._client.serial:
+            def _call(*args, **kwargs):
+                return self._client.run(functools.partial(attr, *args, **kwargs))
+
+            return _call
+        return attr
+
+
+client = AsyncClient()
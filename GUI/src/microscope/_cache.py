@@ -0,0 +1,272 @@
+import functools
+import threading
+import time
+import weakref
+from typing import Any as _any, Dict as _dict, Optional as _None, Set as _set, Tuple as _tuple
+
+from . import _async
+from .. import load_settings, validation
+
+__all__ = ["Cached", "Refresher", "refresher"]
+
+settings = load_settings("assets/config.json", cache_ttl=validation.examples.positive_float,
+                         cache_refresh=validation.examples.positive_float)
+
+_Key = _tuple[str, tuple]
+
+
+class Cached:
+    """
+    Write-through cache of the getters of a PyJEM controller.
+
+    Every `Get` call is cached by its name and arguments, and is served from the cache while it is younger than the
+    staleness window. Declared setters write their value through to the matching getter (with the same leading
+    arguments), and any other call that is not a getter (such as a relative move) drops the whole cache, as its effect
+    on the hardware is unknown.
+
+    Readings that are used are kept fresh by the background refresher, so constant polling costs one request per
+    refresh rather than one per read, and changes made outside the GUI (such as from the JEOL console) are still seen.
+
+    Attributes
+    ----------
+    _written: int
+        The number of writes and invalidations through any cache (class-wide).
+    _written_lock: Lock
+        The lock guarding the class-wide count (class-wide).
+    _controller: object
+        The wrapped PyJEM controller.
+    _writes: dict[str, str]
+        The getter that each write-through setter updates.
+    _ttl: float
+        The time in seconds that each cached reading is valid for.
+    _entries: dict[tuple[str, tuple], tuple[Any, float]]
+        The cached value of each reading, and the (monotonic) time it was taken or written.
+    _used: set[tuple[str, tuple]]
+        The readings that have been served since they were last refreshed.
+    _generation: int
+        The number of writes, used to discard readings that were in flight during a write.
+    _lock: Lock
+        The lock guarding the cache.
+    _hits: int
+        The number of reads served from the cache.
+    _fetches: int
+        The number of reads sent to the hardware (including refreshes).
+
+    Parameters
+    ----------
+    controller: object
+        The PyJEM controller to wrap.
+    writes: dict[str, str] | None
+        The getter that each write-through setter updates. The setter's last argument is the value, and the rest are
+        the getter's arguments.
+    ttl: float | None
+        The time in seconds that each cached reading is valid for. If None, uses the configured time.
+    """
+
+    _written = 0
+    _written_lock = threading.Lock()
+
+    @classmethod
+    def written(cls) -> int:
+        """
+        Public access to the number of writes through any cache.
+
+        Returns
+        -------
+        int
+            The number of writes and invalidations through every cache, which changes whenever a reading from any
+            controller may have changed (such as readings held outside the caches).
+        """
+        return cls._written
+
+    @property
+    def hits(self) -> int:
+        """
+        Public access to the number of cached reads.
+
+        Returns
+        -------
+        int
+            The number of reads that did not reach the hardware.
+        """
+        return self._hits
+
+    @property
+    def fetches(self) -> int:
+        """
+        Public access to the number of hardware reads.
+
+        Returns
+        -------
+        int
+            The number of reads sent to the hardware, including background refreshes.
+        """
+        return self._fetches
+
+    def __init__(self, controller: object, writes: _dict[str, str] = None, ttl: float = None):
+        self._controller = controller
+        self._writes = writes or {}
+        self._ttl = settings["cache_ttl"] if ttl is None else ttl
+        self._entries: _dict[_Key, _tuple[_any, float]] = {}
+        self._used: _set[_Key] = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._fetches = 0
+        refresher.add(self)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._controller, name)
+        if not callable(attr):
+            return attr
+        elif name.startswith("Get"):
+            return functools.partial(self._read, name)
+        return functools.partial(self._write, name)
+
+    def invalidate(self):
+        """
+        Drop every cached reading, so the next read of each reaches the hardware.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._used.clear()
+        self._wrote()
+
+    def refresh(self, period: float = 0.0):
+        """
+        Re-read every reading that has been served since it was last refreshed.
+
+        The readings are taken concurrently, and readings that were written to while in flight are discarded.
+
+        Parameters
+        ----------
+        period: float
+            The minimum age in seconds of a reading before it is refreshed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key in self._used if now - self._entries[key][1] >= period]
+            self._used.difference_update(due)
+            generation = self._generation
+        if not due:
+            return
+        readings = _async.client.read_all({key: self._fetch(key) for key in due})
+        with self._lock:
+            self._fetches += len(due)
+            if generation == self._generation:
+                self._entries.update((key, (value, now)) for key, value in readings.items())
+
+    def _fetch(self, key: _Key):
+        name, args = key
+        return functools.partial(getattr(self._controller, name), *args)
+
+    def _read(self, name: str, *args):
+        key = (name, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self._ttl:
+                self._hits += 1
+                self._used.add(key)
+                return entry[0]
+            generation = self._generation
+        value = self._fetch(key)()
+        with self._lock:
+            self._fetches += 1
+            if generation == self._generation:
+                self._entries[key] = (value, now)
+        return value
+
+    def _write(self, name: str, *args):
+        result = getattr(self._controller, name)(*args)
+        getter = self._writes.get(name)
+        with self._lock:
+            self._generation += 1
+            if getter is None or not args:
+                self._entries.clear()
+                self._used.clear()
+            else:
+                key = (getter, args[:-1])
+                self._entries[key] = (args[-1], time.monotonic())
+        self._wrote()
+        return result
+
+    @classmethod
+    def _wrote(cls):
+        with cls._written_lock:
+            cls._written += 1
+
+
+class Refresher:
+    """
+    Background thread that reconciles every controller cache with the hardware.
+
+    The readings are taken through the shared asynchronous client, and when that client is serial (as the online
+    transport is not thread-safe) the controllers' setters are queued on the same thread, so a refresh never uses the
+    transport at the same time as a write.
+
+    Attributes
+    ----------
+    _period: float
+        The time in seconds between refreshes.
+    _caches: WeakSet[Cached]
+        The caches to refresh.
+    _lock: Lock
+        The lock guarding the caches and the thread.
+    _stop: Event
+        The event that stops the thread.
+    _thread: Thread | None
+        The refresh thread, started when the first cache is added.
+
+    Parameters
+    ----------
+    period: float | None
+        The time in seconds between refreshes. If None, uses the configured time.
+    """
+
+    def __init__(self, period: float = None):
+        self._period = settings["cache_refresh"] if period is None else period
+        self._caches: "weakref.WeakSet[Cached]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: _None[threading.Thread] = None
+
+    def add(self, cache: Cached):
+        """
+        Start refreshing a cache.
+
+        Parameters
+        ----------
+        cache: Cached
+            The cache to refresh.
+        """
+        with self._lock:
+            self._caches.add(cache)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._work, name="cache-refresher", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """
+        Stop the refresh thread. It is restarted when another cache is added.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _work(self):
+        while not self._stop.wait(self._period):
+            with self._lock:
+                caches = list(self._caches)
+            for cache in caches:
+                try:
+                    cache.refresh(self._period)
+                except Exception:
+                    cache.invalidate()
+
+
+refresher = Refresher()
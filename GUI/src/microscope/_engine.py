@@ -1,5 +1,8 @@
+import time
 import typing
-from typing import Optional as _None, Dict as _dict, List as _list
+from concurrent import futures
+from typing import Optional as _None, Dict as _dict, Iterator as _iter, List as _list, Sequence as _seq, \
+    Tuple as _tuple
 
 import cv2
 import numpy as np
@@ -18,6 +21,126 @@ valid_type = validation.Pipeline(
     in_type=ScanType, out_type=ScanType)
 
 
+def _same_area(first: ScanType, second: ScanType) -> bool:
+    """
+    Check whether two scan areas would configure the engine identically.
+
+    Consecutive regions of equal size at different positions still reconfigure the engine, as neither engine can move
+    an area without resizing it: the QD engine takes the size and corners in one `set_image_area` call, and the JEOL
+    detector takes the size and position in one `set_areamode_imagingarea` call. So a region of equal size costs that
+    one call, and the rest of the setup is what is reused - the registered frame monitor (kept per full image size) and
+    the frame buffers (kept per frame shape) - while `scan_many` also skips restoring the full area between regions.
+
+    Parameters
+    ----------
+    first: ScanType
+        The first area.
+    second: ScanType
+        The second area.
+
+    Returns
+    -------
+    bool
+        Whether the areas have the same full size and the same rectangle.
+    """
+    return first.size == second.size and first.rect() == second.rect()
+
+
+def _travel_order(regions: _seq[ScanType], start: ScanType) -> _list[int]:
+    """
+    Order regions greedily, so that each region is the nearest remaining one to the last.
+
+    Distances are between the top-left corners of each rectangle, and ties keep the original order.
+
+    Parameters
+    ----------
+    regions: Sequence[ScanType]
+        The regions to order.
+    start: ScanType
+        The region the beam starts in.
+
+    Returns
+    -------
+    list[int]
+        The indices of the regions, in the order to scan them.
+    """
+    corners = np.array([(r.rect()[0], r.rect()[2]) for r in regions], dtype=np.float64).reshape(-1, 2)
+    position = np.array((start.rect()[0], start.rect()[2]), dtype=np.float64)
+    remaining = np.ones(len(regions), dtype=bool)
+    order = []
+    for _ in range(len(regions)):
+        distance = np.where(remaining, np.hypot(*(corners - position).T), np.inf)
+        i = int(np.argmin(distance))
+        order.append(i)
+        remaining[i] = False
+        position = corners[i]
+    return order
+
+
+def _pattern_area(arr: np.ndarray, full_size: _tuple[int, int]) -> _tuple[np.ndarray, AreaScan]:
+    """
+    Pack a pattern into a contiguous co-ordinate array, and find the area it covers.
+
+    Parameters
+    ----------
+    arr: ndarray[int, (n, 2)]
+        The co-ordinate array for the pattern, in scan order. Each co-ordinate is in the form (x, y), relative to the
+        full scan.
+    full_size: tuple[int, int]
+        The full scan size.
+
+    Returns
+    -------
+    tuple[ndarray[int32, (n, 2)], AreaScan]
+        The packed co-ordinates, and the bounding box of the co-ordinates.
+
+    Raises
+    ------
+    ValueError
+        If the array is not a non-empty list of co-ordinate pairs, or any co-ordinate lies outside the full scan.
+    """
+    co_ords = np.ascontiguousarray(arr, dtype=np.int32)
+    if co_ords.ndim != 2 or co_ords.shape[1] != 2 or not len(co_ords):
+        raise ValueError(f"Expected a non-empty (n, 2) co-ordinate array, got shape {co_ords.shape}")
+    lower, upper = co_ords.min(axis=0), co_ords.max(axis=0)
+    if np.any(lower < 0) or np.any(upper >= full_size):
+        raise ValueError(f"Pattern spans {tuple(lower)} to {tuple(upper)}, outside the {full_size} scan")
+    return co_ords, AreaScan.from_corners(full_size, tuple(map(int, lower)), tuple(map(int, upper + 1)))
+
+
+def _scan_many(scanner: "Scanner", regions: _seq[ScanType], reorder: bool) -> _iter[_tuple[int, GreyImage]]:
+    """
+    Scan a batch of regions, keeping one acquisition in flight while the previous frame is consumed.
+
+    Parameters
+    ----------
+    scanner: Scanner
+        The scanner to use.
+    regions: Sequence[ScanType]
+        The regions to scan.
+    reorder: bool
+        Whether to reorder the regions to minimise beam travel.
+
+    Yields
+    ------
+    tuple[int, GreyImage]
+        The index of each region (in the original sequence) and its scanned image, as each acquisition completes.
+    """
+    original = scanner.scan_area
+    order = _travel_order(regions, original) if reorder else list(range(len(regions)))
+    pending = scanner.scan_async(regions[order[0]]) if order else None
+    try:
+        for n, i in enumerate(order):
+            frame = pending.result()
+            pending = scanner.scan_async(regions[order[n + 1]]) if n + 1 < len(order) else None
+            yield i, frame
+    finally:
+        if pending is not None and not pending.cancel():
+            futures.wait((pending,))
+        if not _same_area(scanner.scan_area, original):
+            scanner.scan_area = original
+
+
 class Connection:
     """
     A TTL connection to an external service.
@@ -234,13 +357,35 @@ if QD:
         lines: str (read-only)
             A binary string representing which connections are enabled.
 
+        Acquisitions run on a persistent service: a single worker thread that keeps one frame monitor registered per
+        image size, and copies each frame into a ring of preallocated buffers. `scan_async` queues an acquisition and
+        returns a future, so the next acquisition can run while the previous frame is processed. Offline, the service
+        emulates the acquisition time (from the dwell time and flyback) with a synthetic frame.
+
         Attributes
         ----------
+        BUFFERS: int
+            The number of preallocated frame buffers for each frame shape. A frame from `scan_async` is only valid until
+            this many further acquisitions have completed.
         _engine: ScanEngine
             The underlying engine.
         _lines: list[str]
             The list of binary markers to determine which connections are active.
+        _service: ThreadPoolExecutor | None
+            The acquisition service, created on the first acquisition.
+        _monitor: FrameMonitor | None
+            The single registered frame monitor, sized for the last full image size scanned.
+        _monitor_size: tuple[int, int] | None
+            The full image size the registered frame monitor was created for.
+        _pattern: ndarray | None
+            The co-ordinates of the scanning pattern, if there is one.
+        _buffers: dict[tuple[tuple[int, int], dtype], list[ndarray]]
+            The ring of frame buffers for each frame shape and type.
+        _next: dict[tuple[tuple[int, int], dtype], int]
+            The next buffer to use in each ring.
         """
+        BUFFERS = 2
+        _frame: _None[np.ndarray] = None
 
         @Key
         def scan_area(self) -> ScanType:
@@ -259,6 +404,7 @@ if QD:
             valid_type.validate(value)
             self._region = value
             self._engine.set_image_area(*value.size, *value.rect())
+            self._pattern = None
 
         @Key
         def dwell_time(self) -> float:
@@ -308,6 +454,18 @@ if QD:
             """
             return "".join(self._lines)
 
+        @property
+        def pattern(self) -> _None[np.ndarray]:
+            """
+            Public access to the scanning pattern.
+
+            Returns
+            -------
+            ndarray[int32, (n, 2)] | None
+                A copy of the co-ordinates of the pattern (None if the whole scan area is scanned).
+            """
+            return None if self._pattern is None else self._pattern.copy()
+
         def __init__(self, full_scan: FullScan, dwell_time: float = None, flyback: float = None):
             self._inhibit = validation.examples.any_float + validation.Pipeline(
                 validation.Step(validation.DynamicUpperBoundValidator(lambda: self.dwell_time, inclusive=False)),
@@ -324,6 +482,11 @@ if QD:
             if flyback is not None:
                 self.flyback = flyback
             self._lines = ["0"] * 10
+            self._service: _None[futures.ThreadPoolExecutor] = None
+            self._monitor: _None[FrameMonitor] = None
+            self._monitor_size: _None[_tuple[int, int]] = None
+            self._buffers: _dict[tuple, _list[np.ndarray]] = {}
+            self._next: _dict[tuple, int] = {}
 
             self._engine.set_enabled_inputs([3])  # add proper support for inputs
             self._engine.disable_lines(0b1111111111)
@@ -342,22 +505,35 @@ if QD:
             """
             return self._inhibit
 
-        def set_pattern(self, arr: np.ndarray):
+        def set_pattern(self, arr: _None[np.ndarray]):
             """
             Sets the scanning pattern.
 
-            Note that this is not currently implemented.
+            The co-ordinates are packed into a contiguous int32 array, and the scan area is narrowed to their bounding
+            box, so only the part of the field the pattern visits is scanned. The pattern itself is not sent to the
+            engine, so the whole bounding box is still rastered. The pattern is cleared when the scan area next changes.
 
             Parameters
             ----------
-            arr: ndarray[int [y, 2]]
-                The co-ordinate array for the pattern.
+            arr: ndarray[int, (n, 2)] | None
+                The co-ordinate array for the pattern, such as the output of `Design.compile`, offset into the full
+                scan. Each co-ordinate is in the form (x, y). If None, clears the pattern and restores the full scan.
+
+            Raises
+            ------
+            ValueError
+                If the array is not a non-empty list of co-ordinate pairs inside the full scan.
             """
-            pass  # add proper encoding support
+            if arr is None:
+                self.scan_area = FullScan(self._region.size)
+                return
+            co_ords, area = _pattern_area(arr, self._region.size)
+            self.scan_area = area
+            self._pattern = co_ords
 
         def scan(self, *, return_=True) -> _None[GreyImage]:
             """
-            Perform a scan on the registered area.
+            Perform a scan on the registered area, once every scheduled hardware change has settled.
 
             Parameters
             ----------
@@ -369,20 +545,117 @@ if QD:
             GreyImage | None
                 The scanned image (None if the `return_` parameter is False).
             """
-            x_size, y_size = self._region.size
-            sx, ex, sy, ey = self._region.rect()
+            settle.wait()
             if ONLINE:
-                monitor = FrameMonitor(x_size + 1, y_size + 1, inputs=[3], max_queue_size=1)
-                monitor.register(self._engine)
-                self._engine.start_imaging(0)
-                self._engine.stop_imaging()
-                monitor.wait_for_image()
+                img = self.scan_async().result()
                 if return_:
-                    img = monitor.pop().get_input_data(3)[sy:ey, sx:ex]
-                    return GreyImage(img.astype(np.int_))
+                    return GreyImage(img.data().copy())
             elif return_:
                 return GreyImage.from_file("./assets/img_3.bmp", do_static=True)
 
+        def scan_async(self, area: ScanType = None) -> futures.Future:
+            """
+            Queue a scan on the acquisition service.
+
+            Parameters
+            ----------
+            area: ScanType | None
+                The area to scan. The service switches to this area just before the acquisition, so it is safe to queue
+                scans of different areas back to back. If left blank, uses the registered area at acquisition time.
+
+            Returns
+            -------
+            Future[GreyImage]
+                The scanned image. Note that it is held in a preallocated buffer, which is reused after `BUFFERS`
+                further acquisitions, so it should be copied if it is kept.
+            """
+            if self._service is None:
+                self._service = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="qd-acquisition")
+            return self._service.submit(self._acquire, area)
+
+        def scan_many(self, regions: _seq[ScanType], *, reorder=True) -> _iter[_tuple[int, GreyImage]]:
+            """
+            Scan a batch of regions.
+
+            The engine is only reconfigured when consecutive regions differ, and the original scan area is only restored
+            once the batch ends (or the iterator is closed). The next region is acquired while the current frame is
+            being consumed.
+
+            Parameters
+            ----------
+            regions: Sequence[ScanType]
+                The regions to scan.
+            reorder: bool
+                Whether to scan the regions in the order that minimises beam travel (defaults to True).
+
+            Yields
+            ------
+            tuple[int, GreyImage]
+                The index of each region (in the given sequence) and its scanned image. As with `scan_async`, each image
+                is held in a reused buffer and should be copied if it is kept.
+            """
+            return _scan_many(self, regions, reorder)
+
+        def _acquire(self, area: _None[ScanType]) -> GreyImage:
+            if area is not None and not _same_area(area, self._region):
+                self.scan_area = area
+            settle.wait()
+            x_size, y_size = self._region.size
+            sx, ex, sy, ey = self._region.rect()
+            if ONLINE:
+                monitor = self._monitor_for((x_size, y_size))
+                try:
+                    self._engine.start_imaging(0)
+                    self._engine.stop_imaging()
+                    monitor.wait_for_image()
+                    frame = monitor.pop().get_input_data(3)[sy:ey, sx:ex]
+                except BaseException:
+                    # the monitor may still hold (or later receive) this acquisition's frame
+                    self._drop_monitor()
+                    raise
+                if not np.issubdtype(frame.dtype, np.integer):
+                    frame = frame.astype(np.int_)
+                static = None
+            else:
+                # the pattern is not sent to the engine, so its bounding box is rastered in full - time that raster
+                pixels, rows = (ex - sx) * (ey - sy), ey - sy
+                time.sleep(pixels * self._engine.pixel_time + rows * self._engine.get_flyback_time())
+                frame = self._synthetic()
+                static = (0, 255)
+            buffer = self._buffer(frame.shape, frame.dtype)
+            np.copyto(buffer, frame)
+            return GreyImage(buffer, static_range=static)
+
+        def _monitor_for(self, size: _tuple[int, int]) -> FrameMonitor:
+            # Only one monitor is ever registered, so no idle monitor can collect another size's acquisition
+            if self._monitor is not None and self._monitor_size != size:
+                self._drop_monitor()
+            if self._monitor is None:
+                self._monitor = FrameMonitor(size[0] + 1, size[1] + 1, inputs=[3], max_queue_size=1)
+                self._monitor.register(self._engine)
+                self._monitor_size = size
+            return self._monitor
+
+        def _drop_monitor(self):
+            if self._monitor is not None:
+                monitor, self._monitor, self._monitor_size = self._monitor, None, None
+                monitor.unregister(self._engine)
+
+        def _buffer(self, shape: _tuple[int, int], dtype: np.dtype) -> np.ndarray:
+            key = (shape, np.dtype(dtype))
+            if key not in self._buffers:
+                self._buffers[key] = [np.empty(shape, dtype=dtype) for _ in range(self.BUFFERS)]
+                self._next[key] = 0
+            i = self._next[key]
+            self._next[key] = (i + 1) % self.BUFFERS
+            return self._buffers[key][i]
+
+        @staticmethod
+        def _synthetic() -> np.ndarray:
+            if Scanner._frame is None:
+                Scanner._frame = GreyImage.from_file("./assets/img_3.bmp", do_static=True).data()
+            return Scanner._frame
+
         def using_connection(self, line_index: int, mode: TTLMode, source: TriggerSource, *,
                              active: float = None, delay: float = None, count: int = None) -> Connection:
             """
@@ -506,6 +779,10 @@ else:
             The detector controller that will be used for scanning - this is the scan engine for JEOL.
         _area: ScanType
             The scan area that will be used for scanning.
+        _service: ThreadPoolExecutor | None
+            The single background thread used by `scan_async`, created on the first asynchronous scan.
+        _pattern: ndarray | None
+            The co-ordinates of the scanning pattern, if there is one.
         """
 
         @Key
@@ -526,6 +803,7 @@ else:
             self._area = value
             sx, ex, sy, ey = self._area.rect()
             self._engine.set_areamode_imagingarea(ex - sx, ey - sy, sx, sy)
+            self._pattern = None
 
         @Key
         def dwell_time(self) -> float:
@@ -576,6 +854,18 @@ else:
             """
             return "0000000000"
 
+        @property
+        def pattern(self) -> _None[np.ndarray]:
+            """
+            Public access to the scanning pattern.
+
+            Returns
+            -------
+            ndarray[int32, (n, 2)] | None
+                A copy of the co-ordinates of the pattern (None if the whole scan area is scanned).
+            """
+            return None if self._pattern is None else self._pattern.copy()
+
         def __init__(self, full_scan: FullScan, dwell_time: float = None, flyback: float = None):
             if ONLINE:
                 self._engine = JEOLEngine("ADF1")
@@ -583,6 +873,7 @@ else:
                 self._engine.set_scanmode(3)  # area mode
             else:
                 self._engine = OfflineEngine()
+            self._service: _None[futures.ThreadPoolExecutor] = None
             self.scan_area = full_scan
             if dwell_time is not None:
                 self.dwell_time = dwell_time
@@ -598,22 +889,35 @@ else:
             """
             return validation.Pipeline(in_type=typing.Any, out_type=typing.Any)
 
-        def set_pattern(self, arr: np.ndarray):
+        def set_pattern(self, arr: _None[np.ndarray]):
             """
             Sets the scanning pattern.
 
-            Note that this is not currently implemented.
+            The co-ordinates are packed into a contiguous int32 array, and the scan area is narrowed to their bounding
+            box, so only the part of the field the pattern visits is scanned. The pattern itself is not sent to the
+            engine, so the whole bounding box is still rastered. The pattern is cleared when the scan area next changes.
 
             Parameters
             ----------
-            arr: ndarray[int [y, 2]]
-                The co-ordinate array for the pattern.
+            arr: ndarray[int, (n, 2)] | None
+                The co-ordinate array for the pattern, such as the output of `Design.compile`, offset into the full
+                scan. Each co-ordinate is in the form (x, y). If None, clears the pattern and restores the full scan.
+
+            Raises
+            ------
+            ValueError
+                If the array is not a non-empty list of co-ordinate pairs inside the full scan.
             """
-            pass  # add proper encoding support
+            if arr is None:
+                self.scan_area = FullScan(self._area.size)
+                return
+            co_ords, area = _pattern_area(arr, self._area.size)
+            self.scan_area = area
+            self._pattern = co_ords
 
         def scan(self, *, return_=True) -> _None[GreyImage]:
             """
-            Perform a scan on the registered area.
+            Perform a scan on the registered area, once every scheduled hardware change has settled.
 
             Parameters
             ----------
@@ -625,13 +929,60 @@ else:
             GreyImage | None
                 The scanned image (None if the `return_` parameter is False).
             """
+            settle.wait()
             buffer = self._engine.snapshot_rawdata()
             if return_:
                 array = np.frombuffer(buffer, np.int16)
                 w, h = self._area.size
-                array = array.reshape((h, w)).astype(np.int_)
+                array = array.reshape((h, w)).copy()
                 return GreyImage(array)
 
+        def scan_async(self, area: ScanType = None) -> futures.Future:
+            """
+            Queue a scan on a background thread.
+
+            Parameters
+            ----------
+            area: ScanType | None
+                The area to scan. The area is switched to just before the acquisition. If left blank, uses the
+                registered area at acquisition time.
+
+            Returns
+            -------
+            Future[GreyImage]
+                The scanned image.
+            """
+            if self._service is None:
+                self._service = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="jeol-acquisition")
+            return self._service.submit(self._acquire, area)
+
+        def scan_many(self, regions: _seq[ScanType], *, reorder=True) -> _iter[_tuple[int, GreyImage]]:
+            """
+            Scan a batch of regions.
+
+            The engine is only reconfigured when consecutive regions differ, and the original scan area is only restored
+            once the batch ends (or the iterator is closed). The next region is acquired while the current frame is
+            being consumed.
+
+            Parameters
+            ----------
+            regions: Sequence[ScanType]
+                The regions to scan.
+            reorder: bool
+                Whether to scan the regions in the order that minimises beam travel (defaults to True).
+
+            Yields
+            ------
+            tuple[int, GreyImage]
+                The index of each region (in the given sequence) and its scanned image.
+            """
+            return _scan_many(self, regions, reorder)
+
+        def _acquire(self, area: _None[ScanType]) -> GreyImage:
+            if area is not None and not _same_area(area, self._area):
+                self.scan_area = area
+            return self.scan()
+
         def using_connection(self, line_index: int, mode: TTLMode, source: TriggerSource, *,
                              active: float = None, delay: float = None, count: int = None) -> Connection:
             """
@@ -1,9 +1,14 @@
+import contextlib
+import functools
 import typing
 
 import h5py
 
 from . import controllers
+from ._async import client
 from ._base import Base
+from ._cache import Cached
+from ._snapshot import *
 from ._utils import *
 
 if ONLINE:
@@ -66,16 +71,21 @@ class Controller(Base):
         A dictionary mapping the relevant system name to the correct sub-controller.
     _zdf: int
         The zero defocus value.
-    _ht: HT3
+    _ht: Coalesced[HT3]
         The controller for the acceleration voltage.
-    _scan: Scan3
+    _scan: Coalesced[Scan3]
         The controller for the scan coils.
-    _eos: EOS3
-        The controller for the EOS system - note that this is the raw PyJEM controller.
-    _gun: GUN3
-        The controller for the gun system - note that this is the raw PyJEM controller.
-    _def: Def3
-        The controller for the deflector system - note that this is the raw PyJEM controller.
+    _eos: Coalesced[EOS3]
+        The controller for the EOS system - note that this is the raw PyJEM controller, wrapped to read
+        through the shared asynchronous client.
+    _gun: Coalesced[GUN3]
+        The controller for the gun system - note that this is the raw PyJEM controller, wrapped to read
+        through the shared asynchronous client.
+    _def: Coalesced[Def3]
+        The controller for the deflector system - note that this is the raw PyJEM controller, wrapped to read
+        through the shared asynchronous client.
+    _snapshot: Snapshot
+        The cached reader of the microscope state, used for exported metadata.
     """
 
     @Key
@@ -88,15 +98,7 @@ class Controller(Base):
         float
             The length of the merlin camera.
         """
-        ht = self._ht.GetHtValue()
-        cam = self._systems["EOS"].magnification
-        if ht == 80:
-            factor = 1.58
-        elif ht == 300:
-            factor = 1.64
-        else:
-            factor = 1
-        return factor * cam
+        return self._merlin_length(self._ht.GetHtValue(), self._systems["EOS"].magnification)
 
     @Key
     def field_of_view(self) -> float:
@@ -121,23 +123,7 @@ class Controller(Base):
         float
             The current defocus per bit for the microscope - this is based on the acceleration voltage.
         """
-        ht = self._ht.GetHtValue()
-        # <editor-fold desc="HT decider block">
-        if ht == 300_000:
-            return 0.7622
-        elif ht == 200_000:
-            return 0.8206
-        elif ht == 80_000:
-            return 0.75
-        elif ht == 60_000:
-            return 0.84
-        elif ht == 30_000:
-            return 0.8
-        elif ht == 0:
-            return 0.7
-        else:
-            return 0.75
-        # </editor-fold>
+        return self._per_bit(self._ht.GetHtValue())
 
     @Key
     def defocus(self) -> float:
@@ -163,10 +149,87 @@ class Controller(Base):
         float
             The convergence semi-angle.
         """
-        ht = self._ht.GetHtValue()
         apt = self._systems["Apertures"]
-        ty = apt.current.value
-        size = apt.size
+        return self._convergence(self._ht.GetHtValue(), apt.current.value, apt.size)
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """
+        Public access to the cached reader of the microscope state.
+
+        Returns
+        -------
+        Snapshot
+            The reader used for exported metadata. The stage position and OL fine lens are always read again, while the
+            remaining optics are cached for a short time, or until any setting is changed through the subsystems.
+        """
+        return self._snapshot
+
+    @property
+    def subsystems(self) -> SubSystems:
+        """
+        Public access to the subsystems of the microscope.
+
+        Returns
+        -------
+        SubSystems
+            A dictionary mapping the relevant system name to the correct sub-controller.
+        """
+        return self._systems.copy()
+
+    def __init__(self, detector: Detector, inserted: bool, lens: Lens, axis: Axis, /, zdf=38942, *,
+                 aperture: AptKind = None, beam: bool = None, magnification: int = None, camera_length: int = None,
+                 valve: bool = None, driver: Driver = None):
+        super().__init__("All")
+        self._systems: SubSystems = {
+            "Stage": controllers.Stage(axis, driver),
+            "Lenses": controllers.Lens(lens),
+            "Gun": controllers.Gun(),
+            "FEG": controllers.Feg(valve),
+            "EOS": controllers.Eos(magnification, camera_length),
+            "Detectors": controllers.Detector((detector, inserted)),
+            "Deflectors": controllers.Deflector(beam),
+            "Apertures": controllers.Aperture(aperture),
+        }
+        self._zdf = zdf
+        self._ht = client.wrap(HT3())
+        self._scan = client.wrap(Scan3())
+        self._eos = client.wrap(EOS3())
+        self._gun = client.wrap(GUN3())
+        self._def = client.wrap(Def3())
+        self._snapshot = self._make_snapshot()
+
+    @staticmethod
+    def _merlin_length(ht: float, magnification: int) -> float:
+        if ht == 80:
+            factor = 1.58
+        elif ht == 300:
+            factor = 1.64
+        else:
+            factor = 1
+        return factor * magnification
+
+    @staticmethod
+    def _per_bit(ht: float) -> float:
+        # <editor-fold desc="HT decider block">
+        if ht == 300_000:
+            return 0.7622
+        elif ht == 200_000:
+            return 0.8206
+        elif ht == 80_000:
+            return 0.75
+        elif ht == 60_000:
+            return 0.84
+        elif ht == 30_000:
+            return 0.8
+        elif ht == 0:
+            return 0.7
+        else:
+            return 0.75
+        # </editor-fold>
+
+    @staticmethod
+    def _convergence(ht: float, ty: int, size: int) -> float:
         mapping_300k = {
             (1, 1): 0.0447,
             (1, 2): 0.0341,
@@ -218,53 +281,37 @@ class Controller(Base):
         }
         return mapping.get(ht, mapping_def).get((ty, size), 0.0)
 
-    @property
-    def subsystems(self) -> SubSystems:
-        """
-        Public access to the subsystems of the microscope.
-
-        Returns
-        -------
-        SubSystems
-            A dictionary mapping the relevant system name to the correct sub-controller.
-        """
-        return self._systems.copy()
-
-    def __init__(self, detector: Detector, inserted: bool, lens: Lens, axis: Axis, /, zdf=38942, *,
-                 aperture: AptKind = None, beam: bool = None, magnification: int = None, camera_length: int = None,
-                 valve: bool = None, driver: Driver = None):
-        super().__init__("All")
-        self._systems: SubSystems = {
-            "Stage": controllers.Stage(axis, driver),
-            "Lenses": controllers.Lens(lens),
-            "Gun": controllers.Gun(),
-            "FEG": controllers.Feg(valve),
-            "EOS": controllers.Eos(magnification, camera_length),
-            "Detectors": controllers.Detector((detector, inserted)),
-            "Deflectors": controllers.Deflector(beam),
-            "Apertures": controllers.Aperture(aperture),
+    def _make_snapshot(self) -> Snapshot:
+        lenses, stage, apertures = self._systems["Lenses"], self._systems["Stage"], self._systems["Apertures"]
+        readers = {
+            "ht": self._ht.GetHtValue,
+            "magnification": lambda: int(self._eos.GetMagValue()[0]),
+            "camera_length": lambda: self._systems["EOS"].camera_length,
+            "spot_size": self._eos.GetSpotSize,
+            "rotation": self._scan.GetRotationAngle,
+            "aperture": lambda: (apertures.current.value, apertures.size),
+            "stage": stage.position,
+            "A1": self._gun.GetAnode1CurrentValue,
+            "A2": self._gun.GetAnode2CurrentValue,
         }
-        self._zdf = zdf
-        self._ht = HT3()
-        self._scan = Scan3()
-        self._eos = EOS3()
-        self._gun = GUN3()
-        self._def = Def3()
+        readers.update({f"lens/{lens.name}": functools.partial(lenses.read, lens) for lens in Lens})
+        readers.update({f"deflector/{name}": getattr(self._def, getter) for name, getter in DEFLECTORS.items()})
+        return Snapshot(readers, volatile={"stage", f"lens/{Lens.OL_FINE.name}"}, generation=Cached.written)
 
-    def export(self, file: str, scan_size: int, **merlin):
+    def export(self, file: typing.Union[str, h5py.Group], scan_size: int, **merlin):
         """
         Export the microscope parameters to a hdf5 file.
 
         Parameters
         ----------
-        file: str
-            The complete filepath.
+        file: str | Group
+            The complete filepath, or an open group to export into (such as a region group of a session file).
         scan_size: int
             The size of the scan.
         **merlin: Any
             The additional merlin parameters.
         """
-        with h5py.File(file, "a") as f:
+        with (h5py.File(file, "a") if isinstance(file, str) else contextlib.nullcontext(file)) as f:
             if not ONLINE:
                 return
             metadata_group = f.create_group('metadata')
@@ -272,65 +319,44 @@ class Controller(Base):
             for key, value in merlin.items():
                 metadata_group[key] = value
 
-            local_mag = int(self._eos.GetMagValue()[0])
+            state = self._snapshot.read()
+            local_mag = state["magnification"]
             local_fov = 10e-6 * (20000 / local_mag)
-            local_ht = self._ht.GetHtValue()
+            local_ht = state["ht"]
+            local_olf = state[f"lens/{Lens.OL_FINE.name}"]
+            x, y, z, x_tilt, y_tilt = state["stage"]
 
             metadata_group['magnification'] = local_mag
-            metadata_group['nominal_scan_rotation'] = self._scan.GetRotationAngle()
+            metadata_group['nominal_scan_rotation'] = state["rotation"]
             metadata_group['ht_value(V)'] = local_ht
-            metadata_group['nominal_camera_length(m)'] = self._systems["EOS"].camera_length * 1e-3
-            metadata_group['merlin_camera_length(m)'] = self.merlin_camera_length
-            metadata_group['spot_size'] = self._eos.GetSpotSize()
-            metadata_group['aperture_size'] = self._systems["Apertures"].size
+            metadata_group['nominal_camera_length(m)'] = state["camera_length"] * 1e-3
+            metadata_group['merlin_camera_length(m)'] = self._merlin_length(local_ht, local_mag)
+            metadata_group['spot_size'] = state["spot_size"]
+            metadata_group['aperture_size'] = state["aperture"][1]
             metadata_group['field_of_view(m)'] = local_fov
             metadata_group['step_size(m)'] = local_fov / scan_size
             metadata_group['zero_OLfine'] = self._zdf
+            metadata_group['current_OLfine'] = local_olf
 
-            with self._systems["Lenses"].switch_lens(Lens.OL_FINE):
-                metadata_group['current_OLfine'] = self._systems["Lenses"].value
-
-            metadata_group['A1_value_(kV)'] = self._gun.GetAnode1CurrentValue()
-            metadata_group['A2_value_(kV)'] = self._gun.GetAnode2CurrentValue()
+            metadata_group['A1_value_(kV)'] = state["A1"]
+            metadata_group['A2_value_(kV)'] = state["A2"]
 
-            with self._systems["Stage"].switch_axis(Axis.X):
-                metadata_group['x_pos(m)'] = self._systems["Stage"].pos * 1e-9
-                metadata_group['x_tilt(deg)'] = self._systems["Stage"].tilt
-            with self._systems["Stage"].switch_axis(Axis.Y):
-                metadata_group['y_pos(m)'] = self._systems["Stage"].pos * 1e-9
-                metadata_group['y_tilt(deg)'] = self._systems["Stage"].tilt
-            with self._systems["Stage"].switch_axis(Axis.Z):
-                metadata_group['z_pos(m)'] = self._systems["Stage"].pos * 1e-9
+            metadata_group['x_pos(m)'] = x * 1e-9
+            metadata_group['x_tilt(deg)'] = x_tilt
+            metadata_group['y_pos(m)'] = y * 1e-9
+            metadata_group['y_tilt(deg)'] = y_tilt
+            metadata_group['z_pos(m)'] = z * 1e-9
 
             lens_group = metadata_group.create_group('lens_values')
             for lens_type in Lens:
-                with self._systems["Lenses"].switch_lens(lens_type):
-                    lens_group[lens_type.name] = self._systems["Lenses"].value
+                lens_group[lens_type.name] = state[f"lens/{lens_type.name}"]
 
             defl_group = metadata_group.create_group('deflector_values')
-            defl_group['CLA1'] = self._def.GetCLA1()
-            defl_group['CLA2'] = self._def.GetCLA2()
-            defl_group['CLS'] = self._def.GetCLs()
-            defl_group['Correction'] = self._def.GetCorrection()
-            defl_group['GUNA1'] = self._def.GetGunA1()
-            defl_group['GUNA2'] = self._def.GetGunA2()
-            defl_group['ILS'] = self._def.GetILs()
-            defl_group['IS1'] = self._def.GetIS1()
-            defl_group['IS2'] = self._def.GetIS2()
-            defl_group['MAGADJUST'] = self._def.GetMagAdjust()
-            defl_group['OLS'] = self._def.GetOLs()
-            defl_group['OFFSET'] = self._def.GetOffset()
-            defl_group['PLA'] = self._def.GetPLA()
-            defl_group['ROTATION'] = self._def.GetRotation()
-            defl_group['SCAN1'] = self._def.GetScan1()
-            defl_group['SCAN2'] = self._def.GetScan2()
-            defl_group['SHIFBAL'] = self._def.GetShifBal()
-            defl_group['SPOTA'] = self._def.GetSpotA()
-            defl_group['STEMIS'] = self._def.GetStemIS()
-            defl_group['TILTBAL'] = self._def.GetTiltBal()
-            defl_group['ANGBAL'] = self._def.GetAngBal()
+            for name in DEFLECTORS:
+                defl_group[name] = state[f"deflector/{name}"]
 
             if int(local_ht) in {200000, 300000, 60000, 80000}:
-                metadata_group['defocus(nm)'] = self.defocus
-                metadata_group['defocus_per_bit(nm)'] = self.defocus_per_bit
-                metadata_group['convergence_semi-angle(rad)'] = self.convergence
+                per_bit = self._per_bit(local_ht)
+                metadata_group['defocus(nm)'] = per_bit * (local_olf - self._zdf)
+                metadata_group['defocus_per_bit(nm)'] = per_bit
+                metadata_group['convergence_semi-angle(rad)'] = self._convergence(local_ht, *state["aperture"])
@@ -0,0 +1,121 @@
+import threading
+import time
+import typing
+from typing import Any as _any, Callable as _callable, Dict as _dict, Set as _set
+
+from . import _async
+from ._async import AsyncClient
+from .. import load_settings, validation
+
+__all__ = ["DEFLECTORS", "Snapshot"]
+
+settings = load_settings("assets/config.json", snapshot_ttl=validation.examples.positive_float)
+
+DEFLECTORS = {
+    "CLA1": "GetCLA1", "CLA2": "GetCLA2", "CLS": "GetCLs", "Correction": "GetCorrection", "GUNA1": "GetGunA1",
+    "GUNA2": "GetGunA2", "ILS": "GetILs", "IS1": "GetIS1", "IS2": "GetIS2", "MAGADJUST": "GetMagAdjust",
+    "OLS": "GetOLs", "OFFSET": "GetOffset", "PLA": "GetPLA", "ROTATION": "GetRotation", "SCAN1": "GetScan1",
+    "SCAN2": "GetScan2", "SHIFBAL": "GetShifBal", "SPOTA": "GetSpotA", "STEMIS": "GetStemIS",
+    "TILTBAL": "GetTiltBal", "ANGBAL": "GetAngBal",
+}
+
+
+class Snapshot:
+    """
+    Concurrent, cached reader of a set of microscope readings.
+
+    Every reading is a function with no arguments, and all readings that need refreshing are requested at once through
+    an asynchronous client, so a snapshot takes about as long as its slowest reading. Readings are then cached for a
+    short time, so back-to-back snapshots (such as the metadata of consecutive grid squares) only repeat the requests
+    for readings that are expected to change between them. Every cached reading is dropped as soon as the watched
+    generation changes, so a setting changed through the controllers (such as the spot size or a deflector) is read
+    again by the next snapshot, rather than exported with its old value.
+
+    Attributes
+    ----------
+    _readers: dict[str, Callable[[], Any]]
+        The function to take each reading.
+    _volatile: set[str]
+        The readings that are never cached.
+    _ttl: float
+        The time in seconds that each cached reading is valid for.
+    _client: AsyncClient
+        The client that takes the readings.
+    _generation: Callable[[], int] | None
+        The function giving the watched generation.
+    _seen: int | None
+        The watched generation when the cached readings were taken.
+    _values: dict[str, Any]
+        The cached value of each reading.
+    _times: dict[str, float]
+        The (monotonic) time at which each cached reading was taken.
+    _lock: Lock
+        The lock guarding the cache.
+
+    Parameters
+    ----------
+    readers: dict[str, Callable[[], Any]]
+        The function to take each reading.
+    volatile: set[str]
+        The readings that are never cached.
+    ttl: float | None
+        The time in seconds that each cached reading is valid for. If None, uses the configured time.
+    client: AsyncClient | None
+        The client that takes the readings. If None, uses the shared client.
+    generation: Callable[[], int] | None
+        A function whose value changes whenever a cached reading may have changed (such as `Cached.written`). If None,
+        cached readings only expire with time.
+    """
+
+    def __init__(self, readers: _dict[str, _callable[[], _any]], volatile: typing.Iterable[str] = (),
+                 ttl: float = None, client: AsyncClient = None, generation: _callable[[], int] = None):
+        self._readers = readers
+        self._volatile: _set[str] = set(volatile)
+        self._ttl = settings["snapshot_ttl"] if ttl is None else ttl
+        self._client = _async.client if client is None else client
+        self._generation = generation
+        self._seen: typing.Optional[int] = None
+        self._values: _dict[str, _any] = {}
+        self._times: _dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def read(self, *, fresh=False) -> _dict[str, _any]:
+        """
+        Take a snapshot of every reading.
+
+        Parameters
+        ----------
+        fresh: bool
+            Whether to ignore the cache and take every reading again.
+
+        Returns
+        -------
+        dict[str, Any]
+            The value of every reading.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._generation is not None:
+                seen, self._seen = self._seen, self._generation()
+                if seen != self._seen:
+                    self._times.clear()
+            stale = [name for name in self._readers if fresh or name in self._volatile or name not in self._times
+                     or now - self._times[name] >= self._ttl]
+        readings = self._client.read_all({name: self._readers[name] for name in stale})
+        with self._lock:
+            self._values.update(readings)
+            self._times.update(dict.fromkeys(readings, now))
+            return {name: self._values[name] for name in self._readers}
+
+    def invalidate(self, *names: str):
+        """
+        Drop cached readings, so they are taken again by the next snapshot.
+
+        Parameters
+        ----------
+        *names: str
+            The readings to drop. If none are given, drops every reading.
+        """
+        with self._lock:
+            for name in (names or tuple(self._times)):
+                self._times.pop(name, None)
@@ -1,13 +1,14 @@
 import abc
 import enum
 import functools
+import threading
 import time
 import typing
 from typing import Tuple as _tuple
 from .. import validation, load_settings
 
 __all__ = [
-    "ONLINE", "QD", "Key",
+    "ONLINE", "QD", "Key", "Settle", "settle",
     "ScanType", "FullScan", "AreaScan",
     "TriggerSource", "TTLInput", "PixelClock", "TTLOutput",
     "AptKind", "ImagingMode", "Detector", "Lens", "Axis", "Driver", "TTLMode", "EdgeType"
@@ -21,6 +22,149 @@ configuration = load_settings("assets/config.json", microscope=validation.exampl
 ONLINE = configuration["microscope"]
 QD = configuration["engine_type"]
 
+if ONLINE:
+    # the installed PyJEM shares one httplib2 client between every thread, so route it through the pooled transport
+    import PyJEM.base
+    from .PyJEM import base as _transport
+
+    if not _transport.install(PyJEM.base):
+        print(" - WARNING : the installed PyJEM has no shared httplib2 client, so its requests are not pooled and are "
+              "not thread-safe")
+
+
+class Settle:
+    """
+    Scheduler of the settling time of hardware parameters.
+
+    Changing a parameter that needs time to settle does not block. Instead, the time at which the parameter is ready is
+    recorded, so parameters changed back to back settle in parallel. An action that depends on the hardware having
+    settled (such as a scan) waits only for the latest deadline it depends on.
+
+    Attributes
+    ----------
+    _deadlines: dict[str, float]
+        The (monotonic) time at which each unsettled parameter is ready.
+    _lock: Lock
+        The lock guarding the deadlines and statistics.
+    _scheduled: float
+        The total settling time requested, in seconds. This is the time that would be spent sleeping inline.
+    _waited: float
+        The total time spent waiting for parameters to settle, in seconds.
+    """
+
+    @property
+    def scheduled(self) -> float:
+        """
+        Public access to the total settling time requested.
+
+        Returns
+        -------
+        float
+            The time in seconds.
+        """
+        return self._scheduled
+
+    @property
+    def waited(self) -> float:
+        """
+        Public access to the total time spent waiting.
+
+        Returns
+        -------
+        float
+            The time in seconds.
+        """
+        return self._waited
+
+    @property
+    def saved(self) -> float:
+        """
+        Public access to the settling time that was not spent blocking.
+
+        Returns
+        -------
+        float
+            The time in seconds.
+        """
+        return self._scheduled - self._waited
+
+    def __init__(self):
+        self._deadlines: typing.Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._scheduled = 0.0
+        self._waited = 0.0
+
+    def mark(self, name: str, delay: float):
+        """
+        Record that a parameter has changed.
+
+        Parameters
+        ----------
+        name: str
+            The parameter name.
+        delay: float
+            The time in seconds the parameter takes to settle.
+        """
+        if not delay:
+            return
+        ready = time.monotonic() + delay
+        with self._lock:
+            self._deadlines[name] = max(self._deadlines.get(name, 0.0), ready)
+            self._scheduled += delay
+
+    def remaining(self, *names: str) -> float:
+        """
+        Find the time until some parameters have settled.
+
+        Parameters
+        ----------
+        *names: str
+            The parameter names. If none are given, uses every parameter.
+
+        Returns
+        -------
+        float
+            The time in seconds until the latest deadline (0 if every parameter has settled).
+        """
+        now = time.monotonic()
+        with self._lock:
+            for name, ready in tuple(self._deadlines.items()):
+                if ready <= now:
+                    del self._deadlines[name]
+            deadlines = [self._deadlines.get(name, now) for name in names] if names else self._deadlines.values()
+            return max((ready - now for ready in deadlines), default=0.0)
+
+    def wait(self, *names: str) -> float:
+        """
+        Block until some parameters have settled.
+
+        Parameters
+        ----------
+        *names: str
+            The parameter names. If none are given, waits for every parameter.
+
+        Returns
+        -------
+        float
+            The time in seconds spent waiting.
+        """
+        delay = self.remaining(*names)
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self._waited += delay
+        return delay
+
+    def reset(self):
+        """
+        Reset the statistics.
+        """
+        with self._lock:
+            self._scheduled = self._waited = 0.0
+
+
+settle = Settle()
+
 
 class Switch(typing.Generic[R]):
     """
@@ -38,18 +182,20 @@ class Switch(typing.Generic[R]):
     _switch: Callable[[R], None]
         The function to use to switch the value.
     _delay: float
-        The delay in seconds between switching to normal control flow being resumed.
+        The time in seconds the value takes to settle after switching.
+    _name: str
+        The name the value is scheduled under.
     """
 
-    def __init__(self, old: R, switch: typing.Callable[[R], None], delay: float):
+    def __init__(self, old: R, switch: typing.Callable[[R], None], delay: float, name: str = ""):
         self._old = old
         self._switch = switch
         self._delay = delay
+        self._name = name
 
     def __call__(self, new: R):
         self._switch(new)
-        if self._delay:
-            time.sleep(self._delay)
+        settle.mark(self._name, self._delay)
 
     def __enter__(self) -> None:
         return
@@ -80,7 +226,8 @@ class Key(typing.Generic[Inst, R]):
     _switch: Switch[R] | None
         The switcher used to control the value.
     _delay: float
-        The delay in seconds between switching the value.
+        The time in seconds the value takes to settle after it is set. Setting the value schedules the settling time
+        rather than sleeping, and reading the value never waits.
     """
 
     @property
@@ -112,19 +259,34 @@ class Key(typing.Generic[Inst, R]):
 
     def __get__(self, instance: Inst, owner: typing.Type[Inst]) -> R:
         r_val = self._getter(instance)
-        if self._delay:
-            time.sleep(self._delay)
         if self._setter is not None:
-            self._switch = Switch(r_val, functools.partial(self._setter, instance), self._delay)
+            self._switch = Switch(r_val, functools.partial(self._setter, instance), self._delay,
+                                  self.scheduled_as(instance))
         return r_val
 
     def __set__(self, instance: Inst, value: R) -> None:
         if self._setter is None:
             raise ValueError(f"Property {self._name} is read-only")
         self._setter(instance, value)
-        if self._delay:
-            time.sleep(self._delay)
-        self._switch = Switch(value, functools.partial(self._setter, instance), self._delay)
+        name = self.scheduled_as(instance)
+        settle.mark(name, self._delay)
+        self._switch = Switch(value, functools.partial(self._setter, instance), self._delay, name)
+
+    def scheduled_as(self, instance: Inst) -> str:
+        """
+        Find the name the value of an instance is scheduled under.
+
+        Parameters
+        ----------
+        instance: Inst
+            The instance bound to this property.
+
+        Returns
+        -------
+        str
+            The name of the parameter, qualified by the type of the instance.
+        """
+        return f"{type(instance).__name__}.{self._name}"
 
     def setter(self, fn: typing.Callable[[Inst, R], None]) -> "Key":
         """
@@ -1,4 +1,6 @@
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 
@@ -92,6 +94,9 @@ class Apt3Offline:
 apt_kind = validation.Pipeline.enum(AptKind)
 
 
+writes = {"SetExpSize": "GetExpSize"}
+
+
 class Controller(Base):
     """
     Concrete controller for the apertures.
@@ -162,7 +167,7 @@ class Controller(Base):
 
     def __init__(self, starting: AptKind = None):
         super().__init__("Apertures")
-        self._controller = Apt3Offline()
+        self._controller = Cached(client.wrap(Apt3Offline()), writes)
         if starting is not None:
             self.current = starting
         _ = self.current, self.position, self.size  # this will prime the keys with an instance
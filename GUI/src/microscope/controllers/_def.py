@@ -1,4 +1,6 @@
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 
@@ -112,6 +114,9 @@ class Def3Offline:
         pass
 
 
+writes = {"SetBeamBlank": "GetBeamBlank"}
+
+
 class Controller(Base):
     """
     Concrete controller for the microscope deflector.
@@ -165,9 +170,9 @@ class Controller(Base):
     def __init__(self, beam_status: bool = None):
         super().__init__("Deflectors")
         if ONLINE:
-            self._controller = Def3()
+            self._controller = Cached(client.wrap(Def3()), writes)
         else:
-            self._controller = Def3Offline()
+            self._controller = Cached(client.wrap(Def3Offline()), writes)
         if beam_status is not None:
             self.blanked = not beam_status
         _ = self.value, self.blanked  # this will prime the keys with an instance
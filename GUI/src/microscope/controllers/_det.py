@@ -1,6 +1,8 @@
 from typing import Tuple as _tuple
 
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 
@@ -104,6 +106,9 @@ class Detector3Offline:
 detector = validation.Pipeline.enum(Detector)
 
 
+writes = {"SetPosition": "GetPosition", "SetBrt": "GetBrt", "SetCont": "GetCont"}
+
+
 class Controller(Base):
     """
     Concrete controller for the detectors in the microscope.
@@ -192,9 +197,9 @@ class Controller(Base):
     def __init__(self, controlling: _tuple[Detector, bool]):
         super().__init__("Detectors")
         if ONLINE:
-            self._controller = Detector3()
+            self._controller = Cached(client.wrap(Detector3()), writes)
         else:
-            self._controller = Detector3Offline()
+            self._controller = Cached(client.wrap(Detector3Offline()), writes)
         self.current = controlling[0]
         self.inserted = controlling[1]
         _ = self.brightness, self.contrast  # this will prime the keys with an instance
@@ -1,4 +1,6 @@
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 from typing import Tuple as _tuple
@@ -132,9 +134,9 @@ class Controller(Base):
     def __init__(self, curr_mag: int = None, curr_length: int = None):
         super().__init__("EOS")
         if ONLINE:
-            self._controller = EOS3()
+            self._controller = Cached(client.wrap(EOS3()))
         else:
-            self._controller = EOS3Offline()
+            self._controller = Cached(client.wrap(EOS3Offline()))
         self._vals = mag_vals.values
         if curr_mag is not None:
             self.magnification = curr_mag
@@ -1,3 +1,4 @@
+from .._async import client
 from .._base import Base
 from .._utils import *
 from ... import validation
@@ -169,9 +170,9 @@ class Controller(Base):
     def __init__(self, valve: bool = None):
         super().__init__("FEG")
         if ONLINE:
-            self._controller = FEG3()
+            self._controller = client.wrap(FEG3())
         else:
-            self._controller = FEG3Offline()
+            self._controller = client.wrap(FEG3Offline())
         if valve is not None:
             self.valve = valve
         _ = self.ready, self.emission, self.valve  # this will prime the keys with an instance
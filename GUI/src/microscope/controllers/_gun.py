@@ -1,3 +1,4 @@
+from .._async import client
 from .._base import Base
 from .._utils import *
 
@@ -72,7 +73,7 @@ class Controller(Base):
     def __init__(self):
         super().__init__("Gun")
         if ONLINE:
-            self._controller = GUN3()
+            self._controller = client.wrap(GUN3())
         else:
-            self._controller = GUN3Offline()
+            self._controller = client.wrap(GUN3Offline())
         _ = self.filament, self.emission  # this will prime the keys with an instance
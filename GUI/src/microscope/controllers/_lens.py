@@ -1,4 +1,6 @@
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 
@@ -100,6 +102,18 @@ class Lens3Offline:
 
 
 lens = validation.Pipeline.enum(Lens)
+getters = {
+    Lens.CL1: "GetCL1", Lens.CL2: "GetCL2", Lens.CL3: "GetCL3", Lens.CM: "GetCM", Lens.OL_COARSE: "GetOLc",
+    Lens.OL_FINE: "GetOLf", Lens.OM1: "GetOM", Lens.OM2: "GetOM2", Lens.IL1: "GetIL1", Lens.IL2: "GetIL2",
+    Lens.IL3: "GetIL3", Lens.IL4: "GetIL4", Lens.PL1: "GetPL1", Lens.PL2: "GetPL2", Lens.PL3: "GetPL3",
+    Lens.FL_COARSE: "GetFLc", Lens.FL_FINE: "GetFLf",
+}
+
+
+writes = {
+    "SetCL3": "GetCL3", "SetOLc": "GetOLc", "SetOLf": "GetOLf", "SetOM": "GetOM", "SetFLc": "GetFLc",
+    "SetFLf": "GetFLf",
+}
 
 
 class Controller(Base):
@@ -141,40 +155,7 @@ class Controller(Base):
         int
             the value of the lens being controlled.
         """
-        if self._current == Lens.CL1:
-            return self._controller.GetCL1()
-        elif self._current == Lens.CL2:
-            return self._controller.GetCL2()
-        elif self._current == Lens.CL3:
-            return self._controller.GetCL3()
-        elif self._current == Lens.CM:
-            return self._controller.GetCM()
-        elif self._current == Lens.OL_COARSE:
-            return self._controller.GetOLc()
-        elif self._current == Lens.OL_FINE:
-            return self._controller.GetOLf()
-        elif self._current == Lens.OM1:
-            return self._controller.GetOM()
-        elif self._current == Lens.OM2:
-            return self._controller.GetOM2()
-        elif self._current == Lens.IL1:
-            return self._controller.GetIL1()
-        elif self._current == Lens.IL2:
-            return self._controller.GetIL2()
-        elif self._current == Lens.IL3:
-            return self._controller.GetIL3()
-        elif self._current == Lens.IL4:
-            return self._controller.GetIL4()
-        elif self._current == Lens.PL1:
-            return self._controller.GetPL1()
-        elif self._current == Lens.PL2:
-            return self._controller.GetPL2()
-        elif self._current == Lens.PL3:
-            return self._controller.GetPL3()
-        elif self._current == Lens.FL_COARSE:
-            return self._controller.GetFLc()
-        elif self._current == Lens.FL_FINE:
-            return self._controller.GetFLf()
+        return self.read(self._current)
 
     @value.setter
     def value(self, value: int):
@@ -216,10 +197,26 @@ class Controller(Base):
     def __init__(self, current: Lens):
         super().__init__("Lenses")
         if ONLINE:
-            self._controller = Lens3()
+            self._controller = Cached(client.wrap(Lens3()), writes)
         else:
-            self._controller = Lens3Offline()
+            self._controller = Cached(client.wrap(Lens3Offline()), writes)
         self.current = current
         _ = self.value  # this will prime the keys with an instance
 
+    def read(self, which: Lens) -> int:
+        """
+        Read the value of any lens, without switching the controlling lens.
+
+        Parameters
+        ----------
+        which: Lens
+            The lens to read.
+
+        Returns
+        -------
+        int
+            The value of the lens.
+        """
+        return getattr(self._controller, getters[which])()
+
     switch_lens = current.switch
@@ -1,6 +1,8 @@
 import typing
 
+from .._async import client
 from .._base import Base
+from .._cache import Cached
 from .._utils import *
 from ... import validation
 from typing import Tuple as _tuple
@@ -282,14 +284,25 @@ class Controller(Base):
     def __init__(self, controlling: Axis, active_driver: Driver = None):
         super().__init__("Stage")
         if ONLINE:
-            self._controller = Stage3()
+            self._controller = Cached(client.wrap(Stage3()))
         else:
-            self._controller = Stage3Offline()
+            self._controller = Cached(client.wrap(Stage3Offline()))
         self.axis = controlling
         if active_driver is not None:
             self.driver = active_driver
         _ = self.pos, self.tilt, self.driver  # this will prime the keys with an instance
 
+    def position(self) -> _tuple[int, int, int, int, int]:
+        """
+        Read the position and tilt of every axis in one request, without switching the controlling axis.
+
+        Returns
+        -------
+        tuple[int, int, int, int, int]
+            The x, y, z position of the stage; along with the x, y tilt.
+        """
+        return tuple(self._controller.GetPos()[:5])
+
     def relative_movement(self, by: int):
         """
         Perform a relative movement in the specified axis.
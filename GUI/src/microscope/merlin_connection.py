@@ -2,9 +2,10 @@ import socket
 import select
 import sys
 import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.cm as cm
 import numpy as np
 import struct
 from queue import Queue
@@ -94,13 +95,141 @@ class ImageHeader:
         return
 
 
+class MIBStream:
+    ''' Incremental decoder for the MERLIN data channel.
+
+    Every message on the data channel is framed as b'MPX,<10 digit length>' followed by <length> bytes (starting
+    with a comma). The first message of an acquisition is the 'HDR' acquisition header, every following one is an
+    'MQ1' frame. Bytes are read with recv_into straight into a preallocated buffer, and each frame is handed out as a
+    numpy view onto that buffer - so a yielded frame is only valid until the next frame is requested (copy it if it
+    has to be kept). The first frame header is parsed once and its layout (offset, shape, dtype) is reused for the
+    rest of the acquisition. '''
+
+    PREFIX = 14  # len(b'MPX,0000000000')
+
+    DTYPES = {b'U08': np.dtype('>u1'), b'U16': np.dtype('>u2'), b'U32': np.dtype('>u4'), b'R64': np.dtype('>u8')}
+
+    def __init__(self, sock, capacity=1 << 24):
+
+        self.sock = sock
+        self._buffer = np.empty(capacity, dtype=np.uint8)
+        self._view = memoryview(self._buffer)
+        self._read = 0
+        self._write = 0
+
+        self.Header = b''
+        self.frameHeader = None
+        self._layout = None
+
+    def reset(self):
+        ''' Forget any buffered bytes and the cached frame layout, ready for a new acquisition '''
+
+        self._read = self._write = 0
+        self.Header = b''
+        self.frameHeader = None
+        self._layout = None
+
+    def _available(self):
+        return self._write - self._read
+
+    def _reserve(self, needed):
+        # Make sure 'needed' unread bytes fit in the buffer: first by moving the unread tail to the front, and only if
+        # that is not enough by reallocating (a single frame larger than the buffer)
+        pending = self._available()
+        if self._read + needed <= self._buffer.size:
+            return
+        if needed > self._buffer.size:
+            grown = np.empty(max(needed, 2 * self._buffer.size), dtype=np.uint8)
+            grown[:pending] = self._buffer[self._read:self._write]
+            self._buffer = grown
+            self._view = memoryview(self._buffer)
+        else:
+            self._buffer[:pending] = self._buffer[self._read:self._write]
+        self._read, self._write = 0, pending
+
+    def _fill(self, needed, timeout):
+        # Block until at least 'needed' unread bytes are buffered. Returns False if the channel went quiet (timeout)
+        # or was closed before that happened
+        self._reserve(needed)
+        while self._available() < needed:
+            ready = select.select([self.sock], [], [], timeout)
+            if not ready[0]:
+                return False
+            n = self.sock.recv_into(self._view[self._write:])
+            if n == 0:
+                return False
+            self._write += n
+        return True
+
+    def _message(self, timeout):
+        # Returns the (start, stop) of the next message payload inside the buffer (leading comma stripped)
+        if not self._fill(self.PREFIX, timeout):
+            return None
+        prefix = self._buffer[self._read:self._read + self.PREFIX].tobytes()
+        if prefix[:4] != b'MPX,':
+            raise ValueError(f'Lost MPX framing on the data channel (got {prefix!r})')
+        length = int(prefix[4:])
+        if not self._fill(self.PREFIX + length, timeout):
+            return None
+        start = self._read + self.PREFIX + 1
+        stop = self._read + self.PREFIX + length
+        self._read = stop
+        return start, stop
+
+    def _parse_layout(self, start, stop):
+        header = ImageHeader(self._buffer[start:min(stop, start + 768)].tobytes())
+        params = header.params
+        dtype = self.DTYPES.get(params['dataType'].strip())
+        if dtype is None:
+            raise ValueError(f"Unknown MIB data type {params['dataType']!r}")
+        if params['dataType'].strip() == b'R64':
+            # raw (packed) frames are handed out as their 64-bit words - unpacking depends on the counter depth
+            shape = ((stop - start - params['Offset']) // dtype.itemsize,)
+        else:
+            shape = (params['NpixY'], params['NpixX'])
+        self.frameHeader = header
+        self._layout = (params['Offset'], shape, dtype)
+
+    def frames(self, timeout=1400.0, n_frames=None):
+        ''' Yield numpy views of each frame as it arrives, until 'n_frames' frames have been decoded or the channel
+        is quiet for longer than 'timeout' (in milliseconds) '''
+
+        Tout = 1.2 * timeout / 1000.
+        count = 0
+        while n_frames is None or count < n_frames:
+            span = self._message(Tout)
+            if span is None:
+                return
+            start, stop = span
+            kind = self._buffer[start:start + 3].tobytes()
+            if kind == b'HDR':
+                self.Header = self._buffer[start:stop].tobytes()
+                continue
+            if kind != b'MQ1':
+                continue
+            if self._layout is None:
+                self._parse_layout(start, stop)
+            offset, shape, dtype = self._layout
+            size = int(np.prod(shape)) * dtype.itemsize
+            yield np.frombuffer(self._view[start + offset:start + offset + size], dtype=dtype).reshape(shape)
+            count += 1
+
+
 class MERLIN_connection:
 
+    STATUS_IDLE = 0
+
+    # Variable tables of every (host, variable file) pair already read this session. Reconnecting to the same
+    # detector reuses the table instead of sweeping every variable again; SETs keep it up to date
+    tables = {}
+
     def __init__(self, hostname='diamrd', ipaddress='000', channel='cmd',
-                 varFile=r'C:\Users\Merlin\Desktop\microscope_control_private\merlin-tcp-connection-master_python3\connection\ListOfCurrentTCPvariables_dev.txt'):
+                 varFile=r'C:\Users\Merlin\Desktop\microscope_control_private\merlin-tcp-connection-master_python3\connection\ListOfCurrentTCPvariables_dev.txt', port=None):
 
         self.varsTCPcontrolled = {}
         self.hostname = hostname
+        # Bytes read from the command channel that are not yet part of a consumed reply
+        self._pending = bytearray()
 
         self.Header = ''
 
@@ -116,7 +245,8 @@ class MERLIN_connection:
 
         self.readonly = ['TEMPERATURE', 'DETECTORSTATUS', 'TriggerInLVDS', 'TriggerInTTL', 'SOFTWAREVERSION']
 
-        # Port number is hardcoded :S
+        # Port number is hardcoded :S (unless an explicit port, such as a local stand-in server, is given)
+        override = port
         port = 0
 
         if channel == 'cmd':
@@ -133,6 +263,9 @@ class MERLIN_connection:
                 print(' - ERROR : Trying to correct to the wrong channel. No rata or command')
                 sys.exit()
 
+        if override is not None:
+            port = int(override)
+
         # Creating a socket and connection to MERLIN host machine
         print(' - INFO : Connecting  to ', self.hostname)
 
@@ -163,12 +296,20 @@ class MERLIN_connection:
             sys.exit()
 
         # Creating a local copy of all the 'at this point' default values of Variables
-        self._get_list_of_vars(varFile)
+        self.tableKey = (self.remote_ip, varFile)
+        cached = MERLIN_connection.tables.get(self.tableKey)
+        if cached is None:
+            self._get_list_of_vars(varFile)
+        else:
+            self.listofTCPvars = list(cached[0])
 
         self.ongoingAcquisition = True
         # Putting all the values I get
         if channel == 'cmd':
-            self.updateValues()
+            if cached is None:
+                self.updateValues()
+            else:
+                self.varsTCPcontrolled = cached[1]
 
     def __del__(self):
 
@@ -189,13 +330,10 @@ class MERLIN_connection:
                 if re.search('##', line): return
 
     def updateValues(self):
-        for var in self.listofTCPvars:
-            # print ' - INFO : getting ', var
-            # sleep(1)
-            if var == 'PixelMask': continue
-            if 'UseAcquisitionHeaders' in var: continue
-
-            self.varsTCPcontrolled[var] = self.getVariable(var, PRINT='OFF')
+        # All the GETs are pipelined, so this is a single round trip rather than one per variable
+        wanted = [var for var in self.listofTCPvars if var != 'PixelMask' and 'UseAcquisitionHeaders' not in var]
+        self.varsTCPcontrolled.update(self.get_many(wanted))
+        MERLIN_connection.tables[self.tableKey] = (tuple(self.listofTCPvars), self.varsTCPcontrolled)
 
         print(' - INFO : ')
         print(' - INFO : These are all the MERLIN default values ')
@@ -231,8 +369,7 @@ class MERLIN_connection:
             fullcommand = 'MPX,00' + str_lenght + endofcomdn
             # 0000000026,GET,NUMFRAMESTOACQUIRE'
             if PRINT == 'ON': print(' - INFO : sending command ', fullcommand)
-            self.sock.send(fullcommand.encode('utf-8'))
-            data = self.sock.recv(1024).decode('utf-8', 'ignore')
+            data = self._ask(fullcommand, 'GET', varName)
             if PRINT == 'ON':
                 print(' - INFO : receiving', data)
             print('TESTING:', data)
@@ -272,8 +409,7 @@ class MERLIN_connection:
             fullcommand = 'MPX,00' + lenght + endofcomdn
             # 0000000026,GET,NUMFRAMESTOACQUIRE'
             if PRINT == 'ON': print(' - INFO : sending command Float ', fullcommand)
-            self.sock.send(fullcommand.encode('utf-8'))
-            data = self.sock.recv(1024).decode('utf-8', 'ignore')
+            data = self._ask(fullcommand, 'GET', varName)
             if PRINT == 'ON': print(' - INFO : receiving', data)
             var = float(data.split(',')[4])
             res = 0 # int(data.split(',')[5])
@@ -302,8 +438,7 @@ class MERLIN_connection:
             fullcommand = 'MPX,00' + lenght + endofcomdn
             # 0000000026,GET,NUMFRAMESTOACQUIRE'
             if PRINT == 'ON': print(' - INFO : sending command String', fullcommand)
-            self.sock.send(fullcommand.encode('utf-8'))
-            data = self.sock.recv(1024).decode('utf-8', 'ignore')
+            data = self._ask(fullcommand, 'GET', varName)
             if PRINT == 'ON': print(' - INFO : receiving', data)
             var = data.split(',')[4]
             res = 0 # int(data.split(',')[5])
@@ -332,8 +467,7 @@ class MERLIN_connection:
             fullcommand = 'MPX,00' + lenght + endofcomdn
             # 0000000026,GET,NUMFRAMESTOACQUIRE'
             if 'ON' in PRINT: print(' - INFO : sending command String', fullcommand)
-            self.sock.send(fullcommand.encode('utf-8'))
-            data = self.sock.recv(1024).decode('utf-8', 'ignore')
+            data = self._ask(fullcommand, 'GET', varName)
             if 'ON' in PRINT: print(' - INFO : receiving', data)
             pre_var = data.split(',')[4]
 
@@ -398,10 +532,9 @@ class MERLIN_connection:
                 fullcommand = 'MPX,000' + lenght + endofcomdn
                 # print ' - INFO : sending command ' , fullcommand
 
-                self.sock.send(fullcommand.encode('utf-8'))
                 print(' - INFO : sending command ', fullcommand)
 
-                data = self.sock.recv(1024).decode('utf-8', 'ignore')
+                data = self._ask(fullcommand, 'SET', varName)
                 print(' - INFO : receiving', data)
 
                 res = 0 #int(data.split(',')[4])
@@ -417,19 +550,165 @@ class MERLIN_connection:
                     if ('UseAcquisitionHeaders' not in varName) or 'FILECOUNTER' not in varName:
                         self.varsTCPcontrolled[varName] = self.getVariable(varName)
 
+    @staticmethod
+    def _frame(type_cmd, body):
+        body = ',' + type_cmd + ',' + body
+        return ('MPX,%010d' % len(body) + body).encode('utf-8')
+
+    def _reply(self):
+        # Read the next framed reply (b'MPX,<length>,<reply>') from the command channel. Any bytes received past the
+        # end of the reply stay in the connection's buffer for the next read
+        buffer = self._pending
+        while True:
+            start = buffer.find(b'MPX,')
+            sep = buffer.find(b',', start + 4) if start >= 0 else -1
+            if sep >= 0 and len(buffer) >= sep + int(buffer[start + 4:sep]):
+                stop = sep + int(buffer[start + 4:sep])
+                reply = buffer[sep + 1:stop].decode('utf-8', 'ignore').split(',')
+                del buffer[:stop]
+                return reply
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError('Merlin closed the command channel')
+            buffer += chunk
+
+    def _replies(self, expected):
+        ''' Read the replies to the commands in 'expected' - (type, name) pairs in the order they were sent - and
+        return them in the same order. A reply that does not match the next expected command was left over from an
+        earlier exchange, so it is dropped rather than taken as the answer '''
+
+        replies = []
+        for type_cmd, name in expected:
+            while True:
+                reply = self._reply()
+                if len(reply) > 1 and reply[0] == type_cmd and reply[1].upper() == name.upper():
+                    break
+                print(' - WARNING : Dropping unexpected reply', reply)
+            replies.append(reply)
+        return replies
+
+    def _exchange(self, type_cmd, body):
+        # Send a single framed command and return its (matched) reply
+        self.sock.sendall(self._frame(type_cmd, body))
+        return self._replies([(type_cmd, body.split(',')[0])])[0]
+
+    def _ask(self, fullcommand, type_cmd, name):
+        # Send a hand-framed legacy command and return its matched reply, laid out as the raw 'MPX,<length>,...'
+        # string that the legacy parsers index into
+        self.sock.sendall(fullcommand.encode('utf-8'))
+        reply = self._replies([(type_cmd, name)])[0]
+        return 'MPX,' + str(len(reply)) + ',' + ','.join(reply)
+
+    def drain(self):
+        ''' Throw away every reply that is buffered or already waiting on the command channel '''
+
+        self._pending.clear()
+        while select.select([self.sock], [], [], 0)[0]:
+            if not self.sock.recv(4096):
+                raise ConnectionError('Merlin closed the command channel')
+
+    def command(self, cmd, PRINT='OFF'):
+        ''' Send a CMD (such as SCANSTARTRECORD) and read its reply. Returns the response code (0 is success) '''
+
+        reply = self._exchange('CMD', cmd)
+        if PRINT == 'ON': print(' - INFO : receiving', reply)
+        try:
+            res = int(reply[-1]) if len(reply) > 2 else 0
+        except ValueError:
+            res = 0
+        if res != 0:
+            print(' - ERROR : Something has gone badly running', cmd)
+            if res == 1: print(' - ERROR : The system is busy ')
+            if res == 2: print(' - ERROR : The Command was not recognised ')
+            if res == 3: print(' - ERROR : The Parameter was out of range ')
+        return res
+
+    def _convert(self, var, raw):
+        if var in self.listofstringvars:
+            return raw
+        elif var in self.listofArrayvars:
+            return [float(item) if '.' in item else int(item) for item in raw.split('   ') if item != '']
+        try:
+            if (var in self.listofFloatVars) or (var in self.listofScientific) or (var in self.readonly):
+                return float(raw)
+            return int(float(raw))
+        except ValueError:
+            return raw
+
+    def get_many(self, variables, PRINT='OFF'):
+        ''' Pipeline a GET for every variable and return {variable: value}, in one network round trip '''
+
+        variables = list(dict.fromkeys(var for var in variables if var in self.listofTCPvars))
+        if not variables:
+            return {}
+        self.sock.sendall(b''.join(self._frame('GET', var) for var in variables))
+        values = {}
+        for var, reply in zip(variables, self._replies([('GET', var) for var in variables])):
+            if PRINT == 'ON': print(' - INFO : receiving', reply)
+            if len(reply) > 2:
+                values[var] = self._convert(var, reply[2])
+        return values
+
+    def set_many(self, values, readback=False, PRINT='OFF'):
+        ''' Pipeline a SET for every (variable, value) pair and match the replies back to them. Unlike setValue the
+        detector is not asked for the value again unless 'readback' is set - the local table takes the requested
+        value instead. Returns {variable: response code} '''
+
+        values = {var: val for var, val in values.items() if var in self.listofTCPvars and var not in self.readonly}
+        if not values:
+            return {}
+        self.sock.sendall(b''.join(self._frame('SET', var + ',' + str(val)) for var, val in values.items()))
+        if PRINT == 'ON': print(' - INFO : sending', len(values), 'SET commands')
+
+        codes = {}
+        for var, reply in zip(values, self._replies([('SET', var) for var in values])):
+            if PRINT == 'ON': print(' - INFO : receiving', reply)
+            try:
+                codes[var] = int(reply[-1]) if len(reply) > 2 else 0
+            except ValueError:
+                codes[var] = 0
+        for var, res in codes.items():
+            if res != 0:
+                print(' - ERROR : Something has gone badly setting', var)
+                if res == 1: print(' - ERROR : The system is busy ')
+                if res == 2: print(' - ERROR : The Command was not recognised ')
+                if res == 3: print(' - ERROR : The Paramaeter was out of range ')
+        done = [var for var in values if codes.get(var, 0) == 0]
+        if readback:
+            self.varsTCPcontrolled.update(self.get_many(done))
+        else:
+            self.varsTCPcontrolled.update((var, values[var]) for var in done)
+        return codes
+
+    def detectorStatus(self):
+        ''' Single DETECTORSTATUS query: 0 is idle, anything else means the detector is armed or acquiring '''
+
+        reply = self._exchange('GET', 'DETECTORSTATUS')
+        return int(float(reply[2]))
+
+    def waitForStatus(self, done, timeout=10.0, poll=0.005):
+        ''' Poll DETECTORSTATUS until done(status) is true, and return how long (in seconds) that took. Raises a
+        TimeoutError if it has not happened within 'timeout' seconds '''
+
+        start = time.perf_counter()
+        while True:
+            status = self.detectorStatus()
+            elapsed = time.perf_counter() - start
+            if done(status):
+                return elapsed
+            if elapsed > timeout:
+                raise TimeoutError(f'Merlin still in status {status} after {timeout}s')
+            time.sleep(poll)
+
     def startAcq(self):
 
-        fullcommand = 'MPX,21,CMD,STARTACQUISITION'
-        self.sock.send(fullcommand.encode('utf-8'))
-        # data = self.sock.recv(1024).decode('utf-8', 'ignore')
-        # print(' - INFO : receiving', data)
+        return self.command('STARTACQUISITION')
 
     def MPX_CMD(self, type_cmd='GET', cmd='DETECTORSTATUS'):
-        length = len(cmd)
-        tmp = 'MPX,00000000' + str(length + 5) + ',' + type_cmd + ',' + cmd
-        print(tmp)
-        self.sock.send(tmp.encode('utf-8'))
-        return
+        ''' Send a framed command and return its reply, split into fields '''
+
+        print(self._frame(type_cmd, cmd))
+        return self._exchange(type_cmd, cmd)
 
     #        tmp.encode()
 
@@ -462,17 +741,11 @@ class MERLIN_connection:
 
     def startDACScan(self):
 
-        fullcommand = 'MPX,12,CMD,DACSCAN'
-        self.sock.send(fullcommand.encode('utf-8'))
-        data = self.sock.recv(1024).decode('utf-8', 'ignore')
-        print(' - INFO : receiving', data)
+        self.command('DACSCAN', PRINT='ON')
 
     def readChipTempt(self):
 
-        fullcommand = 'MPX,18,CMD,ReadChipTemps'
-        self.sock.send(fullcommand.encode('utf-8'))
-        data = self.sock.recv(1024).decode('utf-8', 'ignore')
-        print(' - INFO : receiving', data)
+        self.command('ReadChipTemps', PRINT='ON')
 
     def imgacqStart(self, n_frames=1, acqTime=100.):
 
@@ -491,8 +764,7 @@ class MERLIN_connection:
         lenght = str(len(endofcomdn))
 
         fullcommand = 'MPX,000' + lenght + endofcomdn
-        self.sock.send(fullcommand.encode('utf-8'))
-        data = self.sock.recv(1024).decode('utf-8', 'ignore')
+        data = self._ask(fullcommand, 'SET', 'PIXELMATRIXLoadFILE')
         print(' - INFO : receiving', data)
 
     def dacScan(self, Threshold, acqTime, ini, end, step, fname='default'):
@@ -584,6 +856,18 @@ class MERLIN_connection:
 
         return
 
+    def streamFrames(self, timeout=1400.0, n_frames=None):
+        ''' Streaming alternative to getData + splitintoImages for the data channel. Frames are yielded as numpy
+        views (see MIBStream) without keeping the whole acquisition in memory '''
+
+        if not hasattr(self, 'stream'):
+            self.stream = MIBStream(self.sock)
+        self.stream.reset()
+        self.ongoingAcquisition = True
+        yield from self.stream.frames(timeout, n_frames)
+        self.Header = self.stream.Header
+        self.ongoingAcquisition = False
+
     def splitintoImages(self, DAC=-1):
         '''     This function treats the psudo data list,
                 and splits it into a list of single images         '''
@@ -659,6 +943,121 @@ class MERLIN_connection:
         # return dataList
 
 
+class MerlinPool:
+    ''' Process-wide keeper of MERLIN connections, so the command and data sockets stay open between runs.
+
+    A connection is lent to one thread at a time (lease / acquire+release). On every lease the connection is health
+    checked - any pending replies are drained and a DETECTORSTATUS query must be answered by a DETECTORSTATUS reply on
+    the command channel, a closed-socket check on the data channel - and if it is dead it is rebuilt, retrying with an
+    exponential backoff. '''
+
+    pools = {}
+    _guard = threading.Lock()
+
+    @classmethod
+    def get(cls, hostname, **kwargs):
+        ''' The pool for 'hostname', created on first use '''
+
+        with cls._guard:
+            if hostname not in cls.pools:
+                cls.pools[hostname] = cls(hostname, **kwargs)
+            return cls.pools[hostname]
+
+    def __init__(self, hostname, attempts=5, backoff=0.5, timeout=5.0, **kwargs):
+
+        self.hostname = hostname
+        self.attempts = attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.kwargs = kwargs
+        self.connections = {}
+        self.locks = {'cmd': threading.Lock(), 'data': threading.Lock()}
+
+    def _connect(self, channel):
+        delay = self.backoff
+        for attempt in range(self.attempts):
+            try:
+                return MERLIN_connection(self.hostname, channel=channel, **self.kwargs)
+            except (OSError, SystemExit) as err:  # the constructor exits on an unresolvable hostname
+                print(' - WARNING : Connection attempt', attempt + 1, 'to', self.hostname, 'failed:', err)
+                if attempt + 1 == self.attempts:
+                    raise ConnectionError(f'Could not connect to Merlin at {self.hostname} ({channel})') from err
+                time.sleep(delay)
+                delay *= 2
+
+    def healthy(self, connection, channel):
+        ''' Whether a pooled connection can still be used '''
+
+        try:
+            if channel == 'cmd':
+                # Replies left over from the previous lease must not be taken as the answer to the health check
+                connection.sock.settimeout(self.timeout)
+                connection.drain()
+                connection.sock.sendall(connection._frame('GET', 'DETECTORSTATUS'))
+                reply = connection._reply()
+                if reply[:2] != ['GET', 'DETECTORSTATUS'] or len(reply) < 3:
+                    return False
+                int(float(reply[2]))
+                return True
+            readable = select.select([connection.sock], [], [], 0)[0]
+            return not readable or connection.sock.recv(1, socket.MSG_PEEK) != b''
+        except (OSError, ValueError):
+            return False
+
+    def acquire(self, channel='cmd', timeout=-1):
+        ''' Borrow the connection for 'channel', (re)connecting if needed. Blocks while another thread holds it '''
+
+        if not self.locks[channel].acquire(timeout=timeout):
+            raise TimeoutError(f'Merlin {channel} channel is busy')
+        try:
+            connection = self.connections.get(channel)
+            if connection is None or not self.healthy(connection, channel):
+                self.discard(channel)
+                connection = self.connections[channel] = self._connect(channel)
+            connection.sock.settimeout(None)
+            return connection
+        except BaseException:
+            self.locks[channel].release()
+            raise
+
+    def release(self, connection, broken=False):
+        ''' Give a borrowed connection back. A broken connection is closed so the next lease reconnects '''
+
+        for channel, pooled in self.connections.items():
+            if pooled is connection:
+                if broken:
+                    self.discard(channel)
+                self.locks[channel].release()
+                return
+
+    @contextmanager
+    def lease(self, channel='cmd', timeout=-1):
+
+        connection = self.acquire(channel, timeout)
+        broken = False
+        try:
+            yield connection
+        except OSError:
+            broken = True
+            raise
+        finally:
+            self.release(connection, broken)
+
+    def discard(self, channel):
+
+        connection = self.connections.pop(channel, None)
+        if connection is not None:
+            try:
+                connection.sock.close()
+            except OSError:
+                pass
+
+    def close(self):
+
+        for channel in list(self.connections):
+            self.discard(channel)
+
+
 # print time()
 
 
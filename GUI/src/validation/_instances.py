@@ -87,6 +87,8 @@ colour: Pipeline[Any, int]
     Checks for an integer (represented in hexadecimal, with a leading #) between 0 and 16,777,215.
 engine_type: Pipeline[Any, str]
     Checks for a string that is QD or JEOL.
+focus_metric: Pipeline[Any, str]
+    Checks for a string that is NORM_VAR, BRENNER, TENENGRAD or FFT.
 
 
 """
@@ -282,6 +284,10 @@ engine_type = any_str + Pipeline(
     Step(ContainerValidator("JEOL", "QD"), desc="ensure the string is a valid engine type."),
     in_type=str, out_type=str
 )
+focus_metric = any_str + Pipeline(
+    Step(ContainerValidator("NORM_VAR", "BRENNER", "TENENGRAD", "FFT"), desc="ensure the string is a valid focus metric"),
+    in_type=str, out_type=str
+)
 
 blur_call = Pipeline.static_tuple(2, kernel, kernel)
 gss_blur_call = Pipeline.dynamic_tuple(4, kernel, kernel, sigma, sigma)
@@ -0,0 +1,165 @@
+"""
+Tests of the offline scanner, and a benchmark of acquisitions overlapping the processing of earlier frames.
+
+The GUI sources and assets are copied to a temporary directory with the microscope set offline, the sources are loaded
+from there under a private name, and the tests run from there (the offline engine reads its synthetic frames from
+`./assets`). This needs the scan engine package, which the `microscope` package imports even when offline.
+"""
+import importlib
+import importlib.util
+import json
+import os
+import pathlib
+import shutil
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("h5py")
+pytest.importorskip("pyscanengine")
+
+import numpy as np  # noqa: E402
+
+_GUI = pathlib.Path(__file__).resolve().parents[1]
+
+FULL = (512, 512)
+REGION = (64, 64)
+
+
+@pytest.fixture(scope="module")
+def microscope(tmp_path_factory):
+    root = tmp_path_factory.mktemp("gui")
+    shutil.copytree(_GUI / "src", root / "src", ignore=shutil.ignore_patterns("__pycache__", ".cache", "log"))
+    shutil.copytree(_GUI / "assets", root / "assets")
+    config = json.loads((root / "assets" / "config.json").read_text())
+    config["microscope"] = False
+    (root / "assets" / "config.json").write_text(json.dumps(config))
+    cwd = os.getcwd()
+    os.chdir(root)
+    spec = importlib.util.spec_from_file_location("_offline_gui", root / "src" / "__init__.py",
+                                                  submodule_search_locations=[str(root / "src")])
+    sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(sys.modules[spec.name])
+        yield importlib.import_module(f"{spec.name}.microscope")
+    finally:
+        for name in [name for name in sys.modules if name == spec.name or name.startswith(f"{spec.name}.")]:
+            del sys.modules[name]
+        os.chdir(cwd)
+
+
+class Counter:
+    """
+    Counts the calls that configure the scan area of an offline engine.
+
+    Attributes
+    ----------
+    calls: list[tuple]
+        The arguments of every call.
+    """
+
+    def __init__(self, engine):
+        self.calls = []
+        self._name = "set_image_area" if hasattr(engine, "set_image_area") else "set_areamode_imagingarea"
+        self._setup = getattr(engine, self._name)
+        setattr(engine, self._name, self)
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        return self._setup(*args)
+
+
+def grid(microscope, columns: int, rows: int):
+    return [microscope.AreaScan(FULL, REGION, (x * REGION[0], y * REGION[1]))
+            for y in range(rows) for x in range(columns)]
+
+
+def test_scan_many_matches_serial_scans(microscope):
+    regions = grid(microscope, 3, 2)
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    serial = Counter(scanner._engine)
+    expected = []
+    for region in regions:
+        with scanner.switch_scan_area(region):
+            expected.append(scanner.scan().data().copy())
+
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    batched = Counter(scanner._engine)
+    frames = {i: image.data().copy() for i, image in scanner.scan_many(regions)}
+
+    assert sorted(frames) == list(range(len(regions)))
+    for i, frame in enumerate(expected):
+        assert np.array_equal(frames[i], frame)
+    # one switch and one restore per square, against one switch per square and one restore per batch
+    assert len(serial.calls) == 2 * len(regions)
+    assert len(batched.calls) == len(regions) + 1
+    assert rect(scanner.scan_area) == rect(microscope.FullScan(FULL))
+
+
+def test_scan_many_skips_repeated_regions(microscope):
+    region = grid(microscope, 1, 1)[0]
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    batched = Counter(scanner._engine)
+    assert [i for i, _ in scanner.scan_many([region] * 4, reorder=False)] == [0, 1, 2, 3]
+    assert len(batched.calls) == 2
+
+
+def test_scan_many_orders_by_travel(microscope):
+    far, near = microscope.AreaScan(FULL, REGION, (448, 448)), microscope.AreaScan(FULL, REGION, (0, 0))
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    assert [i for i, _ in scanner.scan_many([far, near])] == [1, 0]
+    assert [i for i, _ in scanner.scan_many([far, near], reorder=False)] == [0, 1]
+
+
+def test_scan_many_restores_when_closed(microscope):
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    frames = scanner.scan_many(grid(microscope, 2, 2))
+    next(frames)
+    assert rect(scanner.scan_area) != rect(microscope.FullScan(FULL))
+    frames.close()
+    assert rect(scanner.scan_area) == rect(microscope.FullScan(FULL))
+
+
+def test_set_pattern_narrows_to_the_pattern(microscope):
+    scanner = microscope.Scanner(microscope.FullScan(FULL))
+    counter = Counter(scanner._engine)
+    square = np.stack(np.meshgrid(np.arange(8, 24, 4), np.arange(16, 40, 4)), axis=-1).reshape(-1, 2)
+    scanner.set_pattern(square + (100, 200))
+    assert scanner.pattern.dtype == np.int32 and np.array_equal(scanner.pattern, square + (100, 200))
+    assert rect(scanner.scan_area) == rect(microscope.AreaScan.from_corners(FULL, (108, 216), (121, 237)))
+    assert len(counter.calls) == 1
+    scanner.scan_area = microscope.FullScan(FULL)
+    assert scanner.pattern is None
+    with pytest.raises(ValueError):
+        scanner.set_pattern(np.array([[0, 0], [FULL[0], 0]]))
+
+
+def test_acquisition_overlaps_processing(microscope):
+    if not microscope.QD:
+        pytest.skip("only the QD engine emulates the acquisition time offline")
+    regions = grid(microscope, 4, 2)
+    scanner = microscope.Scanner(microscope.FullScan(FULL), dwell_time=5e-6)
+
+    def process(image):
+        # stands in for saving the frame to the session file and drawing it
+        image.data().copy()
+        time.sleep(0.02)
+
+    start = time.perf_counter()
+    for region in regions:
+        process(scanner.scan_async(region).result())
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _, image in scanner.scan_many(regions, reorder=False):
+        process(image)
+    overlapped = time.perf_counter() - start
+    print(f"\n{len(regions)} regions of {REGION}: {serial:.3f} s serial, {overlapped:.3f} s overlapped")
+    assert overlapped < 0.85 * serial
+
+
+def rect(area) -> tuple:
+    return area.size, area.rect()
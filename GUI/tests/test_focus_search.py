@@ -0,0 +1,124 @@
+"""
+Tests of the autofocus search on a synthetic focus curve, and a benchmark of the scans it takes per autofocus.
+
+The search module only needs the standard library, so it is loaded on its own (and not through the `gui` package, which
+needs Qt). The autofocus page is mirrored by `autofocus`, and the sweep it replaced by `sweep`.
+"""
+import importlib.util
+import math
+import pathlib
+import random
+import sys
+
+_PATH = pathlib.Path(__file__).resolve().parents[1] / "src" / "gui" / "utils" / "_focus_search.py"
+_SPEC = importlib.util.spec_from_file_location("_focus_search", _PATH)
+focus_search = importlib.util.module_from_spec(_SPEC)
+sys.modules[_SPEC.name] = focus_search
+_SPEC.loader.exec_module(focus_search)
+
+# the default settings: a coarse range of 0x63 and a fine step of 0x10
+LIMIT = 0x63
+FINE = 0x10
+BASE = 0x8000
+TRIALS = 200
+
+
+class Curve:
+    """
+    Synthetic focus curve: a Gaussian peak over a background, with noise on every measurement.
+
+    Attributes
+    ----------
+    peak: int
+        The lens value of best focus.
+    scans: int
+        The number of measurements taken.
+    """
+
+    def __init__(self, rng: random.Random, peak: int, width=40.0, noise=0.005):
+        self.peak = peak
+        self.scans = 0
+        self._rng = rng
+        self._width = width
+        self._noise = noise
+
+    def __call__(self, value: int) -> float:
+        self.scans += 1
+        return 0.1 + math.exp(-((value - self.peak) / self._width) ** 2 / 2) + self._rng.gauss(0, self._noise)
+
+
+def autofocus(curve: Curve, best: int = None) -> int:
+    """Mirrors `AutoFocus.run`: a double baseline scan, the warm start, then the search (and the rollback check)."""
+    curve(BASE)
+    start_score = curve(BASE)
+    scores = focus_search.ScoreCache(curve)
+    scores.seed(BASE, start_score)
+    lower, upper = BASE - LIMIT, BASE + LIMIT
+    start = BASE
+    if best is not None and lower <= best <= upper and scores(best) > start_score:
+        start = best
+    step = max(FINE * 2, LIMIT // 4) if best is None else FINE
+    ideal, score = focus_search.BrentSearch(FINE).search(scores, start, step, lower, upper)
+    return ideal if score >= start_score * 1.01 else BASE
+
+
+def sweep(curve: Curve) -> int:
+    """Mirrors the coarse and fine sweep that `BrentSearch` replaced, without its parabolic refinement."""
+    curve(BASE)
+    scores = {BASE: curve(BASE)}
+    coarse_step = max(FINE * 2, LIMIT // 4)
+    for offset in range(-LIMIT, LIMIT + 1, coarse_step):
+        if BASE + offset not in scores:
+            scores[BASE + offset] = curve(BASE + offset)
+    coarse = max(scores, key=scores.get)
+    for offset in range(-coarse_step, coarse_step + 1, FINE):
+        if coarse + offset not in scores:
+            scores[coarse + offset] = curve(coarse + offset)
+    return max(scores, key=scores.get)
+
+
+def trials(seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(TRIALS):
+        peak = BASE + rng.randint(-LIMIT * 3 // 4, LIMIT * 3 // 4)
+        # the best focus of the last run (or session) is up to a fine step away
+        yield rng, peak, peak + rng.randint(-FINE, FINE)
+
+
+def test_score_cache_measures_each_value_once():
+    curve = Curve(random.Random(0), BASE)
+    scores = focus_search.ScoreCache(curve)
+    assert scores(BASE + 1.2) == scores(BASE + 1)
+    assert curve.scans == 1 and BASE + 1 in scores
+    scores.seed(BASE, 2.0)
+    assert scores.best() == (BASE, 2.0)
+    assert scores.best(BASE + 1) == (BASE + 1, scores(BASE + 1))
+
+
+def test_search_finds_the_peak():
+    for search in (focus_search.GoldenSearch, focus_search.BrentSearch):
+        for rng, peak, _ in trials():
+            scores = focus_search.ScoreCache(Curve(rng, peak))
+            ideal, _ = search(FINE).search(scores, BASE, FINE * 2, BASE - LIMIT, BASE + LIMIT)
+            assert abs(ideal - peak) <= FINE, search.__name__
+
+
+def test_search_stays_in_range():
+    scores = focus_search.ScoreCache(Curve(random.Random(0), BASE + 4 * LIMIT, width=8 * LIMIT))
+    ideal, _ = focus_search.BrentSearch(FINE).search(scores, BASE, FINE * 2, BASE - LIMIT, BASE + LIMIT)
+    assert BASE + LIMIT - FINE <= ideal <= BASE + LIMIT
+    assert all(BASE - LIMIT <= value <= BASE + LIMIT for value in scores.scores)
+
+
+def test_scans_per_autofocus():
+    runs = {"sweep": sweep, "cold start": autofocus}
+    scans = {name: 0 for name in (*runs, "warm start")}
+    for rng, peak, best in trials():
+        for name, run in (*runs.items(), ("warm start", lambda c: autofocus(c, best))):
+            curve = Curve(rng, peak)
+            ideal = run(curve)
+            scans[name] += curve.scans
+            assert abs(ideal - peak) <= FINE, name
+    mean = {name: total / TRIALS for name, total in scans.items()}
+    print("\nscans per autofocus: " + ", ".join(f"{name} {n:.1f}" for name, n in mean.items()))
+    assert mean["warm start"] < mean["cold start"] < mean["sweep"]
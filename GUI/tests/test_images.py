@@ -0,0 +1,108 @@
+"""
+Tests of the integrity check of images, and a microbenchmark of its per-access cost.
+
+The `src` package is imported from the GUI directory, so the tests only need numpy and OpenCV.
+"""
+import pathlib
+import sys
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src import images  # noqa: E402
+from src.images import _bases  # noqa: E402
+
+RGB_RANGE = (0, 2 ** 24 - 1)
+
+
+def rgb(size: int = 8) -> images.RGBImage:
+    return images.RGBImage(np.zeros((size, size), dtype=np.int_), static_range=(0, 10))
+
+
+def test_held_data_is_checked_after_other_lookups():
+    image = rgb()
+    data = image.data()
+    assert image.size == (8, 8)
+    data[0, 0] = 99
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_region_view_is_checked():
+    image = rgb()
+    region = image.region((0, 0), (3, 3))
+    view = region.data()
+    del region
+    view[1, 1] = 99
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_temporary_data_is_checked():
+    image = rgb()
+    image.data()[2, 2] = 99
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_edit_before_reference_is_dropped_is_checked():
+    image = rgb()
+    data = image.data()
+    data[0, 0] = 99
+    del data
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_constructor_array_is_checked():
+    array = np.zeros((8, 8), dtype=np.int_)
+    image = images.RGBImage(array, static_range=(0, 10))
+    array[0, 0] = 99
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_bimodal_colours_are_checked():
+    image = images.RGBBiModal(np.zeros((8, 8), dtype=np.int_), 0, 1)
+    data = image.data()
+    image.size
+    data[0, 0] = 5
+    with pytest.raises(TypeError):
+        image.size
+
+
+def test_unshared_array_is_not_rechecked():
+    image = rgb()
+    data = image.data()
+    data[0, 0] = 5
+    del data
+    assert image.size == (8, 8)  # the check after the last reference is dropped
+    assert not image._dirty and not image._shared()
+    image[1, 1] = 7  # writes through the image are verified instead
+    with pytest.raises(ValueError):
+        image[1, 1] = 99
+
+
+def _per_access(image: images.RGBImage, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        image.size
+    return (time.perf_counter() - start) / n
+
+
+def test_per_access_cost_4096():
+    image = images.RGBImage(np.zeros((4096, 4096), dtype=np.uint32), static_range=RGB_RANGE)
+    image.size
+    _bases.Image.debug = True  # every lookup checks the array, as before the dirty flag
+    try:
+        before = _per_access(image, 10)
+    finally:
+        _bases.Image.debug = False
+    after = _per_access(image, 10000)
+    print(f"\nper-access cost on a 4096x4096 RGB image: {before * 1e3:.2f} ms before, {after * 1e6:.2f} us after")
+    assert after * 100 < before
@@ -0,0 +1,348 @@
+"""
+Tests of the MERLIN command channel against a local stand-in TCP server, and of the data channel decoder against
+synthetic MIB streams.
+
+The module is loaded straight from its file, so the tests only need numpy (and not the scan engine, PyJEM or Qt that
+the `microscope` package pulls in).
+"""
+import importlib.util
+import pathlib
+import select
+import socket
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_PATH = pathlib.Path(__file__).resolve().parents[1] / "src" / "microscope" / "merlin_connection.py"
+_SPEC = importlib.util.spec_from_file_location("merlin_connection", _PATH)
+merlin = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(merlin)
+
+VARIABLES = ["FILENAME", "TRIGGERSTART", "TRIGGERSTOP", "NUMFRAMESTOACQUIRE", "COUNTERDEPTH", "CONTINUOUSRW",
+             "DETECTORSTATUS"]
+
+
+def frame(reply: str) -> bytes:
+    body = "," + reply
+    return ("MPX,%010d" % len(body) + body).encode("utf-8")
+
+
+class FakeMerlin:
+    """
+    Stand-in for the MERLIN command channel.
+
+    Every framed command is answered with a framed reply. Replies to commands that arrive together are sent together,
+    optionally cut into small chunks so that they span several `recv` calls on the client.
+
+    Attributes
+    ----------
+    values: dict[str, str]
+        The value of each variable.
+    chunk: int | None
+        The size of each chunk of replies, or None to send them whole.
+    round_trips: int
+        The number of bursts of commands that were answered.
+    commands: list[str]
+        Every command received, in order.
+    """
+
+    def __init__(self, chunk: int = None):
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        self.values = {var: "0" for var in VARIABLES}
+        self.values["FILENAME"] = "default"
+        self.chunk = chunk
+        self.round_trips = 0
+        self.commands = []
+        self._client = None
+        self._connected = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def push(self, *replies: str):
+        """
+        Send replies that the client did not ask for (as if left over from an earlier exchange).
+        """
+        self._connected.wait(5)
+        self._client.sendall(b"".join(frame(reply) for reply in replies))
+
+    def close(self):
+        self._listener.close()
+        if self._client is not None:
+            self._client.close()
+
+    def _answer(self, command: str) -> str:
+        kind, name, *rest = command.split(",")
+        if kind == "GET":
+            return f"GET,{name},{self.values.get(name, '0')},0"
+        elif kind == "SET":
+            self.values[name] = ",".join(rest)
+            return f"SET,{name},0"
+        return f"CMD,{name},0"
+
+    def _serve(self):
+        self._client, _ = self._listener.accept()
+        self._connected.set()
+        buffer = bytearray()
+        while True:
+            try:
+                data = self._client.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            replies = []
+            while buffer.startswith(b"MPX,") and b"," in buffer[4:]:
+                sep = buffer.index(b",", 4)
+                stop = sep + int(buffer[4:sep])
+                if len(buffer) < stop:
+                    break
+                command = buffer[sep + 1:stop].decode("utf-8")
+                del buffer[:stop]
+                self.commands.append(command)
+                replies.append(frame(self._answer(command)))
+            if replies:
+                self.round_trips += 1
+                self._send(b"".join(replies))
+
+    def _send(self, payload: bytes):
+        if self.chunk is None:
+            self._client.sendall(payload)
+            return
+        for i in range(0, len(payload), self.chunk):
+            self._client.sendall(payload[i:i + self.chunk])
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def server():
+    fake = FakeMerlin()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def var_file(tmp_path):
+    path = tmp_path / "variables.txt"
+    path.write_text("".join(f"0 : {var} \n" for var in VARIABLES))
+    return str(path)
+
+
+def connect(server: FakeMerlin, var_file: str):
+    return merlin.MERLIN_connection(ipaddress="127.0.0.1", varFile=var_file, port=server.port)
+
+
+def wait_readable(connection, timeout=1.0):
+    select.select([connection.sock], [], [], timeout)
+
+
+def test_set_many_is_one_round_trip(server, var_file):
+    connection = connect(server, var_file)
+    assert server.round_trips == 1  # the initial table is read with one pipelined batch
+    server.round_trips = 0
+    codes = connection.set_many({"TRIGGERSTART": 1, "TRIGGERSTOP": 1, "NUMFRAMESTOACQUIRE": 65536,
+                                 "COUNTERDEPTH": 12, "CONTINUOUSRW": 1})
+    assert codes == dict.fromkeys(("TRIGGERSTART", "TRIGGERSTOP", "NUMFRAMESTOACQUIRE", "COUNTERDEPTH",
+                                   "CONTINUOUSRW"), 0)
+    assert server.round_trips == 1
+    assert connection.get_many(["NUMFRAMESTOACQUIRE", "COUNTERDEPTH"]) == {"NUMFRAMESTOACQUIRE": 65536,
+                                                                           "COUNTERDEPTH": 12}
+    assert server.round_trips == 2
+
+
+def test_replies_split_across_recv(var_file):
+    server = FakeMerlin(chunk=7)
+    try:
+        connection = connect(server, var_file)
+        server.values["DETECTORSTATUS"] = "1"
+        assert connection.detectorStatus() == 1
+        values = connection.get_many(["FILENAME", "DETECTORSTATUS", "COUNTERDEPTH"])
+        assert values == {"FILENAME": "default", "DETECTORSTATUS": 1.0, "COUNTERDEPTH": 0}
+        assert connection.set_many({"TRIGGERSTART": 0, "TRIGGERSTOP": 0}) == {"TRIGGERSTART": 0, "TRIGGERSTOP": 0}
+        assert not connection._pending
+    finally:
+        server.close()
+
+
+def test_surplus_bytes_are_kept(server, var_file):
+    connection = connect(server, var_file)
+    # two replies arrive in one segment, but each call only consumes its own
+    server.push("GET,DETECTORSTATUS,1,0", "SET,FILENAME,0")
+    wait_readable(connection)
+    time.sleep(0.05)
+    assert connection._replies([("GET", "DETECTORSTATUS")])[0][2] == "1"
+    assert connection._pending == frame("SET,FILENAME,0")
+    assert connection._replies([("SET", "FILENAME")])[0] == ["SET", "FILENAME", "0"]
+    assert not connection._pending
+
+
+def test_interleaved_cmd_reply_is_not_a_status(server, var_file):
+    connection = connect(server, var_file)
+    server.values["DETECTORSTATUS"] = "1"
+    # the reply to a command whose reply was never read used to be taken as a status of 0
+    server.push("CMD,SCANSTARTRECORD,0")
+    wait_readable(connection)
+    assert connection.waitForStatus(lambda status: status != 0, timeout=1) < 1
+    assert connection.command("SCANSTARTRECORD") == 0
+    server.values["DETECTORSTATUS"] = "0"
+    assert connection.detectorStatus() == 0
+    connection.setValue("FILENAME", "next")
+    assert server.values["FILENAME"] == "next"
+    assert not connection._pending
+
+
+def test_pool_drains_stale_replies(server, var_file):
+    connection = connect(server, var_file)
+    pool = merlin.MerlinPool("127.0.0.1", timeout=1.0)
+    server.push("SET,TRIGGERSTART,0", "CMD,SCANSTARTRECORD,0")
+    wait_readable(connection)
+    time.sleep(0.05)
+    assert pool.healthy(connection, "cmd")
+    assert not connection._pending
+    assert server.commands[-1] == "GET,DETECTORSTATUS"
+
+
+def mq1(number: int, data: np.ndarray, chips: int) -> bytes:
+    """
+    Build one MQ1 frame message (header and big-endian pixels), framed as on the data channel.
+    """
+    kind = {1: "U08", 2: "U16", 4: "U32"}[data.dtype.itemsize]
+    offset = 384 if chips == 1 else 768
+    h, w = data.shape
+    fields = ["MQ1", f"{number:06d}", f"{offset:05d}", f"{chips:02d}", f"{w:04d}", f"{h:04d}", kind,
+              "1x1" if chips == 1 else "2x2", "0F", "2026-10-16 12:00:00.000000", "0.001000", "0", "0", "0"]
+    fields += ["0.000000E+0"] * 8
+    for _ in range(chips):
+        fields += ["3RX"] + ["0"] * 27
+    fields += ["MQ1A", "2026-10-16T12:00:00.000000000Z", "1000000ns", str(8 * data.dtype.itemsize), ""]
+    header = ",".join(fields).encode("utf-8").ljust(offset, b" ")
+    assert len(header) == offset
+    return message(header + data.astype(data.dtype.newbyteorder(">")).tobytes())
+
+
+def message(payload: bytes) -> bytes:
+    return b"MPX,%010d," % (len(payload) + 1) + payload
+
+
+def acquisition(frames, chips: int) -> bytes:
+    return message(b"HDR,\nTime and Date Stamp (day, mnth, yr, hr, min, s):\t16/10/2026 12:00:00\nEND\t\t\t") + \
+        b"".join(mq1(n, frame, chips) for n, frame in enumerate(frames, 1))
+
+
+def send(sock: socket.socket, payload: bytes, chunk: int = 1000):
+    """
+    Send a payload in small chunks from another thread, so that frames span several `recv_into` calls.
+    """
+
+    def _send():
+        for i in range(0, len(payload), chunk):
+            sock.sendall(payload[i:i + chunk])
+            if i % (50 * chunk) == 0:
+                time.sleep(0.001)
+
+    thread = threading.Thread(target=_send, daemon=True)
+    thread.start()
+    return thread
+
+
+def synthetic(n: int, shape, dtype) -> list:
+    rng = np.random.default_rng(n)
+    return [rng.integers(0, np.iinfo(dtype).max, size=shape, dtype=dtype, endpoint=True) for _ in range(n)]
+
+
+@pytest.fixture
+def channel():
+    receiver, sender = socket.socketpair()
+    yield receiver, sender
+    receiver.close()
+    sender.close()
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("chips", [1, 4])
+def test_stream_decodes_split_frames(channel, dtype, chips):
+    receiver, sender = channel
+    shape = (256, 256) if chips == 1 else (512, 512)
+    frames = synthetic(5, shape, dtype)
+    thread = send(sender, acquisition(frames, chips), chunk=997)
+    stream = merlin.MIBStream(receiver)
+    decoded = [frame.copy() for frame in stream.frames(timeout=2000, n_frames=len(frames))]
+    thread.join()
+    assert len(decoded) == len(frames)
+    for got, expected in zip(decoded, frames):
+        assert got.shape == shape and np.array_equal(got, expected)
+    assert stream.Header.startswith(b"HDR")
+    assert stream.frameHeader.params["Nchips"] == chips
+
+
+def test_stream_compacts_without_growing(channel):
+    receiver, sender = channel
+    frames = synthetic(40, (64, 64), np.uint16)
+    payload = acquisition(frames, 1)
+    capacity = 3 * len(mq1(1, frames[0], 1))
+    thread = send(sender, payload, chunk=4096)
+    stream = merlin.MIBStream(receiver, capacity=capacity)
+    buffer = stream._buffer
+    decoded = [frame.copy() for frame in stream.frames(timeout=2000, n_frames=len(frames))]
+    thread.join()
+    assert len(payload) > 10 * capacity
+    assert stream._buffer is buffer and stream._buffer.size == capacity
+    assert all(np.array_equal(got, expected) for got, expected in zip(decoded, frames))
+
+
+def test_stream_grows_for_large_frames(channel):
+    receiver, sender = channel
+    frames = synthetic(3, (256, 256), np.uint32)
+    thread = send(sender, acquisition(frames, 1), chunk=8192)
+    stream = merlin.MIBStream(receiver, capacity=4096)
+    decoded = [frame.copy() for frame in stream.frames(timeout=2000, n_frames=len(frames))]
+    thread.join()
+    assert stream._buffer.size >= len(mq1(1, frames[0], 1)) - merlin.MIBStream.PREFIX
+    assert all(np.array_equal(got, expected) for got, expected in zip(decoded, frames))
+
+
+def test_frame_header_is_parsed_once_per_acquisition(channel, monkeypatch):
+    receiver, sender = channel
+    parsed = []
+
+    class Counting(merlin.ImageHeader):
+        def __init__(self, header_str=b"", *args, **kwargs):
+            parsed.append(header_str[:3])
+            super().__init__(header_str, *args, **kwargs)
+
+    monkeypatch.setattr(merlin, "ImageHeader", Counting)
+    stream = merlin.MIBStream(receiver)
+    for acquisitions in range(1, 3):
+        frames = synthetic(6, (32, 32), np.uint8)
+        thread = send(sender, acquisition(frames, 1))
+        stream.reset()
+        decoded = [frame.copy() for frame in stream.frames(timeout=2000, n_frames=len(frames))]
+        thread.join()
+        assert all(np.array_equal(got, expected) for got, expected in zip(decoded, frames))
+        assert parsed == [b"MQ1"] * acquisitions
+        # the layout of the first frame is reused, including its acquisition number
+        assert stream.frameHeader.params["acqNumber"] == 1
+
+
+def test_stream_frames_on_the_data_channel(var_file):
+    listener = socket.create_server(("127.0.0.1", 0))
+    try:
+        connection = merlin.MERLIN_connection(ipaddress="127.0.0.1", channel="data", varFile=var_file,
+                                              port=listener.getsockname()[1])
+        server, _ = listener.accept()
+        try:
+            frames = synthetic(4, (16, 16), np.uint16)
+            thread = send(server, acquisition(frames, 1), chunk=100)
+            decoded = [frame.copy() for frame in connection.streamFrames(timeout=2000, n_frames=len(frames))]
+            thread.join()
+            assert all(np.array_equal(got, expected) for got, expected in zip(decoded, frames))
+            assert connection.Header.startswith(b"HDR")
+            assert not connection.ongoingAcquisition
+        finally:
+            server.close()
+    finally:
+        listener.close()
@@ -0,0 +1,159 @@
+"""
+Tests of the pooled PyJEM transport against a local stand-in REST server.
+
+The vendored PyJEM package is loaded from a temporary copy under a private name, so the tests only need httplib2 (and
+not the scan engine, the installed PyJEM or Qt that the `microscope` package pulls in), and the files that the package
+writes next to itself on import stay out of the tree.
+"""
+import concurrent.futures
+import http.server
+import importlib
+import importlib.util
+import json
+import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import types
+
+import pytest
+
+httplib2 = pytest.importorskip("httplib2")
+
+_ROOT = pathlib.Path(tempfile.mkdtemp()) / "PyJEM"
+shutil.copytree(pathlib.Path(__file__).resolve().parents[1] / "src" / "microscope" / "PyJEM", _ROOT,
+                ignore=shutil.ignore_patterns(".cache", "log", "__pycache__"))
+_SPEC = importlib.util.spec_from_file_location("_vendored_pyjem", _ROOT / "__init__.py",
+                                               submodule_search_locations=[str(_ROOT)])
+sys.modules[_SPEC.name] = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(sys.modules[_SPEC.name])
+base = importlib.import_module(f"{_SPEC.name}.base")
+
+# the request wrapper of a PyJEM base module (as installed), which looks its shared client up at call time
+_INSTALLED = '''
+import json
+import httplib2
+
+client = httplib2.Http()
+
+def GetValue(url):
+    res, cont = client.request(url, "GET", headers={})
+    return json.loads(cont.decode("utf-8"))
+'''
+
+
+class FakeTEM:
+    """
+    Stand-in for the TEM REST server, speaking keep-alive HTTP/1.1.
+
+    Every GET of `/value/<n>` is answered with `{"value": <n>}`.
+
+    Attributes
+    ----------
+    url: str
+        The root url of the server.
+    connections: int
+        The number of connections accepted.
+    requests: int
+        The number of requests answered.
+    """
+
+    def __init__(self):
+        fake = self
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_GET(self):
+                body = json.dumps({"value": int(self.path.rsplit("/", 1)[-1])}).encode("utf-8")
+                with fake._lock:
+                    fake.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = "http://127.0.0.1:{}".format(self._server.server_address[1])
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    fake = FakeTEM()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    pooled = base.Transport()
+    monkeypatch.setattr(base, "client", pooled)
+    monkeypatch.setattr(base, "routed", False)
+    yield pooled
+    pooled.close()
+
+
+@pytest.fixture
+def installed():
+    module = types.ModuleType("installed_pyjem_base")
+    exec(_INSTALLED, module.__dict__)
+    return module
+
+
+def test_connections_are_kept_alive(server, transport):
+    for n in range(100):
+        res, cont = transport.request("value", f"{server.url}/value/{n}", "GET")
+        assert res.status == 200 and json.loads(cont) == {"value": n}
+    assert server.requests == 100
+    assert server.connections == 1
+    assert transport.latency()["value"]["count"] == 100
+
+
+def test_concurrent_requests_do_not_cross(server, transport):
+    def read(n):
+        return json.loads(transport.request("value", f"{server.url}/value/{n}", "GET")[1])["value"]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(read, range(400))) == list(range(400))
+    assert server.connections <= 8
+
+
+def test_install_routes_the_installed_client(server, transport, installed):
+    assert base.install(installed)
+    assert base.routed
+    assert isinstance(installed.client, base.HttpAdapter)
+    assert base.install(installed)  # patching twice keeps the adapter
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        values = list(pool.map(lambda n: installed.GetValue(f"{server.url}/value/{n}")["value"], range(200)))
+    assert values == list(range(200))
+    assert server.connections <= 8
+    assert sum(counter["count"] for counter in transport.latency().values()) == 200
+
+
+def test_install_leaves_unknown_modules(transport):
+    module = types.ModuleType("installed_pyjem_base")
+    assert not base.install(module)
+    assert not base.routed
+    assert not hasattr(module, "client")